@@ -0,0 +1,147 @@
+import hashlib
+import json
+import pickle
+from config import (
+    DESCRIPTOR_EMBEDDINGS_FILE,
+    EMBEDDING_BACKEND,
+    EMBEDDING_MODEL_NAME,
+    VOCAB_FILE,
+)
+from app.evaluation.keywords import (
+    FLAVOR_KEYWORDS,
+    TEXTURE_KEYWORDS,
+    TYPE_KEYWORDS,
+)
+from app.utils.writer import write_atomic
+
+# Embedding-based ABED alignment. Every flavor, texture and type option in
+# abed_vocab.json is embedded once (cached on disk until the vocab or the
+# model changes); a recipe is then scored from the title + ingredients
+# embedding novelty already computes, with a single matrix product.
+#
+# Raw cosines between a recipe and a short descriptor are small and vary
+# by descriptor, so each requested option is scored by how many of the
+# other options of its dimension it beats: 1.0 when the recipe is closer
+# to "tangy" than to every flavor that wasn't asked for.
+
+DIMENSIONS = {
+    "flavor": FLAVOR_KEYWORDS,
+    "texture": TEXTURE_KEYWORDS,
+    "type": TYPE_KEYWORDS,
+}
+
+
+def descriptor_text(dimension, option):
+    # "tangy flavor: lemon, lime, ..." gives the encoder concrete cues
+    option = option.lower()
+    text = option if dimension == "type" else f"{option} {dimension}"
+    keywords = DIMENSIONS[dimension].get(option)
+    return f"{text}: {', '.join(keywords)}" if keywords else text
+
+
+def vocab_descriptors(vocab_file=VOCAB_FILE):
+    """(dimension, option) -> descriptor text for every scored option"""
+    with open(vocab_file) as f:
+        vocab = json.load(f)
+    return {
+        (category["name"], option.lower()): descriptor_text(
+            category["name"], option
+        )
+        for category in vocab
+        if category["name"] in DIMENSIONS
+        for option in category["options"]
+    }
+
+
+def requested(abeds, dimension):
+    values = abeds.get(dimension) or []
+    if isinstance(values, str):
+        values = [values]
+    return {value.lower() for value in values}
+
+
+class DescriptorEmbeddings:
+    """
+    Unit-normalized embeddings of every ABED option, one row per
+    (dimension, option) label.
+    """
+
+    def __init__(self, labels, vectors):
+        self.labels = labels
+        self.vectors = vectors
+        self.rows = {label: i for i, label in enumerate(labels)}
+        self.dimensions = {}
+        for i, (dimension, _) in enumerate(labels):
+            self.dimensions.setdefault(dimension, []).append(i)
+
+    @classmethod
+    def load(
+        cls, model, vocab_file=VOCAB_FILE, path=DESCRIPTOR_EMBEDDINGS_FILE
+    ):
+        """
+        Load the cached descriptor embeddings, encoding them in one batch
+        first if the vocab, descriptor texts, model or backend changed.
+        """
+        descriptors = vocab_descriptors(vocab_file)
+        key = hashlib.sha256(
+            json.dumps(
+                [
+                    EMBEDDING_MODEL_NAME,
+                    EMBEDDING_BACKEND,
+                    sorted(descriptors.items()),
+                ]
+            ).encode()
+        ).hexdigest()
+
+        if path.exists():
+            with open(path, "rb") as f:
+                cached = pickle.load(f)
+            if cached["key"] == key:
+                return cls(cached["labels"], cached["vectors"])
+
+        labels = list(descriptors)
+        vectors = model.encode(
+            list(descriptors.values()),
+            convert_to_tensor=True,
+            normalize_embeddings=True,
+        ).cpu()
+        write_atomic(
+            path,
+            pickle.dumps({"key": key, "labels": labels, "vectors": vectors}),
+        )
+        return cls(labels, vectors)
+
+    def alignment(self, embedding, abeds):
+        """
+        Share of the requested flavor, texture and type options the recipe
+        `embedding` is closer to than to the options that weren't
+        requested. Options missing from the vocab count as misses.
+        """
+        embedding = embedding.to(self.vectors)
+        similarities = (
+            self.vectors @ (embedding / embedding.norm().clamp_min(1e-12))
+        ).tolist()
+
+        score = 0.0
+        total = 0
+        for dimension, rows in self.dimensions.items():
+            wanted = requested(abeds, dimension)
+            if not wanted:
+                continue
+            others = [
+                similarities[i]
+                for i in rows
+                if self.labels[i][1] not in wanted
+            ]
+            for option in wanted:
+                total += 1
+                row = self.rows.get((dimension, option))
+                if row is None:
+                    continue
+                if not others:
+                    score += 1
+                    continue
+                beaten = sum(sim < similarities[row] for sim in others)
+                score += beaten / len(others)
+
+        return round(score / total, 2) if total else 0.0
@@ -0,0 +1,276 @@
+import re
+from config import TITLE_DEADLINE_CHARS
+
+# Hard constraints a generated recipe must satisfy. Kept free of the
+# embedding model so generate.py can check them while a completion streams.
+
+IMPLAUSIBLE_PHRASES = [
+    "microwave for 2 hours",
+    "boil lettuce",
+    "grill yogurt",
+]
+
+MEAT = [
+    "chicken",
+    "beef",
+    "pork",
+    "bacon",
+    "ham",
+    "lamb",
+    "veal",
+    "turkey",
+    "duck",
+    "sausage",
+    "prosciutto",
+    "pancetta",
+    "chorizo",
+    "salami",
+    "pepperoni",
+    "gelatin",
+]
+
+FISH = [
+    "fish",
+    "salmon",
+    "tuna",
+    "cod",
+    "anchovy",
+    "anchovies",
+    "sardine",
+    "trout",
+    "halibut",
+    "tilapia",
+    "mackerel",
+    "haddock",
+    "bonito",
+    "worcestershire",
+]
+
+SHELLFISH = [
+    "shrimp",
+    "prawn",
+    "crab",
+    "lobster",
+    "clam",
+    "mussel",
+    "oyster",
+    "scallop",
+    "squid",
+    "octopus",
+]
+
+DAIRY = [
+    "milk",
+    "butter",
+    "buttermilk",
+    "cheese",
+    "cream",
+    "yogurt",
+    "ghee",
+    "whey",
+    "parmesan",
+    "mozzarella",
+    "cheddar",
+    "ricotta",
+    "feta",
+    "custard",
+]
+
+NUTS = [
+    "nut",
+    "almond",
+    "peanut",
+    "walnut",
+    "pecan",
+    "cashew",
+    "pistachio",
+    "hazelnut",
+    "macadamia",
+    "praline",
+    "marzipan",
+    "nutella",
+]
+
+GLUTEN = [
+    "flour",
+    "wheat",
+    "bread",
+    "breadcrumb",
+    "panko",
+    "pasta",
+    "spaghetti",
+    "noodle",
+    "couscous",
+    "barley",
+    "rye",
+    "semolina",
+    "bulgur",
+    "farro",
+    "seitan",
+    "crouton",
+    "pita",
+    "cracker",
+    "soy sauce",
+    "beer",
+]
+
+PLANT_MILKS = [
+    "peanut butter",
+    "almond butter",
+    "cashew butter",
+    "nut butter",
+    "cocoa butter",
+    "apple butter",
+    "coconut milk",
+    "almond milk",
+    "oat milk",
+    "soy milk",
+    "rice milk",
+    "cashew milk",
+    "coconut cream",
+    "cream of tartar",
+]
+
+GLUTEN_FREE_SWAPS = [
+    "almond flour",
+    "rice flour",
+    "coconut flour",
+    "chickpea flour",
+    "corn flour",
+    "tapioca flour",
+    "buckwheat flour",
+    "rice noodle",
+    "rice noodles",
+    "gluten-free",
+]
+
+# restriction -> (forbidden words, phrases that are fine despite a match)
+DIET_EXCLUSIONS = {
+    "vegetarian": (MEAT + FISH + SHELLFISH, ["vegetarian", "plant-based"]),
+    "vegan": (
+        MEAT + FISH + SHELLFISH + DAIRY + ["egg", "honey", "mayonnaise"],
+        PLANT_MILKS + ["vegan", "plant-based", "dairy-free", "non-dairy"],
+    ),
+    "gluten-free": (GLUTEN, GLUTEN_FREE_SWAPS),
+    "dairy-free": (
+        DAIRY,
+        PLANT_MILKS + ["dairy-free", "non-dairy", "vegan", "plant-based"],
+    ),
+    "nut-free": (NUTS, ["nut-free", "nutmeg"]),
+    "fish-free": (FISH, ["fish-free"]),
+}
+
+
+# Allowed words that qualify the noun after them ("vegan butter",
+# "gluten-free flour"), so the whole phrase is fine, not just the word
+QUALIFIERS = {
+    "vegetarian",
+    "vegan",
+    "plant-based",
+    "dairy-free",
+    "non-dairy",
+    "gluten-free",
+    "nut-free",
+    "fish-free",
+}
+
+# A qualified phrase runs over at most three more words and stops at a
+# conjunction, so "vegan butter and 2 eggs" still flags the eggs
+_QUALIFIED_WORDS = r"(?:\s+(?!(?:and|or|with|plus)\b)[a-z][a-z-]*){0,3}"
+
+
+def _alternation(words):
+    return "|".join(re.escape(w) for w in sorted(words, key=len)[::-1])
+
+
+def _compile(words):
+    return re.compile(rf"\b(?:{_alternation(words)})(?:e?s)?\b")
+
+
+def _compile_allowed(words):
+    phrases = [w for w in words if w not in QUALIFIERS]
+    qualifiers = [w for w in words if w in QUALIFIERS]
+    parts = []
+    if phrases:
+        parts.append(rf"\b(?:{_alternation(phrases)})(?:e?s)?\b")
+    if qualifiers:
+        parts.append(rf"\b(?:{_alternation(qualifiers)})\b{_QUALIFIED_WORDS}")
+    return re.compile("|".join(parts))
+
+
+DIET_PATTERNS = {
+    diet: (_compile(forbidden), _compile_allowed(allowed))
+    for diet, (forbidden, allowed) in DIET_EXCLUSIONS.items()
+}
+
+
+class ConstraintViolation(Exception):
+    pass
+
+
+def find_implausible_phrase(text):
+    text = text.lower()
+    for bad in IMPLAUSIBLE_PHRASES:
+        if bad in text:
+            return bad
+    return None
+
+
+def find_diet_violation(ingredient, restrictions):
+    """
+    Return (restriction, word) for the first restriction the ingredient
+    line breaks, or None.
+    """
+    line = ingredient.lower()
+    for restriction in restrictions:
+        patterns = DIET_PATTERNS.get(restriction.lower())
+        if not patterns:
+            continue
+        forbidden, allowed = patterns
+        match = forbidden.search(allowed.sub(" ", line))
+        if match:
+            return restriction, match.group(0)
+    return None
+
+
+class ConstraintChecker:
+    """
+    Checks a RecipeStreamParser's state after every streamed chunk and
+    raises ConstraintViolation as soon as the recipe is clearly broken:
+    no **Title:** within the first TITLE_DEADLINE_CHARS characters, an
+    ingredient that breaks a requested dietary restriction, or an
+    implausible instruction.
+    """
+
+    def __init__(self, entry):
+        self.restrictions = entry.get("dietary_restrictions") or []
+        if isinstance(self.restrictions, str):
+            self.restrictions = [self.restrictions]
+        self.chars = 0
+        self._ingredients_seen = 0
+        self._steps_seen = 0
+
+    def __call__(self, parser):
+        self.chars = parser.chars
+        late = parser.chars > TITLE_DEADLINE_CHARS
+        if late and "title" not in parser.closed:
+            raise ConstraintViolation("no **Title:** line")
+
+        ingredients = parser.result["ingredients"]
+        start = self._ingredients_seen
+        for ingredient in ingredients[start:]:
+            violation = find_diet_violation(ingredient, self.restrictions)
+            if violation:
+                restriction, word = violation
+                raise ConstraintViolation(
+                    f"'{word}' in ingredients breaks {restriction}"
+                )
+        self._ingredients_seen = len(ingredients)
+
+        steps = parser.result["steps"]
+        start = self._steps_seen
+        for step in steps[start:]:
+            phrase = find_implausible_phrase(step)
+            if phrase:
+                raise ConstraintViolation(f"implausible step '{phrase}'")
+        self._steps_seen = len(steps)
@@ -0,0 +1,61 @@
+from config import (
+    EMBEDDING_MODEL_NAME,
+    EMBEDDING_BACKEND,
+    EMBEDDING_THREADS,
+)
+from sentence_transformers import SentenceTransformer
+
+# ONNX exports published alongside all-MiniLM-L6-v2 on the Hugging Face
+# hub. "onnx-int8" is the dynamically quantized export, which runs on any
+# AVX2 CPU; swap in model_qint8_avx512_vnni.onnx on newer Xeons.
+ONNX_FILES = {
+    "onnx": "onnx/model.onnx",
+    "onnx-int8": "onnx/model_quint8_avx2.onnx",
+}
+
+BACKENDS = ["torch", *ONNX_FILES]
+
+
+def load_embedding_model(backend=EMBEDDING_BACKEND, threads=EMBEDDING_THREADS):
+    """
+    Load the sentence embedding model on the configured CPU runtime.
+    `threads` caps intra-op parallelism (None keeps the runtime default).
+    """
+    if backend not in BACKENDS:
+        raise ValueError(
+            f"Unknown embedding backend '{backend}', expected one of "
+            f"{BACKENDS}"
+        )
+
+    if backend == "torch":
+        if threads:
+            import torch
+
+            torch.set_num_threads(threads)
+        return SentenceTransformer(EMBEDDING_MODEL_NAME)
+
+    try:
+        import onnxruntime
+    except ImportError as e:
+        raise ImportError(
+            f"The '{backend}' embedding backend needs onnxruntime and "
+            "optimum: pip install 'optimum[onnxruntime]'"
+        ) from e
+
+    options = onnxruntime.SessionOptions()
+    options.graph_optimization_level = (
+        onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+    )
+    if threads:
+        options.intra_op_num_threads = threads
+        options.inter_op_num_threads = 1
+
+    return SentenceTransformer(
+        EMBEDDING_MODEL_NAME,
+        backend="onnx",
+        model_kwargs={
+            "file_name": ONNX_FILES[backend],
+            "provider": "CPUExecutionProvider",
+            "session_options": options,
+        },
+    )
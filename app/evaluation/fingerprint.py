@@ -0,0 +1,59 @@
+import hashlib
+import inspect
+import json
+
+# Fingerprints for incremental re-evaluation. A stored metric score is
+# tagged with a digest of the recipe it scored and of everything the
+# metric depends on (its code, keyword tables, config values); scores
+# whose tag still matches can be carried over instead of recomputed.
+
+
+def describe(part):
+    # Source for code, a stable JSON dump for data
+    if inspect.ismodule(part) or inspect.isclass(part):
+        return inspect.getsource(part)
+    if inspect.isfunction(part):
+        return f"{part.__module__}.{part.__qualname__}\n" + inspect.getsource(
+            part
+        )
+    return json.dumps(part, sort_keys=True, default=str)
+
+
+def digest(*parts):
+    h = hashlib.blake2b(digest_size=8)
+    for part in parts:
+        h.update(describe(part).encode())
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def recipe_fingerprint(entry):
+    """Digest of what a recipe's scores are computed from"""
+    return digest(entry.get("input", {}), entry.get("recipe", ""))
+
+
+def metric_fingerprints(entry, versions):
+    """
+    metric -> fingerprint of `entry` under that metric's current
+    version (see scoring.metric_versions).
+    """
+    recipe = recipe_fingerprint(entry)
+    return {
+        name: digest(recipe, version) for name, version in versions.items()
+    }
+
+
+def carried_scores(fingerprints, previous):
+    """
+    Scores in the `previous` scored record whose stored fingerprints match
+    `fingerprints`, i.e. the ones that would come out the same.
+    """
+    if not previous:
+        return {}
+    stored = previous.get("fingerprints", {})
+    scores = previous.get("scores", {})
+    return {
+        name: scores[name]
+        for name, fingerprint in fingerprints.items()
+        if stored.get(name) == fingerprint and name in scores
+    }
@@ -0,0 +1,55 @@
+# Keyword signals for ABED descriptors, shared by scoring and the recipe
+# index. Kept free of heavy imports so the index can be built without
+# loading the embedding model.
+
+FLAVOR_KEYWORDS = {
+    "sweet": ["sugar", "honey", "syrup", "molasses", "maple"],
+    "tangy": ["lemon", "lime", "vinegar", "pickled", "tamarind"],
+    "salty": ["salt", "soy sauce", "brine"],
+    "peppery": ["chili", "pepper", "hot sauce", "jalapeno"],
+    "spiced": [
+        "cinnamon",
+        "cumin",
+        "garlic",
+        "onion",
+        "ginger",
+        "nutmeg",
+        "clove",
+    ],
+    "fatty": ["butter", "cream", "bacon", "oil"],
+    "bitter": ["coffee", "dark chocolate", "kale"],
+    "earthy": ["mushroom", "truffle", "miso", "soy"],
+}
+
+TEXTURE_KEYWORDS = {
+    "crispy": ["crisp", "crunch", "bake", "fry"],
+    "chewy": ["chewy", "doughy", "stretchy"],
+    "creamy": ["cream", "custard", "puree", "smooth"],
+    "fluffy": ["fluffy", "airy", "whipped"],
+    "juicy": ["juicy", "moist", "dripping"],
+    "smooth": ["smooth", "silky"],
+    "dry": ["dry", "crumbly"],
+    "soft": ["soft", "tender"],
+    "grainy": ["grainy", "grain", "rice", "course"],
+}
+
+# Matched against recipe titles only; steps mention too many dishes
+TYPE_KEYWORDS = {
+    "snack": ["snack", "bites", "chips", "popcorn", "trail mix", "jerky"],
+    "breakfast": [
+        "breakfast",
+        "pancake",
+        "waffle",
+        "omelet",
+        "granola",
+        "french toast",
+    ],
+    "lunch": ["lunch", "sandwich", "salad", "wrap", "soup"],
+    "appetizer": ["appetizer", "dip", "bruschetta", "canape", "deviled"],
+    "dinner": ["dinner", "roast", "casserole", "stew", "curry", "lasagna"],
+    "dessert": ["dessert", "cake", "cookie", "pie", "pudding", "brownie"],
+}
+
+
+def match_keywords(keywords, text):
+    return any(word in text for word in keywords)
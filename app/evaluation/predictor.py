@@ -0,0 +1,244 @@
+import hashlib
+import json
+import pickle
+import numpy as np
+import yaml
+from config import (
+    METRICS_CONFIG_FILE,
+    LOGS_DIR,
+    EMBEDDING_CACHE_FILE,
+    RATING_MODEL_FILE,
+    RATING_RIDGE,
+    RATING_HOLDOUT,
+)
+from app.utils.writer import lock_for, write_atomic
+
+# Predicts the normalized human rating (0-1, see review.py) of a recipe
+# from its per-metric scores and its cached MiniLM embedding with ridge
+# regression. The model is kept as sufficient statistics (X'X, X'y), so
+# new ratings are folded in without revisiting old ones and refitting is
+# one small linear solve.
+
+with open(METRICS_CONFIG_FILE) as f:
+    METRIC_NAMES = list(yaml.safe_load(f)["weights"])
+
+SCORE_FEATURES = [*METRIC_NAMES, "RScore"]
+
+
+def rating_key(rating):
+    return f"{rating.get('timestamp')}|{rating.get('title')}"
+
+
+def is_holdout(key, share=RATING_HOLDOUT):
+    # Stable split: a rating is held out (or not) forever
+    digest = hashlib.blake2b(key.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big") % 1000 < share * 1000
+
+
+def load_ratings(log_dir=LOGS_DIR):
+    ratings = []
+    for path in sorted(log_dir.glob("*/*/*/ratings.jsonl")):
+        with lock_for(path), open(path) as f:
+            ratings += [json.loads(line) for line in f if line.strip()]
+    return ratings
+
+
+def load_embedding_cache(path=EMBEDDING_CACHE_FILE):
+    # embedding key -> embedding, as written by scoring.py
+    if not path.exists():
+        return {}
+    with lock_for(path), open(path, "rb") as f:
+        cache = pickle.load(f)
+    return {title: np.asarray(vector) for title, vector in cache.items()}
+
+
+def embedding_lookup(rating):
+    # Ratings logged before embeddings were keyed by content used the title
+    return rating.get("embedding_key") or rating["title"].strip().lower()
+
+
+class RatingPredictor:
+    """
+    Ridge regression over [metric scores, RScore, embedding, has-embedding,
+    bias]. Metrics a record lacks (skipped by lazy scoring, or ratings
+    saved before per-metric scores were logged) are filled with the
+    running mean of that metric, as is the RScore of a record with skipped
+    metrics, which only bounds the full score from below.
+    """
+
+    def __init__(self, embedding_dim=0, ridge=RATING_RIDGE):
+        self.embedding_dim = embedding_dim
+        self.ridge = ridge
+        dim = len(SCORE_FEATURES) + embedding_dim + 2
+        self.xtx = np.zeros((dim, dim))
+        self.xty = np.zeros(dim)
+        self.n = 0
+        self.seen = set()
+        self.weights = np.zeros(dim)
+
+    @property
+    def means(self):
+        # The bias column is all ones, so its row of X'X holds column sums
+        k = len(SCORE_FEATURES)
+        if not self.n:
+            return np.full(k, 0.5)
+        return self.xtx[-1, :k] / self.n
+
+    def features(self, score_dicts, embeddings):
+        """
+        Design matrix for a batch of recipes. `embeddings` holds one vector
+        (or None) per recipe.
+        """
+        rows = len(score_dicts)
+        scores = np.array(
+            [
+                [
+                    (
+                        np.nan
+                        if name == "RScore" and s.get("skipped")
+                        else s.get(name, np.nan)
+                    )
+                    for name in SCORE_FEATURES
+                ]
+                for s in score_dicts
+            ],
+            dtype=float,
+        ).reshape(rows, len(SCORE_FEATURES))
+        scores = np.where(np.isnan(scores), self.means, scores)
+
+        vectors = np.zeros((rows, self.embedding_dim))
+        present = np.zeros(rows)
+        for i, vector in enumerate(embeddings):
+            if vector is not None and self.embedding_dim:
+                vectors[i] = vector
+                present[i] = 1
+        return np.column_stack([scores, vectors, present, np.ones(rows)])
+
+    def partial_fit(self, X, y):
+        self.xtx += X.T @ X
+        self.xty += X.T @ y
+        self.n += len(y)
+
+    def solve(self):
+        penalty = np.full(len(self.xty), self.ridge)
+        penalty[-1] = 0  # don't shrink the bias
+        self.weights = np.linalg.solve(self.xtx + np.diag(penalty), self.xty)
+        return self.weights
+
+    def predict(self, X):
+        return np.clip(X @ self.weights, 0.0, 1.0)
+
+    def save(self, path=RATING_MODEL_FILE):
+        meta = {
+            "embedding_dim": self.embedding_dim,
+            "ridge": self.ridge,
+            "n": self.n,
+            "features": SCORE_FEATURES,
+            "seen": sorted(self.seen),
+        }
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp.npz")
+        np.savez(
+            tmp,
+            xtx=self.xtx,
+            xty=self.xty,
+            weights=self.weights,
+        )
+        tmp.replace(path)
+        write_atomic(path.with_suffix(".json"), json.dumps(meta))
+
+    @classmethod
+    def load(cls, path=RATING_MODEL_FILE):
+        with open(path.with_suffix(".json")) as f:
+            meta = json.load(f)
+        if meta["features"] != SCORE_FEATURES:
+            raise ValueError(
+                "Metrics changed since the rating model was fit, rebuild it"
+            )
+        model = cls(meta["embedding_dim"], meta["ridge"])
+        with np.load(path) as arrays:
+            model.xtx = arrays["xtx"]
+            model.xty = arrays["xty"]
+            model.weights = arrays["weights"]
+        model.n = meta["n"]
+        model.seen = set(meta["seen"])
+        return model
+
+
+def rating_matrix(model, ratings, cache):
+    scores = [
+        {
+            **r.get("scores", {}),
+            "RScore": r.get("RScore", np.nan),
+            "skipped": r.get("skipped"),
+        }
+        for r in ratings
+    ]
+    embeddings = [cache.get(embedding_lookup(r)) for r in ratings]
+    y = np.array([r["human_rating"] for r in ratings], dtype=float)
+    return model.features(scores, embeddings), y
+
+
+def refit(model=None, ratings=None, cache=None):
+    """
+    Fold every rating the model hasn't seen (outside the held-out share)
+    into its statistics and re-solve. Returns the model and the number of
+    ratings added.
+    """
+    ratings = load_ratings() if ratings is None else ratings
+    cache = load_embedding_cache() if cache is None else cache
+    if model is None:
+        dim = len(next(iter(cache.values()))) if cache else 0
+        model = RatingPredictor(dim)
+
+    new = [
+        r
+        for r in ratings
+        if rating_key(r) not in model.seen and not is_holdout(rating_key(r))
+    ]
+    if new:
+        X, y = rating_matrix(model, new, cache)
+        model.partial_fit(X, y)
+        model.seen.update(rating_key(r) for r in new)
+    if model.n:
+        model.solve()
+    return model, len(new)
+
+
+def pairwise_agreement(predicted, actual):
+    # Share of rating pairs that both put in the same order (ties skipped)
+    pred_diff = np.sign(predicted[:, None] - predicted[None, :])
+    true_diff = np.sign(actual[:, None] - actual[None, :])
+    mask = np.triu(true_diff != 0, k=1)
+    if not mask.any():
+        return float("nan")
+    return float(np.mean(pred_diff[mask] == true_diff[mask]))
+
+
+def correlation(a, b):
+    if len(a) < 2 or np.std(a) == 0 or np.std(b) == 0:
+        return float("nan")
+    return float(np.corrcoef(a, b)[0, 1])
+
+
+def agreement_report(model, ratings=None, cache=None):
+    """
+    How well the model and the hand-weighted RScore agree with held-out
+    human ratings. Returns a dict keyed by "model" and "RScore".
+    """
+    ratings = load_ratings() if ratings is None else ratings
+    cache = load_embedding_cache() if cache is None else cache
+    held_out = [r for r in ratings if is_holdout(rating_key(r))]
+    if not held_out:
+        return {}
+
+    X, y = rating_matrix(model, held_out, cache)
+    baseline = np.array([r.get("RScore", 0.0) for r in held_out], dtype=float)
+    report = {"count": len(held_out)}
+    for name, predicted in [("model", model.predict(X)), ("RScore", baseline)]:
+        report[name] = {
+            "mae": float(np.mean(np.abs(predicted - y))),
+            "pearson": correlation(predicted, y),
+            "pairwise": pairwise_agreement(predicted, y),
+        }
+    return report
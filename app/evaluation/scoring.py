@@ -1,178 +1,195 @@
-import re
+import hashlib
+import io
 import yaml
 import csv
 from datetime import datetime
 import json
 from pathlib import Path
-from config import METRICS_CONFIG_FILE, GENERATIONS_LOG_FILE
-from sentence_transformers import SentenceTransformer, util
+from config import (
+    METRICS_CONFIG_FILE,
+    GENERATIONS_LOG_FILE,
+    EMBEDDING_CACHE_FILE,
+    EMBEDDING_MODEL_NAME,
+    EMBEDDING_BACKEND,
+    ABED_ALIGNMENT,
+    VOCAB_FILE,
+)
+from sentence_transformers import util
 import pickle
-
-EMBEDDING_CACHE_PATH = Path("logs") / "embeddings_cache.pkl"
+import torch
+from functools import cache
+from app.utils.writer import WRITER, lock_for
+from app.utils.logging import day_log_dir
+from app.utils import ingredients as ingredients_module
+from app.utils.ingredients import extract_ingredient_name
+from app.evaluation import alignment as alignment_module
+from app.evaluation.constraints import (
+    IMPLAUSIBLE_PHRASES,
+    find_implausible_phrase,
+)
+from app.utils.parser import parse_markdown_recipe
+from app.evaluation.embeddings import load_embedding_model
+from app.evaluation.alignment import DescriptorEmbeddings
+from app.evaluation.fingerprint import digest
+from app.evaluation.keywords import (
+    FLAVOR_KEYWORDS,
+    TEXTURE_KEYWORDS,
+    TYPE_KEYWORDS,
+    match_keywords,
+)
+
+EMBEDDING_CACHE_PATH = EMBEDDING_CACHE_FILE
 if EMBEDDING_CACHE_PATH.exists():
     with open(EMBEDDING_CACHE_PATH, "rb") as f:
         EMBEDDING_CACHE = pickle.load(f)
 else:
     EMBEDDING_CACHE = {}
 
-EMBEDDING_MODEL = SentenceTransformer("all-MiniLM-L6-v2")
+EMBEDDING_MODEL = load_embedding_model()
 
 # Load metric config from YAML
 with open(METRICS_CONFIG_FILE) as f:
     METRICS_CONFIG_FILE = yaml.safe_load(f)
 
-FLAVOR_KEYWORDS = {
-    "sweet": ["sugar", "honey", "syrup", "molasses", "maple"],
-    "tangy": ["lemon", "lime", "vinegar", "pickled", "tamarind"],
-    "salty": ["salt", "soy sauce", "brine"],
-    "peppery": ["chili", "pepper", "hot sauce", "jalapeno"],
-    "spiced": [
-        "cinnamon",
-        "cumin",
-        "garlic",
-        "onion",
-        "ginger",
-        "nutmeg",
-        "clove",
-    ],
-    "fatty": ["butter", "cream", "bacon", "oil"],
-    "bitter": ["coffee", "dark chocolate", "kale"],
-    "earthy": ["mushroom", "truffle", "miso", "soy"],
-}
-
-TEXTURE_KEYWORDS = {
-    "crispy": ["crisp", "crunch", "bake", "fry"],
-    "chewy": ["chewy", "doughy", "stretchy"],
-    "creamy": ["cream", "custard", "puree", "smooth"],
-    "fluffy": ["fluffy", "airy", "whipped"],
-    "juicy": ["juicy", "moist", "dripping"],
-    "smooth": ["smooth", "silky"],
-    "dry": ["dry", "crumbly"],
-    "soft": ["soft", "tender"],
-    "grainy": ["grainy", "grain", "rice", "course"],
+# Metric registry: name -> function of the scoring context. Every metric
+# returns a value in [0, 1]; its weight and relative cost come from
+# metrics_config.yaml.
+METRICS = {
+    "ingredient_usage_completeness": lambda ctx: score_ingredient_usage(
+        ctx["normalized_ingredients"], ctx["steps"]
+    ),
+    "instruction_coherence": lambda ctx: score_instruction_coherence(
+        ctx["steps"]
+    ),
+    "cues": lambda ctx: score_cues(ctx["steps"]),
+    "plausibility": lambda ctx: score_plausibility(ctx["steps"]),
+    "novelty": lambda ctx: score_novelty(
+        ctx["entry"], record=ctx["record_novelty"], logged=ctx["logged"]
+    ),
+    "conciseness": lambda ctx: score_conciseness(ctx["steps"]),
+    "redundancy_clarity": lambda ctx: score_redundancy_clarity(ctx["steps"]),
+    "abed_alignment": lambda ctx: score_abed_alignment(
+        ctx["entry"], ctx["steps"], ctx["ingredients"]
+    ),
 }
 
-MEASURE_WORDS = [
-    "tsp",
-    "tbsp",
-    "teaspoon",
-    "tablespoon",
-    "cup",
-    "cups",
-    "oz",
-    "ounce",
-    "ounces",
-    "pint",
-    "quart",
-    "gallon",
-    "ml",
-    "liter",
-    "liters",
-    "grams",
-    "g",
-    "kg",
-    "pound",
-    "lb",
-    "lbs",
-    "dash",
-    "pinch",
-    "can",
-    "cans",
-    "package",
-    "packages",
-]
-
-PREP_METHODS = [
-    "minced",
-    "chopped",
-    "diced",
-    "sliced",
-    "crushed",
-    "grated",
-    "peeled",
-    "halved",
-    "shredded",
-    "zested",
-    "mashed",
-    "beaten",
-    "whisked",
-    "blended",
-    "rinsed",
-    "drained",
-    "to",
-    "taste",
-    "and",
-]
 
-STOPWORDS = set(MEASURE_WORDS + PREP_METHODS)
+def metric_cost(name):
+    return METRICS_CONFIG_FILE.get("costs", {}).get(name, 1)
 
 
 def score_recipe(
-    recipe_entry, parsed_steps, parsed_ingredients, log_reviews=False
+    recipe_entry,
+    parsed_steps,
+    parsed_ingredients,
+    log_reviews=False,
+    session=None,
+    novelty=None,
+    target=None,
+    record_novelty=True,
+    reuse=None,
+    logged=False,
 ):
     """
     Score a single recipe entry from the generated_recipes.json file.
 
     Parameters:
     - recipe_entry (dict): contains "input", "prompt", "recipe"
+    - session (LogSession): batches review logging across many recipes
+    - novelty (float): precomputed novelty, e.g. from score_recipes
+    - target (float): acceptance RScore. Metrics then run cheapest first
+      and stop as soon as the remaining ones can't change whether the
+      recipe reaches the target; those are listed under "skipped"
+    - record_novelty (bool): add the recipe to the generations log
+    - reuse (dict): metric scores still valid from an earlier run (see
+      fingerprint.carried_scores); these are not recomputed
+    - logged (bool): the recipe is already in the generations log from
+      earlier runs, so novelty leaves out its own rows
 
     Returns:
-    - dict: dictionary of individual metric scores and weighted total
+    - dict: dictionary of individual metric scores and weighted total.
+      With skipped metrics, RScore counts them as 0: a lower bound that is
+      at least `target` exactly when the recipe would be accepted.
     """
-    normalized_ingredients = [
-        extract_ingredient_name(ing) for ing in parsed_ingredients
-    ]
-
-    scores = {
-        "ingredient_usage_completeness": score_ingredient_usage(
-            normalized_ingredients, parsed_steps
-        ),
-        "instruction_coherence": score_instruction_coherence(parsed_steps),
-        "cues": score_cues(parsed_steps),
-        "plausibility": score_plausibility(parsed_steps),
-        "novelty": score_novelty(recipe_entry),
-        "conciseness": score_conciseness(parsed_steps),
-        "redundancy_clarity": score_redundancy_clarity(parsed_steps),
-        "abed_alignment": score_abed_alignment(
-            recipe_entry, parsed_steps, parsed_ingredients
-        ),
+    context = {
+        "entry": recipe_entry,
+        "steps": parsed_steps,
+        "ingredients": parsed_ingredients,
+        "normalized_ingredients": [
+            extract_ingredient_name(ing) for ing in parsed_ingredients
+        ],
+        "record_novelty": record_novelty,
+        "logged": logged,
     }
 
     # Weights for each metric
     weights = METRICS_CONFIG_FILE["weights"]
 
-    total = sum(scores[k] * weights.get(k, 0) for k in scores)
+    order = list(METRICS)
+    if target is not None:
+        order.sort(key=metric_cost)
+
+    known = dict(reuse or {})
+    if novelty is not None:
+        known["novelty"] = novelty
+
+    scores = {}
+    skipped = []
+    total = 0.0
+    remaining = sum(weights.get(name, 0) for name in order)
+    for name in order:
+        if target is not None and (
+            total >= target or total + remaining < target
+        ):
+            skipped.append(name)
+            continue
+        if name in known:
+            scores[name] = known[name]
+        else:
+            scores[name] = METRICS[name](context)
+        total += scores[name] * weights.get(name, 0)
+        remaining -= weights.get(name, 0)
+
     scores["RScore"] = round(total, 4)
+    if skipped:
+        scores["skipped"] = skipped
 
-    if log_reviews:
-        title_line = (
-            recipe_entry["recipe"]
-            .split("**Title:**")[1]
-            .split("\n")[0]
-            .strip()
-        )
-        log_entry = {
-            "timestamp": datetime.now().isoformat(),
-            "title": title_line,
-            "abed_input": recipe_entry.get("input", {}),
-            "RScore": scores["RScore"],
-        }
+    # Whether or not novelty was scored, the recipe is now part of the
+    # history later recipes are compared against
+    if record_novelty and "novelty" in skipped:
+        title, ingredients = entry_recipe(recipe_entry)
+        record_generation(title, novelty_text(title, ingredients)[1])
 
-        today = datetime.now()
-        log_path = (
-            Path("logs")
-            / str(today.year)
-            / f"{today.month:02d}"
-            / f"{today.day:02d}"
-            / "reviews.jsonl"
-        )
-        log_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(log_path, "a") as f:
-            f.write(json.dumps(log_entry) + "\n")
+    if log_reviews:
+        log_review(recipe_entry, scores, session)
 
     return scores
 
 
+def log_review(recipe_entry, scores, session=None):
+    # Queue the reviews.jsonl entry review.py picks recipes from
+    title_line = (
+        recipe_entry["recipe"].split("**Title:**")[1].split("\n")[0].strip()
+    )
+    log_entry = {
+        "timestamp": datetime.now().isoformat(),
+        "title": title_line,
+        "abed_input": recipe_entry.get("input", {}),
+        "RScore": scores["RScore"],
+        "scores": {name: scores[name] for name in METRICS if name in scores},
+        "embedding_key": recipe_embedding_key(*entry_recipe(recipe_entry)),
+    }
+    if scores.get("skipped"):
+        # RScore counted these as 0, so it is only a lower bound
+        log_entry["skipped"] = scores["skipped"]
+
+    if session is not None:
+        session.log_review(log_entry)
+    else:
+        log_path = day_log_dir(Path("logs")) / "reviews.jsonl"
+        WRITER.append(log_path, json.dumps(log_entry) + "\n")
+
+
 def score_ingredient_usage(ingredients, steps):
     # Score based on % of ingredients mentioned in instructions
     instructions_text = " ".join(steps)
@@ -242,44 +259,117 @@ def score_plausibility(steps):
     # Brute force check for implausible instructions
     # assume plausible unless known red flag is found
     instructions = " ".join(steps)
-    implausible_phrases = [
-        "microwave for 2 hours",
-        "boil lettuce",
-        "grill yogurt",
-    ]
-    for bad in implausible_phrases:
-        if bad in instructions.lower():
-            return 0.0
+    if find_implausible_phrase(instructions):
+        return 0.0
     return 1.0
 
 
-def extract_ingredient_name(line):
-    # Remove bullet, lowercase, remove punctuation
-    line = re.sub(r"[^a-zA-Z\s]", "", line.lower().strip("- "))
-    tokens = line.split()
+def jaccard_similarity_set(set_a, set_b):
+    return len(set_a & set_b) / len(set_a | set_b)
 
-    # Filter out quantities and techniques
-    filtered = [
-        word
-        for word in tokens
-        if word not in STOPWORDS and not word.isnumeric()
-    ]
-    return " ".join(filtered)
 
+GENERATIONS_LOG_FIELDS = ["title", "ingredients"]
+
+
+def format_csv_row(row, header=False):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=GENERATIONS_LOG_FIELDS)
+    if header:
+        writer.writeheader()
+    else:
+        writer.writerow(row)
+    return buffer.getvalue()
+
+
+def novelty_text(title, ingredients):
+    ingredient_text = ", ".join(
+        extract_ingredient_name(ing) for ing in ingredients if ing.strip()
+    )
+    return f"{title}. Ingredients: {ingredient_text}", ingredient_text
+
+
+def embedding_key(text):
+    # Embeddings are cached by the exact text encoded, so two recipes that
+    # share a title (best-of-N candidates, retries) never share a vector,
+    # and by the model and runtime that encoded it (onnx-int8 vectors only
+    # approximate the torch ones)
+    h = hashlib.blake2b(digest_size=8)
+    for part in (EMBEDDING_MODEL_NAME, EMBEDDING_BACKEND, text):
+        h.update(part.encode() + b"\0")
+    return h.hexdigest()
+
+
+def recipe_embedding_key(title, ingredients):
+    return embedding_key(novelty_text(title.strip().lower(), ingredients)[0])
+
+
+def encode_recipe(title, ingredients):
+    """
+    Embed a recipe's title and ingredients without touching the cache.
+    Returns the cache key and the embedding; see cache_embedding.
+    """
+    current_text, _ = novelty_text(title.strip().lower(), ingredients)
+    embedding = EMBEDDING_MODEL.encode(current_text, convert_to_tensor=True)
+    return embedding_key(current_text), embedding
+
+
+def cache_embedding(key, embedding):
+    EMBEDDING_CACHE[key] = embedding
+    WRITER.merge(EMBEDDING_CACHE_PATH, {key: embedding})
 
-def jaccard_similarity_set(set_a, set_b):
-    return len(set_a & set_b) / len(set_a | set_b)
 
+def embed_recipe(title, ingredients):
+    """
+    Embed a recipe's title and ingredients for novelty scoring, using the
+    shared cache. Only needs the title and ingredient lines, so it can run
+    while the rest of a streamed recipe is still arriving.
+    """
+    current_text, ingredient_text = novelty_text(
+        title.strip().lower(), ingredients
+    )
+    key = embedding_key(current_text)
+    if key in EMBEDDING_CACHE:
+        return EMBEDDING_CACHE[key], ingredient_text
 
-def score_novelty(recipe_entry):
+    key, embedding = encode_recipe(title, ingredients)
+    cache_embedding(key, embedding)
+    return embedding, ingredient_text
+
+
+def load_past_embeddings(exclude=None):
+    # `exclude`: embedding key whose rows are left out, a re-scored
+    # recipe's own
     log_path = GENERATIONS_LOG_FILE
 
-    if not log_path.exists():
-        log_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(log_path, "w", newline="") as f:
-            writer = csv.DictWriter(f, fieldnames=["title", "ingredients"])
-            writer.writeheader()
+    # Make rows queued by this process visible to the reader below
+    WRITER.flush(log_path, sync=False)
 
+    # Snapshot the log under its lock so a concurrent append can't hand us
+    # a half-written row
+    rows = []
+    if log_path.exists():
+        with lock_for(log_path), open(log_path, "r") as f:
+            rows = list(csv.DictReader(f))
+
+    embeddings = []
+    for row in rows:
+        past_text = f"{row['title']}. Ingredients: {row['ingredients']}"
+        key = embedding_key(past_text)
+        if key == exclude:
+            continue
+        if key in EMBEDDING_CACHE:
+            past_embedding = EMBEDDING_CACHE[key]
+        else:
+            past_embedding = EMBEDDING_MODEL.encode(
+                past_text, convert_to_tensor=True
+            )
+            cache_embedding(key, past_embedding)
+        embeddings.append(past_embedding)
+    return embeddings
+
+
+def entry_recipe(recipe_entry):
+    # The title and ingredient lines novelty embeds for a generated entry
     title = (
         recipe_entry["recipe"]
         .split("**Title:**")[1]
@@ -287,74 +377,152 @@ def score_novelty(recipe_entry):
         .strip()
         .lower()
     )
-    ingredients = recipe_entry["recipe"].split("\n")
-    ingredient_text = ", ".join(
-        extract_ingredient_name(ing) for ing in ingredients if ing.strip()
-    )
-    current_text = f"{title}. Ingredients: {ingredient_text}"
-    if title in EMBEDDING_CACHE:
-        current_embedding = EMBEDDING_CACHE[title]
+    if recipe_entry.get("parsed"):
+        ingredients = recipe_entry["parsed"]["ingredients"]
     else:
-        current_embedding = EMBEDDING_MODEL.encode(
-            current_text, convert_to_tensor=True
-        )
-        EMBEDDING_CACHE[title] = current_embedding
-        with open(EMBEDDING_CACHE_PATH, "wb") as f:
-            pickle.dump(EMBEDDING_CACHE, f)
+        ingredients = recipe_entry["recipe"].split("\n")
+    return title, ingredients
 
-    similarities = []
-    if log_path.exists():
-        with open(log_path, "r") as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                past_text = (
-                    f"{row['title']}. Ingredients: {row['ingredients']}"
-                )
-                if row["title"] in EMBEDDING_CACHE:
-                    past_embedding = EMBEDDING_CACHE[row["title"]]
-                else:
-                    past_embedding = EMBEDDING_MODEL.encode(
-                        past_text, convert_to_tensor=True
-                    )
-                    EMBEDDING_CACHE[row["title"]] = past_embedding
-                    with open(EMBEDDING_CACHE_PATH, "wb") as f:
-                        pickle.dump(EMBEDDING_CACHE, f)
-                sim = util.pytorch_cos_sim(
-                    current_embedding, past_embedding
-                ).item()
-                similarities.append(sim)
+
+def embed_entry(recipe_entry):
+    title, ingredients = entry_recipe(recipe_entry)
+    return title, *embed_recipe(title, ingredients)
+
+
+def score_novelty(recipe_entry, record=True, logged=False):
+    title, current_embedding, ingredient_text = embed_entry(recipe_entry)
+    # Every full run logs a recipe again, and each of those rows would
+    # match it when it is re-scored
+    own = recipe_embedding_key(*entry_recipe(recipe_entry)) if logged else None
+
+    similarities = [
+        util.pytorch_cos_sim(current_embedding, past_embedding).item()
+        for past_embedding in load_past_embeddings(exclude=own)
+    ]
 
     max_sim = max(similarities, default=0)
     novelty_score = 1.0 - max_sim
 
-    with open(log_path, "a", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=["title", "ingredients"])
-        writer.writerow(
-            {
-                "title": title,
-                "ingredients": ingredient_text,
-            }
-        )
+    if record:
+        record_generation(title, ingredient_text)
 
     return round(novelty_score, 2)
 
 
+def record_generation(title, ingredient_text):
+    # Add a recipe to the generations log novelty compares against
+    WRITER.append(
+        GENERATIONS_LOG_FILE,
+        format_csv_row({"title": title, "ingredients": ingredient_text}),
+        header=format_csv_row(None, header=True),
+    )
+
+
+def score_recipes(recipe_entries, target=None):
+    """
+    Score several candidate recipes (e.g. best-of-N samples for one prompt)
+    in a single pass: uncached embeddings are encoded in one batch and
+    compared against the generations log once. Candidates are not added to
+    the generations log or reviews, so scoring them doesn't affect novelty.
+    With `target`, each recipe is scored lazily as in score_recipe instead.
+
+    Returns:
+    - list: score dicts in the same order as `recipe_entries`
+    """
+    recipe_entries = [
+        {
+            **entry,
+            "parsed": entry.get("parsed")
+            or parse_markdown_recipe(entry["recipe"]),
+        }
+        for entry in recipe_entries
+    ]
+    parsed = [entry["parsed"] for entry in recipe_entries]
+
+    if target is not None:
+        return [
+            score_recipe(
+                entry,
+                p["steps"],
+                p["ingredients"],
+                target=target,
+                record_novelty=False,
+            )
+            for entry, p in zip(recipe_entries, parsed)
+        ]
+
+    texts = [
+        novelty_text(p["title"].strip().lower(), p["ingredients"])[0]
+        for p in parsed
+    ]
+    keys = [embedding_key(text) for text in texts]
+
+    missing = {}
+    for key, text in zip(keys, texts):
+        if key not in EMBEDDING_CACHE:
+            missing[key] = text
+    if missing:
+        encoded = EMBEDDING_MODEL.encode(
+            list(missing.values()), convert_to_tensor=True
+        )
+        new_embeddings = dict(zip(missing, encoded))
+        EMBEDDING_CACHE.update(new_embeddings)
+        WRITER.merge(EMBEDDING_CACHE_PATH, new_embeddings)
+
+    past = load_past_embeddings()
+    if past:
+        current = torch.stack([EMBEDDING_CACHE[key] for key in keys])
+        max_sims = util.cos_sim(current, torch.stack(past)).max(dim=1)
+        max_sims = max_sims.values.tolist()
+    else:
+        max_sims = [0] * len(keys)
+
+    return [
+        score_recipe(
+            entry,
+            p["steps"],
+            p["ingredients"],
+            novelty=round(1.0 - max_sim, 2),
+        )
+        for entry, p, max_sim in zip(recipe_entries, parsed, max_sims)
+    ]
+
+
 def score_conciseness(steps):
     lines = [line for line in steps if line.strip()]
     repeated = sum(1 for i in range(1, len(lines)) if lines[i] == lines[i - 1])
     return round(1 - repeated / len(lines), 2) if lines else 1.0
 
 
-def match_keywords(keywords, text):
-    return any(word in text for word in keywords)
+@cache
+def descriptor_embeddings():
+    return DescriptorEmbeddings.load(EMBEDDING_MODEL)
 
 
 def score_abed_alignment(recipe_entry, steps, ingredients):
+    """
+    How well a recipe matches its requested flavors, textures and type.
+    By default compares the novelty embedding of its title and
+    ingredients (computed once and cached, so this adds no encoder call)
+    against precomputed vocab embeddings; ABED_ALIGNMENT = "keyword"
+    falls back to substring matches against the keyword tables.
+    """
     abeds = recipe_entry.get("input", {})
 
     if not abeds:
         return 0.0
 
+    if ABED_ALIGNMENT == "keyword":
+        return score_abed_keywords(abeds, steps, ingredients)
+
+    _, embedding, _ = embed_entry(
+        {**recipe_entry, "parsed": {"ingredients": ingredients}}
+    )
+    return descriptor_embeddings().alignment(embedding, abeds)
+
+
+def score_abed_keywords(abeds, steps, ingredients):
+    # Share of requested descriptors with a keyword in the recipe text
     score = 0
     total = 0
 
@@ -363,6 +531,7 @@ def score_abed_alignment(recipe_entry, steps, ingredients):
 
     # Flavor
     for flavor in abeds.get("flavor", []):
+        flavor = flavor.lower()
         total += 1
         if flavor in FLAVOR_KEYWORDS and match_keywords(
             FLAVOR_KEYWORDS[flavor], text
@@ -371,6 +540,7 @@ def score_abed_alignment(recipe_entry, steps, ingredients):
 
     # Texture
     for texture in abeds.get("texture", []):
+        texture = texture.lower()
         total += 1
         if texture in TEXTURE_KEYWORDS and match_keywords(
             TEXTURE_KEYWORDS[texture], text
@@ -416,3 +586,50 @@ def score_redundancy_clarity(steps):
     penalty = (repeated_lines + order_issues) * 0.2
     score = max(0.0, 1.0 - penalty)
     return round(score, 2)
+
+
+# What each metric's score depends on besides the recipe itself: the code
+# that computes it and the tables and config it reads. Editing any of
+# these makes the stored scores of that metric stale for
+# `evaluate.py --incremental`. Novelty deliberately leaves out the
+# generations log it compares against, which grows on every run.
+EMBEDDING_INPUTS = [
+    embed_entry,
+    entry_recipe,
+    embed_recipe,
+    encode_recipe,
+    embedding_key,
+    novelty_text,
+    ingredients_module,
+    EMBEDDING_MODEL_NAME,
+    EMBEDDING_BACKEND,
+]
+METRIC_INPUTS = {
+    "ingredient_usage_completeness": [
+        score_ingredient_usage,
+        ingredients_module,
+    ],
+    "instruction_coherence": [score_instruction_coherence],
+    "cues": [score_cues],
+    "plausibility": [score_plausibility, IMPLAUSIBLE_PHRASES],
+    "novelty": [score_novelty, load_past_embeddings, *EMBEDDING_INPUTS],
+    "conciseness": [score_conciseness],
+    "redundancy_clarity": [score_redundancy_clarity],
+    "abed_alignment": [
+        score_abed_alignment,
+        score_abed_keywords,
+        alignment_module,
+        FLAVOR_KEYWORDS,
+        TEXTURE_KEYWORDS,
+        TYPE_KEYWORDS,
+        VOCAB_FILE.read_text() if VOCAB_FILE.exists() else None,
+        ABED_ALIGNMENT,
+        *EMBEDDING_INPUTS,
+    ],
+}
+
+
+@cache
+def metric_versions():
+    """metric -> digest of everything in METRIC_INPUTS for it"""
+    return {name: digest(name, *METRIC_INPUTS[name]) for name in METRICS}
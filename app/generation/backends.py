@@ -0,0 +1,158 @@
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from config import ROOT_DIR, TEMPERATURE, MAX_TOKENS
+from app.utils.ingredients import parse_ingredient
+
+LOCAL_PREFIX = "local:"
+
+SYSTEM_PROMPT = (
+    "You are a helpful culinary assistant that turns abstract "
+    "descriptors into complete recipes."
+)
+
+
+@dataclass
+class Completion:
+    texts: list
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    latency: float = 0.0
+    finish_reasons: list = field(default_factory=list)
+
+
+def build_messages(filled_prompt):
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": filled_prompt},
+    ]
+
+
+class OpenAIBackend:
+    def __init__(self, client, model):
+        self.client = client
+        self.name = model
+        self.model = model
+
+    def complete(self, entry, filled_prompt, n=1, max_tokens=MAX_TOKENS):
+        start = time.perf_counter()
+        response = self.client.chat.completions.create(
+            model=self.model,
+            messages=build_messages(filled_prompt),
+            temperature=TEMPERATURE,
+            max_tokens=max_tokens,
+            n=n,
+        )
+        usage = response.usage
+        return Completion(
+            texts=[c.message.content or "" for c in response.choices],
+            prompt_tokens=usage.prompt_tokens if usage else 0,
+            completion_tokens=usage.completion_tokens if usage else 0,
+            latency=time.perf_counter() - start,
+            finish_reasons=[c.finish_reason for c in response.choices],
+        )
+
+
+def local_prompt(entry):
+    # Same "flavor=a,b | texture=c | type=d" header finetune_model.py uses
+    parts = []
+    if entry.get("flavor"):
+        parts.append("flavor=" + ",".join(entry["flavor"]).lower())
+    if entry.get("texture"):
+        parts.append("texture=" + ",".join(entry["texture"]).lower())
+    if entry.get("type"):
+        parts.append("type=" + entry["type"].lower())
+    return " | ".join(parts) + "\n"
+
+
+def local_to_markdown(text):
+    """
+    The fine-tuned model writes a bare title, ingredient lines and step
+    lines. Rebuild the markdown layout the parser and scoring expect:
+    lines after the title count as ingredients while they look like one
+    (a leading quantity, or only a few words), the rest are steps.
+    """
+    lines = [line.strip() for line in text.strip().splitlines()]
+    lines = [line for line in lines if line]
+    if not lines:
+        return ""
+
+    title, rest = lines[0], lines[1:]
+    split = 0
+    for line in rest:
+        if parse_ingredient(line).quantity is None and len(line.split()) > 4:
+            break
+        split += 1
+
+    ingredients = "\n".join(f"- {line}" for line in rest[:split])
+    steps = "\n".join(
+        f"{i}. {line}" for i, line in enumerate(rest[split:], start=1)
+    )
+    return (
+        f"**Title:** {title}\n\n"
+        f"**Ingredients:**\n{ingredients}\n\n"
+        f"**Instructions:**\n{steps}\n"
+    )
+
+
+class LocalBackend:
+    """
+    Generates with the fine-tuned checkpoint from finetune_model.py.
+    num_return_sequences stands in for the OpenAI `n` parameter.
+    """
+
+    def __init__(self, path):
+        # Imported lazily so OpenAI-only runs don't load torch
+        import torch
+        from transformers import AutoModelForCausalLM, AutoTokenizer
+
+        path = Path(path)
+        if not path.is_absolute():
+            path = ROOT_DIR / path
+        self.name = f"{LOCAL_PREFIX}{path.name}"
+        self.torch = torch
+        self.tokenizer = AutoTokenizer.from_pretrained(path)
+        self.tokenizer.pad_token = self.tokenizer.eos_token
+        self.model = AutoModelForCausalLM.from_pretrained(path)
+        self.model.eval()
+
+    def complete(self, entry, filled_prompt, n=1, max_tokens=MAX_TOKENS):
+        start = time.perf_counter()
+        inputs = self.tokenizer(local_prompt(entry), return_tensors="pt")
+        prompt_length = inputs["input_ids"].shape[1]
+        with self.torch.no_grad():
+            outputs = self.model.generate(
+                **inputs,
+                do_sample=True,
+                temperature=TEMPERATURE,
+                max_new_tokens=max_tokens,
+                num_return_sequences=n,
+                pad_token_id=self.tokenizer.eos_token_id,
+            )
+
+        texts, completion_tokens, finish_reasons = [], 0, []
+        for output in outputs:
+            generated = output[prompt_length:]
+            length = int((generated != self.tokenizer.eos_token_id).sum())
+            completion_tokens += length
+            finish_reasons.append("length" if length >= max_tokens else "stop")
+            texts.append(
+                local_to_markdown(
+                    self.tokenizer.decode(generated, skip_special_tokens=True)
+                )
+            )
+
+        return Completion(
+            texts=texts,
+            prompt_tokens=prompt_length,
+            completion_tokens=completion_tokens,
+            latency=time.perf_counter() - start,
+            finish_reasons=finish_reasons,
+        )
+
+
+def make_backend(spec, client=None):
+    # "local:<path>" loads a checkpoint, anything else is an OpenAI model
+    if spec.startswith(LOCAL_PREFIX):
+        return LocalBackend(spec.removeprefix(LOCAL_PREFIX))
+    return OpenAIBackend(client, spec)
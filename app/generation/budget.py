@@ -0,0 +1,157 @@
+import json
+import math
+import threading
+from collections import defaultdict, deque
+import tiktoken
+from config import (
+    DEFAULT_MODEL,
+    MAX_TOKENS,
+    BUDGET_PERCENTILE,
+    BUDGET_MARGIN,
+    BUDGET_MIN_SAMPLES,
+    BUDGET_FLOOR,
+    BUDGET_HISTORY,
+    CONTEXT_WINDOW,
+    TOKEN_USAGE_FILE,
+)
+from app.utils.writer import WRITER, lock_for
+
+# Chat formatting overhead, as in OpenAI's token counting guide
+TOKENS_PER_MESSAGE = 3
+TOKENS_PER_REPLY = 3
+
+
+def served_bucket(total_served):
+    try:
+        served = int(total_served)
+    except (TypeError, ValueError):
+        return "?"
+    if served <= 2:
+        return "1-2"
+    if served <= 4:
+        return "3-4"
+    if served <= 6:
+        return "5-6"
+    return "7+"
+
+
+def profile_key(entry):
+    # The ABED fields that drive how long a recipe comes out
+    return "|".join(
+        [
+            str(entry.get("type") or "?").lower(),
+            str(entry.get("technique_level") or "?").lower(),
+            served_bucket(entry.get("total_served")),
+            str(entry.get("prep_time") or "?").lower(),
+        ]
+    )
+
+
+def percentile(values, pct):
+    # Nearest-rank percentile
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+class TokenBudget:
+    """
+    Sizes max_tokens per request from the completion lengths previously
+    seen for the same ABED profile (type, technique level, servings and
+    prep time): the BUDGET_PERCENTILE length plus BUDGET_MARGIN, never
+    below BUDGET_FLOOR or above MAX_TOKENS. Profiles with fewer than
+    BUDGET_MIN_SAMPLES completions fall back to all profiles, then to
+    MAX_TOKENS.
+
+    Truncated completions only tell us the recipe needed *at least* the
+    budget, so they are remembered as MAX_TOKENS to keep the estimate
+    from creeping down.
+    """
+
+    def __init__(self, model=DEFAULT_MODEL, path=TOKEN_USAGE_FILE):
+        self.model = model
+        self.path = path
+        try:
+            self.encoding = tiktoken.encoding_for_model(model)
+        except KeyError:
+            self.encoding = tiktoken.get_encoding("cl100k_base")
+
+        self.lengths = defaultdict(lambda: deque(maxlen=BUDGET_HISTORY))
+        self.all_lengths = deque(maxlen=BUDGET_HISTORY)
+        self.requests = 0
+        self.truncated = 0
+        self.lock = threading.Lock()  # shared by sweep.py's workers
+        self._load()
+
+    def _load(self):
+        if not self.path.exists():
+            return
+        with lock_for(self.path), open(self.path) as f:
+            for line in f:
+                if line.strip():
+                    self._remember(json.loads(line))
+
+    def _remember(self, record):
+        length = record["completion_tokens"]
+        if record.get("finish_reason") == "length":
+            length = MAX_TOKENS
+        self.lengths[record["profile"]].append(length)
+        self.all_lengths.append(length)
+
+    def count_prompt_tokens(self, messages):
+        total = TOKENS_PER_REPLY
+        for message in messages:
+            total += TOKENS_PER_MESSAGE
+            for value in message.values():
+                total += len(self.encoding.encode(value))
+        return total
+
+    def max_tokens(self, entry, messages):
+        with self.lock:
+            samples = list(self.lengths.get(profile_key(entry), ()))
+            if len(samples) < BUDGET_MIN_SAMPLES:
+                samples = list(self.all_lengths)
+
+        budget = MAX_TOKENS
+        if len(samples) >= BUDGET_MIN_SAMPLES:
+            estimate = percentile(samples, BUDGET_PERCENTILE)
+            budget = math.ceil(estimate * (1 + BUDGET_MARGIN))
+            budget = min(MAX_TOKENS, max(BUDGET_FLOOR, budget))
+
+        # Never ask for more than the context window has room for
+        room = CONTEXT_WINDOW - self.count_prompt_tokens(messages)
+        return max(1, min(budget, room))
+
+    def record(self, entry, usage, max_tokens):
+        """
+        Remember how long a completion was. `usage` holds the
+        completion_tokens, prompt_tokens and finish_reasons of a request
+        that produced `len(finish_reasons)` choices.
+        """
+        reasons = usage.get("finish_reasons") or ["stop"]
+        per_choice = usage.get("completion_tokens", 0) // len(reasons)
+        for reason in reasons:
+            record = {
+                "profile": profile_key(entry),
+                "model": self.model,
+                "prompt_tokens": usage.get("prompt_tokens", 0),
+                "completion_tokens": per_choice,
+                "max_tokens": max_tokens,
+                "finish_reason": reason,
+            }
+            with self.lock:
+                self._remember(record)
+                self.requests += 1
+                self.truncated += reason == "length"
+            WRITER.append(self.path, json.dumps(record) + "\n")
+
+    def truncation_rate(self):
+        return self.truncated / self.requests if self.requests else 0.0
+
+    def report(self):
+        if not self.requests:
+            return
+        print(
+            f"🎟️  Token budget: {self.truncated}/{self.requests} "
+            f"completion(s) truncated ({self.truncation_rate():.1%})"
+        )
@@ -0,0 +1,99 @@
+import json
+import threading
+from datetime import datetime
+from config import CASCADE_TIERS, CASCADE_THRESHOLD, LOGS_DIR
+from app.generation.backends import make_backend
+from app.utils.writer import WRITER
+
+CASCADE_STATS_FILE = LOGS_DIR / "cascade_stats.jsonl"
+
+
+def new_tier_stats():
+    return {
+        "requests": 0,
+        "escalations": 0,
+        "latency": 0.0,
+        "prompt_tokens": 0,
+        "completion_tokens": 0,
+    }
+
+
+class CascadeRouter:
+    """
+    Try the cheapest model first and only escalate to the next tier when
+    the recipe's RScore falls below `threshold`. The last tier's answer is
+    always kept. Per-tier latency, token spend and escalation rate are
+    collected in `stats` so the cascade can be tuned. One router can be
+    shared by worker threads.
+    """
+
+    def __init__(self, client, tiers=CASCADE_TIERS, threshold=None):
+        self.threshold = CASCADE_THRESHOLD if threshold is None else threshold
+        self.backends = [make_backend(spec, client) for spec in tiers]
+        self.stats = {b.name: new_tier_stats() for b in self.backends}
+        self.lock = threading.Lock()
+
+    def generate(self, entry, filled_prompt):
+        # Imported lazily: loading scoring loads the embedding model
+        from app.evaluation.scoring import score_recipes
+
+        for i, backend in enumerate(self.backends):
+            completion = backend.complete(entry, filled_prompt)
+            recipe = completion.texts[0]
+
+            stats = self.stats[backend.name]
+            with self.lock:
+                stats["requests"] += 1
+                stats["latency"] += completion.latency
+                stats["prompt_tokens"] += completion.prompt_tokens
+                stats["completion_tokens"] += completion.completion_tokens
+
+            scores = {"RScore": 0.0}
+            if "**Title:**" in recipe:
+                # Only accept/reject matters here, so stop scoring early
+                scores = score_recipes(
+                    [{"input": entry, "recipe": recipe}],
+                    target=self.threshold,
+                )[0]
+
+            last = i == len(self.backends) - 1
+            if scores["RScore"] >= self.threshold or last:
+                return recipe, scores, backend.name
+
+            with self.lock:
+                stats["escalations"] += 1
+            print(
+                f"⤴️  {backend.name} scored {scores['RScore']:.2f} "
+                f"< {self.threshold}, escalating"
+            )
+
+    def summary(self):
+        rows = {}
+        with self.lock:
+            snapshot = {name: dict(s) for name, s in self.stats.items()}
+        for name, stats in snapshot.items():
+            requests = stats["requests"] or 1
+            rows[name] = {
+                **stats,
+                "mean_latency": round(stats["latency"] / requests, 3),
+                "escalation_rate": round(stats["escalations"] / requests, 3),
+            }
+        return rows
+
+    def report(self):
+        print(f"\n🪜 Cascade (escalate below RScore {self.threshold}):")
+        for name, row in self.summary().items():
+            print(
+                f"- {name}: {row['requests']} request(s), "
+                f"{row['mean_latency']:.2f}s avg, "
+                f"{row['prompt_tokens'] + row['completion_tokens']} tokens, "
+                f"{row['escalation_rate']:.0%} escalated"
+            )
+
+    def save(self):
+        record = {
+            "timestamp": datetime.now().isoformat(),
+            "threshold": self.threshold,
+            "tiers": self.summary(),
+        }
+        WRITER.append(CASCADE_STATS_FILE, json.dumps(record) + "\n")
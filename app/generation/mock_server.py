@@ -0,0 +1,308 @@
+import json
+import math
+import random
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# Local stand-in for the OpenAI chat completions endpoint, for load tests
+# that must not spend API money. It replays recorded recipe markdown with
+# a configurable latency distribution, random server errors and 429s from
+# a token-bucket rate limit, and speaks enough of the API (n, max_tokens,
+# stream, stream_options.include_usage) for the openai client and
+# generate.py to run unmodified against it:
+#
+#   client = openai.OpenAI(base_url=server.url, api_key="mock")
+
+SAMPLE_RECIPE = """**Title:** Tangy Crispy Chickpea Bites
+
+**Description:** Crunchy roasted chickpeas tossed in lime and chili.
+
+**Serves:** 2
+
+**Estimated Prep Time:** 35 minutes
+
+**Equipment:**
+- Baking sheet
+- Mixing bowl
+
+**Ingredients:**
+- 1 can chickpeas, drained and patted dry
+- 1 tablespoon olive oil
+- 1 teaspoon chili powder
+- 1/2 teaspoon salt
+- 1 lime, zested and juiced
+
+**Instructions:**
+1. Preheat the oven to 425°F.
+2. Toss the chickpeas with the olive oil, chili powder and salt.
+3. Spread on the baking sheet and bake until golden and crisp, 30 minutes.
+4. Toss with the lime zest and juice while still warm, then serve.
+
+**Tags:**
+flavor=[Tangy]
+texture=[Crispy]
+type=[Snack]
+"""
+
+CHARS_PER_TOKEN = 4
+
+
+def load_recorded_recipes(paths):
+    """
+    Recipe markdown from generated_recipes.json-style lists or JSONL files
+    with a "recipe" field. Falls back to one built-in sample.
+    """
+    recipes = []
+    for path in paths:
+        path = Path(path)
+        if not path.exists():
+            continue
+        with open(path) as f:
+            if path.suffix == ".jsonl":
+                records = [json.loads(line) for line in f if line.strip()]
+            else:
+                records = json.load(f)
+        recipes += [
+            r["recipe"]
+            for r in records
+            if isinstance(r.get("recipe"), str) and "**Title:**" in r["recipe"]
+        ]
+    return recipes or [SAMPLE_RECIPE]
+
+
+def parse_latency(spec):
+    """
+    A latency sampler from "fixed:1.5", "uniform:0.5,3" or
+    "lognormal:2,0.5" (median seconds, sigma).
+    """
+    kind, _, args = spec.partition(":")
+    values = [float(v) for v in args.split(",") if v]
+    if kind == "fixed":
+        return lambda rng: values[0]
+    if kind == "uniform":
+        return lambda rng: rng.uniform(values[0], values[1])
+    if kind == "lognormal":
+        mu = math.log(values[0])
+        return lambda rng: rng.lognormvariate(mu, values[1])
+    raise ValueError(f"Unknown latency distribution '{spec}'")
+
+
+class TokenBucket:
+    # Allows `rate` requests per second with bursts up to `capacity`
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def take(self):
+        """Returns 0 if a request may proceed, else seconds to wait."""
+        with self.lock:
+            now = time.monotonic()
+            elapsed = now - self.updated
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0.0
+            return (1 - self.tokens) / self.rate
+
+
+class MockCompletionServer(ThreadingHTTPServer):
+    """
+    Threaded HTTP server replaying `recipes`. `latency` samples the time
+    before the first token; tokens are then generated at
+    `tokens_per_second`, streamed as they come or sent all at once
+    otherwise. `error_rate` of requests fail with a 500 and requests
+    beyond `rpm` per minute get a 429 with Retry-After.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        recipes,
+        host="127.0.0.1",
+        port=0,
+        latency="lognormal:1.5,0.4",
+        tokens_per_second=80,
+        error_rate=0.0,
+        rpm=None,
+        seed=None,
+    ):
+        super().__init__((host, port), CompletionHandler)
+        self.recipes = recipes
+        self.latency = parse_latency(latency)
+        self.tokens_per_second = tokens_per_second
+        self.error_rate = error_rate
+        self.bucket = TokenBucket(rpm / 60) if rpm else None
+        self.rng = random.Random(seed)
+        self.rng_lock = threading.Lock()
+        self.counts = {"ok": 0, "error": 0, "rate_limited": 0}
+        self.counts_lock = threading.Lock()
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def count(self, outcome):
+        with self.counts_lock:
+            self.counts[outcome] += 1
+
+    def draw(self):
+        # One request's random choices, under a lock so a seed reproduces
+        with self.rng_lock:
+            return (
+                self.rng.random() < self.error_rate,
+                self.latency(self.rng),
+                self.rng.choice(self.recipes),
+            )
+
+    def start(self):
+        thread = threading.Thread(target=self.serve_forever, daemon=True)
+        thread.start()
+        return self
+
+
+def completion_text(recipe, max_tokens):
+    # Truncate like the real API does when max_tokens runs out
+    tokens = max(1, len(recipe) // CHARS_PER_TOKEN)
+    if max_tokens and tokens > max_tokens:
+        return recipe[: max_tokens * CHARS_PER_TOKEN], max_tokens, "length"
+    return recipe, tokens, "stop"
+
+
+class CompletionHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_json(self, status, body, headers=None):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def send_error_json(self, status, message, kind, headers=None):
+        error = {"message": message, "type": kind, "code": None}
+        self.send_json(status, {"error": error}, headers)
+
+    def do_POST(self):
+        server = self.server
+        length = int(self.headers.get("Content-Length", 0))
+        request = json.loads(self.rfile.read(length) or b"{}")
+        if not self.path.endswith("/chat/completions"):
+            self.send_error_json(404, "Not found", "invalid_request_error")
+            return
+
+        if server.bucket:
+            wait = server.bucket.take()
+            if wait:
+                server.count("rate_limited")
+                self.send_error_json(
+                    429,
+                    "Rate limit reached for requests",
+                    "requests",
+                    {"Retry-After": f"{wait:.2f}"},
+                )
+                return
+
+        failed, latency, _ = server.draw()
+        time.sleep(latency)
+        if failed:
+            server.count("error")
+            self.send_error_json(500, "Simulated server error", "server_error")
+            return
+
+        n = request.get("n", 1)
+        choices = [
+            completion_text(server.draw()[2], request.get("max_tokens"))
+            for _ in range(n)
+        ]
+        prompt_tokens = sum(
+            len(m.get("content", "")) // CHARS_PER_TOKEN
+            for m in request.get("messages", [])
+        )
+        usage = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": sum(tokens for _, tokens, _ in choices),
+            "total_tokens": prompt_tokens
+            + sum(tokens for _, tokens, _ in choices),
+        }
+        meta = {
+            "id": f"chatcmpl-{uuid.uuid4().hex[:24]}",
+            "created": int(time.time()),
+            "model": request.get("model", "mock"),
+        }
+
+        if request.get("stream"):
+            include_usage = (request.get("stream_options") or {}).get(
+                "include_usage"
+            )
+            self.stream(meta, choices[0], usage if include_usage else None)
+        else:
+            # The whole completion is generated before anything is sent
+            time.sleep(usage["completion_tokens"] / server.tokens_per_second)
+            self.send_json(
+                200,
+                {
+                    **meta,
+                    "object": "chat.completion",
+                    "choices": [
+                        {
+                            "index": i,
+                            "message": {"role": "assistant", "content": text},
+                            "finish_reason": reason,
+                        }
+                        for i, (text, _, reason) in enumerate(choices)
+                    ],
+                    "usage": usage,
+                },
+            )
+        server.count("ok")
+
+    def stream(self, meta, choice, usage):
+        text, tokens, reason = choice
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+
+        def event(choices, **extra):
+            chunk = {
+                **meta,
+                "object": "chat.completion.chunk",
+                "choices": choices,
+                **extra,
+            }
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+            self.wfile.flush()
+
+        # A few tokens per chunk, paced at tokens_per_second
+        step = 4 * CHARS_PER_TOKEN
+        delay = 4 / self.server.tokens_per_second
+        try:
+            for start in range(0, len(text), step):
+                stop = start + step
+                delta = {"content": text[start:stop]}
+                event([{"index": 0, "delta": delta, "finish_reason": None}])
+                time.sleep(delay)
+            event([{"index": 0, "delta": {}, "finish_reason": reason}])
+            if usage:
+                event([], usage={**usage, "completion_tokens": tokens})
+            self.wfile.write(b"data: [DONE]\n\n")
+            self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            # The client cancelled the stream (e.g. an early abort)
+            pass
@@ -0,0 +1,220 @@
+import heapq
+import json
+from array import array
+from pathlib import Path
+import numpy as np
+from tqdm import tqdm
+from config import RECIPE_INDEX_DIR
+from app.evaluation.keywords import (
+    FLAVOR_KEYWORDS,
+    TEXTURE_KEYWORDS,
+    TYPE_KEYWORDS,
+    match_keywords,
+)
+from app.training.prepare_data import infer_type
+
+# On-disk inverted index from ABED terms ("flavor:tangy", "texture:crispy",
+# "type:snack") to the corpus recipes that show them:
+#
+#   terms.json     term -> [byte offset, byte length, document frequency]
+#   postings.bin   sorted recipe ids per term, delta + varint encoded
+#   docs.npy       byte offset of each recipe's line in the corpus JSONL
+#   meta.json      corpus path and recipe count
+#
+# Posting lists are decoded with numpy and intersected smallest first, so
+# queries touch only the terms they name.
+
+DIMENSIONS = {
+    "flavor": FLAVOR_KEYWORDS,
+    "texture": TEXTURE_KEYWORDS,
+}
+
+
+def recipe_terms(item):
+    """ABED terms a corpus record (abed_recipes.jsonl format) matches"""
+    output = item.get("output", {})
+    title = output.get("title", "").lower()
+    text = " ".join(
+        [title, *output.get("ingredients", []), *output.get("steps", [])]
+    ).lower()
+
+    terms = set()
+    for dimension, keywords in DIMENSIONS.items():
+        for value, words in keywords.items():
+            if match_keywords(words, text):
+                terms.add(f"{dimension}:{value}")
+    for value, words in TYPE_KEYWORDS.items():
+        if match_keywords(words, title):
+            terms.add(f"type:{value}")
+    # prepare_data.py guesses a type from the title and falls back to
+    # "dinner", so only a type that differs from its guess was set on
+    # purpose; the title keywords above cover the rest
+    explicit = (item.get("input", {}).get("type") or "").lower()
+    if explicit and explicit != infer_type(title):
+        terms.add(f"type:{explicit}")
+    return terms
+
+
+def query_terms(abed):
+    # ABED set (or a list of "dimension:value" strings) -> index terms
+    if isinstance(abed, (list, tuple, set)):
+        return sorted({term.lower() for term in abed})
+    terms = set()
+    for dimension in DIMENSIONS:
+        for value in abed.get(dimension) or []:
+            terms.add(f"{dimension}:{value.lower()}")
+    if abed.get("type"):
+        terms.add(f"type:{abed['type'].lower()}")
+    return sorted(terms)
+
+
+def encode_varints(values):
+    # LEB128: 7 bits per byte, high bit set on all but the last byte
+    out = bytearray()
+    for value in values:
+        while value >= 0x80:
+            out.append((value & 0x7F) | 0x80)
+            value >>= 7
+        out.append(value)
+    return bytes(out)
+
+
+def decode_varints(data):
+    raw = np.frombuffer(data, dtype=np.uint8)
+    if not len(raw):
+        return np.empty(0, dtype=np.int64)
+    ends = np.flatnonzero(raw < 0x80)
+    if len(ends) == len(raw):
+        # Dense posting lists are mostly one-byte gaps
+        return raw.astype(np.int64)
+    starts = np.concatenate([[0], ends[:-1] + 1])
+    # Position of each byte within its value, for the shift
+    position = np.arange(len(raw)) - np.repeat(starts, ends - starts + 1)
+    parts = (raw & 0x7F).astype(np.int64) << (7 * position)
+    return np.add.reduceat(parts, starts)
+
+
+def encode_postings(ids):
+    deltas = np.diff(np.asarray(ids, dtype=np.int64), prepend=0)
+    return encode_varints(deltas.tolist())
+
+
+def decode_postings(data):
+    return np.cumsum(decode_varints(data))
+
+
+def build_index(source, index_dir=RECIPE_INDEX_DIR):
+    """
+    Stream the corpus JSONL once, recording each recipe's byte offset and
+    the ABED terms it matches, then write compressed posting lists.
+    Returns the number of recipes indexed.
+    """
+    index_dir = Path(index_dir)
+    index_dir.mkdir(parents=True, exist_ok=True)
+
+    postings = {}
+    offsets = array("q")
+    with open(source, "rb") as f:
+        offset = 0
+        for line in tqdm(f, desc="Indexing", unit=" recipes"):
+            start, offset = offset, offset + len(line)
+            if not line.strip():
+                continue
+            doc = len(offsets)
+            offsets.append(start)
+            for term in recipe_terms(json.loads(line)):
+                postings.setdefault(term, array("I")).append(doc)
+
+    terms = {}
+    with open(index_dir / "postings.bin", "wb") as out:
+        position = 0
+        for term in sorted(postings):
+            blob = encode_postings(postings[term])
+            out.write(blob)
+            terms[term] = [position, len(blob), len(postings[term])]
+            position += len(blob)
+
+    np.save(index_dir / "docs.npy", np.frombuffer(offsets, dtype=np.int64))
+    with open(index_dir / "terms.json", "w") as f:
+        json.dump(terms, f, indent=2)
+    with open(index_dir / "meta.json", "w") as f:
+        json.dump({"source": str(source), "count": len(offsets)}, f)
+    return len(offsets)
+
+
+class RecipeIndex:
+    """
+    Read side of the index. Posting lists are read on demand from a
+    memory-mapped postings.bin, and recipes are fetched by seeking to
+    their line in the corpus.
+    """
+
+    def __init__(self, index_dir=RECIPE_INDEX_DIR):
+        index_dir = Path(index_dir)
+        with open(index_dir / "meta.json") as f:
+            meta = json.load(f)
+        with open(index_dir / "terms.json") as f:
+            self.terms = json.load(f)
+        self.source = Path(meta["source"])
+        self.count = meta["count"]
+        self.offsets = np.load(index_dir / "docs.npy", mmap_mode="r")
+        postings_path = index_dir / "postings.bin"
+        self.postings = (
+            np.memmap(postings_path, dtype=np.uint8, mode="r")
+            if postings_path.stat().st_size
+            else np.empty(0, dtype=np.uint8)
+        )
+
+    def posting(self, term):
+        if term not in self.terms:
+            return np.empty(0, dtype=np.int64)
+        start, length, _ = self.terms[term]
+        end = start + length
+        return decode_postings(self.postings[start:end].tobytes())
+
+    def doc_freq(self, term):
+        return self.terms.get(term, [0, 0, 0])[2]
+
+    def conjunctive(self, abed):
+        """Ids of recipes matching every term of the query"""
+        terms = query_terms(abed)
+        if not terms:
+            return np.empty(0, dtype=np.int64)
+        terms.sort(key=self.doc_freq)
+        result = self.posting(terms[0])
+        for term in terms[1:]:
+            if not len(result):
+                break
+            result = np.intersect1d(result, self.posting(term), True)
+        return result
+
+    def ranked(self, abed, k=10):
+        """
+        Top `k` (id, score) pairs by summed IDF of the query terms each
+        recipe matches, so full matches come first and rare terms count
+        for more among partial ones.
+        """
+        # Only recipes on some posting list can score, so accumulate those
+        # rather than a dense array over the whole corpus
+        scores = {}
+        for term in query_terms(abed):
+            posting = self.posting(term)
+            if not len(posting):
+                continue
+            weight = float(np.log((self.count + 1) / (len(posting) + 0.5)))
+            for doc in posting.tolist():
+                scores[doc] = scores.get(doc, 0.0) + weight
+
+        top = heapq.nsmallest(
+            k, scores.items(), key=lambda item: (-item[1], item[0])
+        )
+        return [(doc, score) for doc, score in top if score > 0]
+
+    def fetch(self, doc):
+        with open(self.source, "rb") as f:
+            f.seek(int(self.offsets[doc]))
+            return json.loads(f.readline())
+
+    def examples(self, abed, k=2):
+        """Up to `k` corpus recipes closest to an ABED set"""
+        return [self.fetch(doc) for doc, _ in self.ranked(abed, k)]
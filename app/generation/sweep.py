@@ -0,0 +1,191 @@
+import hashlib
+import json
+import random
+from itertools import combinations, islice, product
+
+# Expands a sweep spec into ABED sets for headless bulk generation.
+#
+# A spec (YAML or JSON) names a mode and how each vocab dimension varies:
+#
+#   mode: covering        # product | random | covering
+#   count: 500            # random mode only
+#   seed: 7
+#   dimensions:
+#     type: "*"           # every option
+#     total_served: ["2", "4"]
+#     flavor: {choose: [1, 2]}                        # all 1- and 2-subsets
+#     texture: {choose: 1, options: [Crispy, Soft]}
+#     mood: Comforting    # fixed value
+#
+# Dimensions left out are omitted from the ABED set (multi-select ones
+# become empty lists). Everything is generated lazily.
+
+
+def as_list(value):
+    return value if isinstance(value, list) else [value]
+
+
+def dimension_levels(item, spec):
+    """
+    Yield every value one vocab dimension can take under its spec.
+    Multi-select dimensions yield lists, single-select ones yield strings.
+    """
+    multi = item["multi"]
+    if spec == "*":
+        spec = {"choose": 1} if multi else item["options"]
+
+    if isinstance(spec, dict):
+        pool = spec.get("options", item["options"])
+        if not multi:
+            yield from pool
+            return
+        for size in as_list(spec.get("choose", 1)):
+            for combo in combinations(pool, size):
+                yield list(combo)
+        return
+
+    for value in as_list(spec):
+        if multi:
+            yield sorted(as_list(value))
+        else:
+            yield value
+
+
+def sample_level(item, spec, rng):
+    # One random value for a dimension without materializing its levels
+    multi = item["multi"]
+    if spec == "*":
+        spec = {"choose": 1} if multi else item["options"]
+
+    if isinstance(spec, dict):
+        pool = spec.get("options", item["options"])
+        if not multi:
+            return rng.choice(pool)
+        size = rng.choice(as_list(spec.get("choose", 1)))
+        return sorted(rng.sample(pool, size))
+
+    value = rng.choice(as_list(spec))
+    return sorted(as_list(value)) if multi else value
+
+
+def abed_key(abed_set):
+    # Order- and case-insensitive fingerprint, so equivalent sets collide
+    canonical = {
+        name: (
+            sorted(v.lower() for v in value)
+            if isinstance(value, list)
+            else str(value).lower()
+        )
+        for name, value in abed_set.items()
+    }
+    blob = json.dumps(canonical, sort_keys=True).encode()
+    return hashlib.blake2b(blob, digest_size=8).digest()
+
+
+def build_set(names, values, vocab):
+    abed_set = dict(zip(names, values))
+    for item in vocab:
+        if item["multi"] and item["name"] not in abed_set:
+            abed_set[item["name"]] = []
+    return abed_set
+
+
+def product_sets(dims, vocab, spec):
+    names = [item["name"] for item, _ in dims]
+    levels = [list(dimension_levels(item, s)) for item, s in dims]
+    for values in product(*levels):
+        yield build_set(names, values, vocab)
+
+
+def random_sets(dims, vocab, spec):
+    rng = random.Random(spec.get("seed"))
+    names = [item["name"] for item, _ in dims]
+    count = spec.get("count", 100)
+    # Give up after a while if the space is smaller than `count`
+    for _ in range(count * 20):
+        values = [sample_level(item, s, rng) for item, s in dims]
+        yield build_set(names, values, vocab)
+
+
+def covering_sets(dims, vocab, spec, candidates=50):
+    """
+    Greedy pairwise covering design: every pair of values from any two
+    dimensions appears in at least one set, using far fewer sets than the
+    full product. Each new set is the best of `candidates` random rows
+    seeded with a still-uncovered pair.
+    """
+    if len(dims) < 2:
+        yield from product_sets(dims, vocab, spec)
+        return
+
+    rng = random.Random(spec.get("seed"))
+    names = [item["name"] for item, _ in dims]
+    levels = [list(dimension_levels(item, s)) for item, s in dims]
+    pairs = [
+        (i, j) for i in range(len(levels)) for j in range(i + 1, len(levels))
+    ]
+    uncovered = {
+        (i, a, j, b)
+        for i, j in pairs
+        for a in range(len(levels[i]))
+        for b in range(len(levels[j]))
+    }
+
+    while uncovered:
+        i, a, j, b = min(uncovered)
+        best, best_gain = None, -1
+        for _ in range(candidates):
+            row = [rng.randrange(len(level)) for level in levels]
+            row[i], row[j] = a, b
+            gain = sum((x, row[x], y, row[y]) in uncovered for x, y in pairs)
+            if gain > best_gain:
+                best, best_gain = row, gain
+
+        uncovered -= {(x, best[x], y, best[y]) for x, y in pairs}
+        values = [levels[k][index] for k, index in enumerate(best)]
+        yield build_set(names, values, vocab)
+
+
+MODES = {
+    "product": product_sets,
+    "random": random_sets,
+    "covering": covering_sets,
+}
+
+
+def expand_spec(spec, vocab, seen=None):
+    """
+    Lazily yield the unique ABED sets described by `spec`. `seen` holds
+    abed_key fingerprints to skip, e.g. sets a previous run already
+    generated; it is updated in place.
+    """
+    mode = spec.get("mode", "product")
+    if mode not in MODES:
+        raise ValueError(
+            f"Unknown sweep mode '{mode}', expected one of {list(MODES)}"
+        )
+
+    by_name = {item["name"]: item for item in vocab}
+    unknown = set(spec.get("dimensions", {})) - set(by_name)
+    if unknown:
+        raise ValueError(f"Unknown ABED dimensions: {sorted(unknown)}")
+
+    dims = [
+        (by_name[name], dim_spec)
+        for name, dim_spec in spec.get("dimensions", {}).items()
+    ]
+    seen = set() if seen is None else seen
+
+    sets = _unique(MODES[mode](dims, vocab, spec), seen)
+    if mode == "random":
+        sets = islice(sets, spec.get("count", 100))
+    return sets
+
+
+def _unique(sets, seen):
+    for abed_set in sets:
+        key = abed_key(abed_set)
+        if key in seen:
+            continue
+        seen.add(key)
+        yield abed_set
@@ -0,0 +1,177 @@
+import argparse
+import csv
+import json
+import re
+import sys
+import time
+from itertools import islice
+from pathlib import Path
+from config import (
+    EMBEDDING_COSINE_TOLERANCE,
+    EMBEDDING_THREADS,
+    GENERATIONS_LOG_FILE,
+)
+from app.utils.ingredients import (
+    STOPWORDS,
+    extract_ingredient_name,
+    parse_ingredient,
+)
+
+TRAINING_DATA = Path("app/training/data/abed_recipes.jsonl")
+
+SAMPLE_INGREDIENTS = [
+    "1 tablespoon olive oil",
+    "Salt, to taste",
+    "1/2 cup sugar",
+    "½ tsp ground nutmeg",
+    "2 cloves garlic, minced",
+    "1 can (15 oz) pumpkin puree",
+    "1 1/2 cups all-purpose flour",
+    "3 eggs, beaten",
+    "1 lb pork tenderloin, sliced into thin strips",
+    "Freshly ground black pepper",
+]
+
+
+def legacy_extract_ingredient_name(line):
+    # The uncached normalizer scoring.py used before app.utils.ingredients
+    line = re.sub(r"[^a-zA-Z\s]", "", line.lower().strip("- "))
+    return " ".join(
+        word
+        for word in line.split()
+        if word not in STOPWORDS and not word.isnumeric()
+    )
+
+
+def load_ingredient_lines(limit):
+    # Real corpus lines when prepare_data.py has run, samples otherwise
+    if TRAINING_DATA.exists():
+        with open(TRAINING_DATA) as f:
+            lines = (
+                ing
+                for row in f
+                for ing in json.loads(row)["output"]["ingredients"]
+            )
+            return list(islice(lines, limit))
+    return [
+        SAMPLE_INGREDIENTS[i % len(SAMPLE_INGREDIENTS)] for i in range(limit)
+    ]
+
+
+def time_per_line(fn, lines):
+    start = time.perf_counter()
+    for line in lines:
+        fn(line)
+    elapsed = time.perf_counter() - start
+    return len(lines) / elapsed if elapsed else float("inf")
+
+
+def bench_normalizer(args):
+    lines = load_ingredient_lines(args.lines)
+    print(f"🧪 Normalizing {len(lines)} ingredient lines")
+
+    parse_ingredient.cache_clear()
+    results = {
+        "legacy": time_per_line(legacy_extract_ingredient_name, lines),
+        "cold cache": time_per_line(extract_ingredient_name, lines),
+        "warm cache": time_per_line(extract_ingredient_name, lines),
+    }
+    for label, rate in results.items():
+        print(f"- {label:<11} {rate:>12,.0f} lines/sec")
+
+    info = parse_ingredient.cache_info()
+    print(f"📦 Cache: {info.currsize} unique lines, {info.hits} hits")
+
+
+def load_embedding_texts(limit):
+    # Past generations when there are any, sample recipes otherwise
+    texts = []
+    if GENERATIONS_LOG_FILE.exists():
+        with open(GENERATIONS_LOG_FILE) as f:
+            texts = [
+                f"{row['title']}. Ingredients: {row['ingredients']}"
+                for row in islice(csv.DictReader(f), limit)
+            ]
+    while len(texts) < limit:
+        i = len(texts)
+        picks = SAMPLE_INGREDIENTS[: i % 7 + 3]
+        names = ", ".join(extract_ingredient_name(p) for p in picks)
+        texts.append(f"recipe {i}. Ingredients: {names}")
+    return texts
+
+
+def time_encode(model, texts, batch_size):
+    model.encode(texts[:batch_size], batch_size=batch_size)  # warm up
+    start = time.perf_counter()
+    vectors = model.encode(
+        texts,
+        batch_size=batch_size,
+        convert_to_tensor=True,
+        normalize_embeddings=True,
+    )
+    return vectors, len(texts) / (time.perf_counter() - start)
+
+
+def bench_embeddings(args):
+    # Imported here so the normalizer benchmark doesn't need torch
+    from app.evaluation.embeddings import load_embedding_model
+
+    texts = load_embedding_texts(args.texts)
+    print(
+        f"🧪 Embedding {len(texts)} texts, {args.threads or 'default'} threads"
+    )
+
+    reference, rate = time_encode(
+        load_embedding_model("torch", args.threads), texts, args.batch_size
+    )
+    print(f"- {'torch':<10} {rate:>8,.0f} texts/sec (reference)")
+
+    failed = False
+    for backend in args.backends:
+        model = load_embedding_model(backend, args.threads)
+        vectors, rate = time_encode(model, texts, args.batch_size)
+        cosine = (reference.cpu() * vectors.cpu()).sum(dim=1)
+        ok = cosine.min().item() >= args.tolerance
+        failed |= not ok
+        print(
+            f"- {backend:<10} {rate:>8,.0f} texts/sec, cosine to torch "
+            f"min {cosine.min().item():.4f} mean {cosine.mean().item():.4f} "
+            f"{'✅' if ok else '❌'}"
+        )
+
+    if failed:
+        print(f"❌ Cosine below tolerance {args.tolerance}")
+        sys.exit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Chez Abed benchmarks")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    normalizer = commands.add_parser(
+        "normalizer", help="Ingredient normalizer throughput"
+    )
+    normalizer.add_argument("--lines", type=int, default=200_000)
+    normalizer.set_defaults(run=bench_normalizer)
+
+    embeddings = commands.add_parser(
+        "embeddings",
+        help="Embedding backend throughput and agreement with torch",
+    )
+    embeddings.add_argument(
+        "--backends", nargs="+", default=["onnx", "onnx-int8"]
+    )
+    embeddings.add_argument("--texts", type=int, default=2_000)
+    embeddings.add_argument("--batch-size", type=int, default=64)
+    embeddings.add_argument("--threads", type=int, default=EMBEDDING_THREADS)
+    embeddings.add_argument(
+        "--tolerance", type=float, default=EMBEDDING_COSINE_TOLERANCE
+    )
+    embeddings.set_defaults(run=bench_embeddings)
+
+    args = parser.parse_args()
+    args.run(args)
+
+
+if __name__ == "__main__":
+    main()
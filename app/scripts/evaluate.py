@@ -1,31 +1,170 @@
+import argparse
 import json
 import yaml
 from config import (
     METRICS_CONFIG_FILE,
     GENERATED_RECIPES_FILE,
     GENERATED_SCORED_RECIPES_FILE,
+    RATING_MODEL_FILE,
 )
-from app.utils.logging import save_recipe_log
-from app.evaluation.scoring import score_recipe
+from app.utils.logging import LogSession
+from app.evaluation.fingerprint import (
+    carried_scores,
+    metric_fingerprints,
+    recipe_fingerprint,
+)
+from app.evaluation.scoring import log_review, metric_versions, score_recipe
 from app.utils.parser import parse_markdown_recipe
+from app.utils.writer import write_atomic
 
 with open(METRICS_CONFIG_FILE) as f:
     METRICS_CONFIG_FILE = yaml.safe_load(f)
 
-with open(GENERATED_RECIPES_FILE, "r") as f:
-    data = json.load(f)
 
-for item in data:
+def new_stats():
+    return {"computed": 0, "reused": 0, "logged": 0, "unchanged": 0}
+
+
+def evaluate_item(item, session, previous=None, stats=None):
+    """
+    Parse, score and log one generated recipe in place, tagging each
+    metric score with its fingerprint.
+
+    With `previous`, the same recipe's record from an earlier run, only
+    metrics whose fingerprint changed are recomputed, and the recipe is
+    logged again only if its scores changed.
+    """
     if "recipe" in item and item["recipe"]:
         parsed = parse_markdown_recipe(item["recipe"])
         item["parsed"] = parsed
-        item["scores"] = score_recipe(
-            item, parsed["steps"], parsed["ingredients"], log_reviews=True
+        fingerprints = metric_fingerprints(item, metric_versions())
+        reuse = carried_scores(fingerprints, previous)
+        scores = score_recipe(
+            item,
+            parsed["steps"],
+            parsed["ingredients"],
+            target=METRICS_CONFIG_FILE["acceptance"]["target_rscore"],
+            record_novelty=previous is None,
+            reuse=reuse,
+            logged=previous is not None,
+        )
+        item["scores"] = scores
+        item["fingerprints"] = {
+            name: fingerprint
+            for name, fingerprint in fingerprints.items()
+            if name in scores
+        }
+
+        changed = previous is None or any(
+            scores.get(name) != previous["scores"].get(name)
+            for name in [*fingerprints, "RScore"]
         )
-        filepath = save_recipe_log(item)
-        print(f"📝 Logged recipe: {filepath}")
+        if stats is not None:
+            stats["reused"] += sum(
+                name in reuse for name in item["fingerprints"]
+            )
+            stats["computed"] += sum(
+                name not in reuse for name in item["fingerprints"]
+            )
+            stats["logged" if changed else "unchanged"] += 1
+        if changed:
+            log_review(item, scores, session)
+            filepath = session.log_recipe(item)
+            print(f"📝 Logged recipe: {filepath}")
     else:
-        item["scores"] = {"RScore": 0.0, "note": "No recipe text available"}
+        item["scores"] = {
+            "RScore": 0.0,
+            "note": "No recipe text available",
+        }
+    return item
+
+
+def predict_ratings(items):
+    """
+    Add the learned rating prediction (fit_ratings.py) to every scored
+    item, in one batch.
+    """
+    if not RATING_MODEL_FILE.exists():
+        return
+    from app.evaluation.predictor import RatingPredictor
+    from app.evaluation.scoring import EMBEDDING_CACHE, recipe_embedding_key
+
+    model = RatingPredictor.load()
+    scored = [item for item in items if item.get("parsed")]
+    embeddings = []
+    for item in scored:
+        parsed = item["parsed"]
+        key = recipe_embedding_key(parsed["title"], parsed["ingredients"])
+        vector = EMBEDDING_CACHE.get(key)
+        embeddings.append(None if vector is None else vector.cpu().numpy())
+    X = model.features([item["scores"] for item in scored], embeddings)
+    for item, rating in zip(scored, model.predict(X)):
+        item["scores"]["predicted_rating"] = round(float(rating), 4)
+
+
+def load_previous():
+    # Last run's scored records, by recipe fingerprint
+    if not GENERATED_SCORED_RECIPES_FILE.exists():
+        return {}
+    with open(GENERATED_SCORED_RECIPES_FILE) as f:
+        return {
+            recipe_fingerprint(item): item
+            for item in json.load(f)
+            if item.get("recipe") and "scores" in item
+        }
+
+
+def report(stats, previous_count):
+    total = stats["computed"] + stats["reused"]
+    print(
+        f"♻️  Recomputed {stats['computed']} of {total} (recipe, metric) "
+        f"score(s), reused {stats['reused']}"
+    )
+    print(
+        f"   Re-logged {stats['logged']} recipe(s), left "
+        f"{stats['unchanged']} of {previous_count} previously scored as is"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Score generated recipes")
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help=(
+            "only recompute scores made stale by a changed recipe, metric "
+            "or config, and only re-log recipes whose scores changed"
+        ),
+    )
+    args = parser.parse_args()
+
+    with open(GENERATED_RECIPES_FILE, "r") as f:
+        data = json.load(f)
+
+    previous = load_previous() if args.incremental else {}
+    stats = new_stats()
+    with LogSession() as session:
+        for item in data:
+            evaluate_item(
+                item,
+                session,
+                previous.get(recipe_fingerprint(item)),
+                stats,
+            )
+
+    predict_ratings(data)
+
+    if args.incremental:
+        report(stats, len(previous))
+        unchanged = len(data) == len(previous) and all(
+            previous.get(recipe_fingerprint(item)) == item for item in data
+        )
+        if unchanged:
+            print(f"✅ {GENERATED_SCORED_RECIPES_FILE} is up to date.")
+            return
+
+    write_atomic(GENERATED_SCORED_RECIPES_FILE, json.dumps(data, indent=2))
+
 
-with open(GENERATED_SCORED_RECIPES_FILE, "w") as f:
-    json.dump(data, f, indent=2)
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+import argparse
+from pathlib import Path
+from config import LOGS_DIR
+from app.utils.logging import BUNDLE_FILENAME, export_bundle
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Render bundled recipe logs to markdown files."
+    )
+    parser.add_argument(
+        "bundles",
+        nargs="*",
+        type=Path,
+        help=f"{BUNDLE_FILENAME} files (default: every bundle under logs/)",
+    )
+    parser.add_argument(
+        "--out",
+        type=Path,
+        help="Directory for the rendered markdown (default: exports/)",
+    )
+    args = parser.parse_args()
+
+    bundles = args.bundles or sorted(LOGS_DIR.glob(f"*/*/*/{BUNDLE_FILENAME}"))
+    if not bundles:
+        print("⚠️  No recipe bundles found.")
+        return
+
+    for bundle in bundles:
+        paths = export_bundle(bundle, args.out)
+        print(f"📝 Rendered {len(paths)} recipe(s) from {bundle}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+import argparse
+import time
+import numpy as np
+from config import RATING_MODEL_FILE
+from app.evaluation.predictor import (
+    RatingPredictor,
+    agreement_report,
+    load_embedding_cache,
+    load_ratings,
+    refit,
+)
+
+
+def print_report(report):
+    if not report:
+        print("⚠️  No held-out ratings yet, rate a few more recipes.")
+        return
+    print(f"\n📊 Agreement with {report['count']} held-out human ratings")
+    print(f"{'':>8} {'MAE':>6} {'Pearson':>8} {'Pairwise':>9}")
+    for name in ["model", "RScore"]:
+        row = report[name]
+        print(
+            f"{name:>8} {row['mae']:>6.3f} {row['pearson']:>8.3f} "
+            f"{row['pairwise']:>9.1%}"
+        )
+
+
+def benchmark(model, rows):
+    # Time one vectorized batch over `rows` synthetic recipes
+    rng = np.random.default_rng(0)
+    X = rng.random((rows, len(model.weights)))
+    start = time.perf_counter()
+    model.predict(X)
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"⏱️  Predicted {rows} recipes in {elapsed:.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Fit the RScore predictor to human ratings"
+    )
+    parser.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="refit from every rating instead of only new ones",
+    )
+    parser.add_argument(
+        "--bench",
+        type=int,
+        metavar="N",
+        help="also time batch inference over N recipes",
+    )
+    args = parser.parse_args()
+
+    ratings = load_ratings()
+    cache = load_embedding_cache()
+
+    model = None
+    if RATING_MODEL_FILE.exists() and not args.rebuild:
+        model = RatingPredictor.load()
+    model, added = refit(model, ratings, cache)
+
+    if not model.n:
+        print("⚠️  No ratings to fit yet, run `python -m app.scripts.review`.")
+        return
+
+    model.save()
+    print(
+        f"✅ Added {added} rating(s), fit on {model.n} in total; "
+        f"saved to {RATING_MODEL_FILE}"
+    )
+    print_report(agreement_report(model, ratings, cache))
+    if args.bench:
+        benchmark(model, args.bench)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,6 @@
 import json
+from concurrent.futures import ThreadPoolExecutor
+from functools import cache
 from dotenv import load_dotenv
 import openai
 from config import (
@@ -8,23 +10,46 @@ from config import (
     DEFAULT_MODEL,
     TEMPERATURE,
     MAX_TOKENS,
+    STREAM,
+    EARLY_ABORT,
+    STREAM_RETRY_BUDGET,
+    BEST_OF_N,
+    CASCADE,
+    TOKEN_BUDGET,
+    FEW_SHOT_EXAMPLES,
 )
+from app.evaluation.constraints import ConstraintChecker, ConstraintViolation
+from app.generation.backends import LOCAL_PREFIX, build_messages, make_backend
+from app.generation.budget import TokenBudget
+from app.generation.cascade import CascadeRouter
+from app.generation.retrieval import RecipeIndex
+from app.utils.parser import RecipeStreamParser
+from app.utils.writer import write_atomic
 
 load_dotenv()
 
-# Load abstraction prompts
-with open(PROMPTS_FILE, "r") as f:
-    abstraction_sets = json.load(f)
 
-# Load base prompt template
-with open(TEMPLATE_PROMPT_FILE, "r") as f:
-    base_prompt = f.read()
+def load_abstraction_sets():
+    with open(PROMPTS_FILE, "r") as f:
+        return json.load(f)
 
-# Collect generations
-generated = []
 
+def load_base_prompt():
+    with open(TEMPLATE_PROMPT_FILE, "r") as f:
+        return f.read()
 
-def build_prompt(template, entry):
+
+def format_example(item):
+    output = item.get("output", {})
+    lines = [f"Title: {output.get('title', 'untitled')}"]
+    lines.append("Ingredients: " + "; ".join(output.get("ingredients", [])))
+    lines += [
+        f"{i}. {step}" for i, step in enumerate(output.get("steps", [])[:5], 1)
+    ]
+    return "\n".join(lines)
+
+
+def build_prompt(template, entry, examples=()):
     parts = []
     if "flavor" in entry and entry["flavor"]:
         parts.append(f"- Flavor: {', '.join(entry['flavor'])}")
@@ -44,41 +69,339 @@ def build_prompt(template, entry):
         parts.append(f"- Prep Time: {entry['prep_time']}")
 
     descriptor_block = "\n".join(parts)
+    if examples:
+        descriptor_block += (
+            "\n\nFor inspiration only (do not copy them), recipes from our "
+            "collection with a similar profile:\n\n"
+            + "\n\n".join(format_example(item) for item in examples)
+        )
     return template.replace("{descriptors}", descriptor_block)
 
 
-for entry in abstraction_sets:
-    filled_prompt = build_prompt(base_prompt, entry)
+def save_usage(usage, response_usage, finish_reasons):
+    # Fill a caller's usage dict with the token counts of a request
+    if usage is None:
+        return
+    usage["prompt_tokens"] = getattr(response_usage, "prompt_tokens", 0)
+    usage["completion_tokens"] = getattr(
+        response_usage, "completion_tokens", 0
+    )
+    usage["finish_reasons"] = finish_reasons
 
-    client = openai.OpenAI()
 
+def request_recipe(client, filled_prompt, max_tokens=MAX_TOKENS, usage=None):
     response = client.chat.completions.create(
         model=DEFAULT_MODEL,
-        messages=[
-            {
-                "role": "system",
-                "content": (
-                    "You are a helpful culinary assistant that turns abstract "
-                    "descriptors into complete recipes."
-                ),
-            },
-            {"role": "user", "content": filled_prompt},
-        ],
+        messages=build_messages(filled_prompt),
         temperature=TEMPERATURE,
-        max_tokens=MAX_TOKENS,
+        max_tokens=max_tokens,
     )
+    save_usage(usage, response.usage, [response.choices[0].finish_reason])
+    return response.choices[0].message.content
 
-    recipe_output = response.choices[0].message.content
 
-    # Optionally, store prompt in case we batch generate later
-    generated.append(
-        {
-            "input": entry,
-            "prompt": filled_prompt,
-            "recipe": recipe_output,  # Will be filled after model response
-        }
+def request_candidates(
+    client, filled_prompt, n, max_tokens=MAX_TOKENS, usage=None
+):
+    # One request, n sampled completions
+    response = client.chat.completions.create(
+        model=DEFAULT_MODEL,
+        messages=build_messages(filled_prompt),
+        temperature=TEMPERATURE,
+        max_tokens=max_tokens,
+        n=n,
+    )
+    save_usage(
+        usage, response.usage, [c.finish_reason for c in response.choices]
     )
+    return [choice.message.content or "" for choice in response.choices]
+
+
+@cache
+def local_backend():
+    # Loaded once per run; DEFAULT_MODEL = "local:<checkpoint path>"
+    return make_backend(DEFAULT_MODEL)
+
+
+def request_local(entry, n, max_tokens=MAX_TOKENS, usage=None):
+    # The fine-tuned model is prompted from the ABED set, not the template
+    completion = local_backend().complete(entry, None, n, max_tokens)
+    save_usage(usage, completion, completion.finish_reasons)
+    return completion.texts
+
+
+def pick_best(entry, candidates):
+    """
+    Score every candidate in one batched pass and return the best recipe
+    with the remaining candidates (and their scores) for later analysis.
+    """
+    # Imported lazily: loading scoring loads the embedding model
+    from app.evaluation.scoring import score_recipes
+
+    usable = [c for c in candidates if "**Title:**" in c]
+    if not usable:
+        return candidates[0] if candidates else "", []
+
+    scores = score_recipes([{"input": entry, "recipe": c} for c in usable])
+    ranked = sorted(
+        zip(usable, scores), key=lambda pair: pair[1]["RScore"], reverse=True
+    )
+    best = ranked[0][0]
+    others = [
+        {"recipe": recipe, "scores": candidate_scores}
+        for recipe, candidate_scores in ranked[1:]
+    ]
+    return best, others
+
+
+def stream_recipe(
+    client,
+    filled_prompt,
+    on_event=None,
+    check=None,
+    max_tokens=MAX_TOKENS,
+    usage=None,
+):
+    """
+    Stream a completion through RecipeStreamParser, calling
+    `on_event(event, parser)` as each title, item and section arrives and
+    `check(parser)` after every chunk. If either raises, the request is
+    cancelled by closing the stream.
+    Returns the full markdown and the parsed recipe.
+    """
+    options = {}
+    if usage is not None:
+        options["stream_options"] = {"include_usage": True}
+    stream = client.chat.completions.create(
+        model=DEFAULT_MODEL,
+        messages=build_messages(filled_prompt),
+        temperature=TEMPERATURE,
+        max_tokens=max_tokens,
+        stream=True,
+        **options,
+    )
+
+    parser = RecipeStreamParser()
+    text = []
+    finish_reason = None
+    try:
+        for chunk in stream:
+            if getattr(chunk, "usage", None):
+                save_usage(usage, chunk.usage, [finish_reason])
+            if not chunk.choices:
+                continue
+            finish_reason = chunk.choices[0].finish_reason or finish_reason
+            delta = chunk.choices[0].delta.content or ""
+            text.append(delta)
+            for event in parser.feed(delta):
+                if on_event:
+                    on_event(event, parser)
+            if check:
+                check(parser)
+
+        for event in parser.close():
+            if on_event:
+                on_event(event, parser)
+        if check:
+            check(parser)
+    finally:
+        stream.close()
+
+    return "".join(text), parser.result
+
+
+def generate_streamed(
+    client,
+    filled_prompt,
+    entry,
+    on_event=None,
+    stats=None,
+    max_tokens=MAX_TOKENS,
+    usage=None,
+):
+    """
+    Stream a recipe, aborting as soon as it breaks a hard constraint and
+    resubmitting up to STREAM_RETRY_BUDGET times. Returns the markdown, or
+    an empty string and the last abort reason if every attempt failed.
+    Besides the parser's events, `on_event` gets ("done", markdown) when
+    an attempt completes and ("abort", reason) when one is cancelled.
+    """
+    reason = None
+    for attempt in range(STREAM_RETRY_BUDGET + 1):
+        check = ConstraintChecker(entry) if EARLY_ABORT else None
+        try:
+            recipe_output, _ = stream_recipe(
+                client, filled_prompt, on_event, check, max_tokens, usage
+            )
+            if on_event:
+                on_event(("done", recipe_output), None)
+            return recipe_output, None
+        except ConstraintViolation as e:
+            reason = str(e)
+            if on_event:
+                on_event(("abort", reason), None)
+            if stats is not None:
+                stats["aborted"] += 1
+                stats["aborted_chars"] += check.chars
+            print(f"✂️  Aborted attempt {attempt + 1}: {reason}")
+
+    return "", reason
+
+
+def prime_scoring(executor):
+    """
+    Event handler that embeds title + ingredients in the background as soon
+    as the ingredient list closes, so evaluate.py finds it in the cache.
+    The embedding is only cached once the attempt completes; one from an
+    aborted attempt is dropped so a retry can't be scored with it.
+    """
+    # Imported lazily: loading scoring loads the embedding model
+    from app.evaluation.scoring import cache_embedding, encode_recipe
+
+    pending = {}
+
+    def commit(job):
+        if not job.cancelled() and job.exception() is None:
+            cache_embedding(*job.result())
+
+    def on_event(event, parser):
+        name, value = event
+        if name == "ingredients":
+            pending["job"] = executor.submit(
+                encode_recipe, parser.result["title"], value
+            )
+        elif name == "abort":
+            job = pending.pop("job", None)
+            if job:
+                job.cancel()
+        elif name == "done":
+            job = pending.pop("job", None)
+            if job:
+                job.add_done_callback(commit)
+
+    return on_event
+
+
+def generate_entry(
+    client,
+    base_prompt,
+    entry,
+    router=None,
+    on_event=None,
+    stats=None,
+    budget=None,
+    index=None,
+):
+    """
+    Generate one recipe for an ABED set using whichever mode is configured
+    (cascade, best-of-N, streamed with early abort, or a plain request).
+    With a TokenBudget (and no cascade), max_tokens is sized for the
+    entry's profile and the completion length is recorded for next time.
+    With a RecipeIndex, the closest corpus recipes are added to the prompt
+    as examples.
+    """
+    examples = index.examples(entry, FEW_SHOT_EXAMPLES) if index else ()
+    filled_prompt = build_prompt(base_prompt, entry, examples)
+    record = {"input": entry, "prompt": filled_prompt}
+
+    max_tokens = MAX_TOKENS
+    # The cascade's tiers are different models with their own limits, so
+    # it isn't budgeted
+    if budget is not None and router is None:
+        messages = build_messages(filled_prompt)
+        max_tokens = budget.max_tokens(entry, messages)
+        record["max_tokens"] = max_tokens
+    usage = {}
+
+    if router is not None:
+        recipe_output, _, tier = router.generate(entry, filled_prompt)
+        record["model"] = tier
+    elif DEFAULT_MODEL.startswith(LOCAL_PREFIX):
+        # Local checkpoints don't stream; best-of-N samples them in one go
+        candidates = request_local(entry, BEST_OF_N, max_tokens, usage)
+        recipe_output = candidates[0]
+        if BEST_OF_N > 1:
+            recipe_output, others = pick_best(entry, candidates)
+            record["candidates"] = others
+    elif BEST_OF_N > 1:
+        candidates = request_candidates(
+            client, filled_prompt, BEST_OF_N, max_tokens, usage
+        )
+        recipe_output, others = pick_best(entry, candidates)
+        record["candidates"] = others
+    elif STREAM:
+        recipe_output, reason = generate_streamed(
+            client, filled_prompt, entry, on_event, stats, max_tokens, usage
+        )
+        if reason:
+            record["abort_reason"] = reason
+    else:
+        recipe_output = request_recipe(
+            client, filled_prompt, max_tokens, usage
+        )
+
+    if budget is not None and usage:
+        budget.record(entry, usage, max_tokens)
+
+    # Optionally, store prompt in case we batch generate later
+    record["recipe"] = recipe_output
+    return record
+
+
+def new_stats():
+    return {"aborted": 0, "aborted_chars": 0}
+
+
+def report(router, stats, budget=None):
+    if budget:
+        budget.report()
+
+    if router:
+        router.report()
+        router.save()
+
+    if stats["aborted"]:
+        print(
+            f"✂️  Aborted {stats['aborted']} completion(s) early after "
+            f"{stats['aborted_chars']} streamed characters in total"
+        )
+
+
+def main():
+    # Load abstraction prompts and base prompt template
+    abstraction_sets = load_abstraction_sets()
+    base_prompt = load_base_prompt()
+
+    client = openai.OpenAI()
+    router = CascadeRouter(client) if CASCADE else None
+    budget = TokenBudget() if TOKEN_BUDGET else None
+    index = RecipeIndex() if FEW_SHOT_EXAMPLES else None
+
+    # Collect generations
+    generated = []
+    stats = new_stats()
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        on_event = prime_scoring(executor) if STREAM else None
+
+        for entry in abstraction_sets:
+            generated.append(
+                generate_entry(
+                    client,
+                    base_prompt,
+                    entry,
+                    router,
+                    on_event,
+                    stats,
+                    budget,
+                    index,
+                )
+            )
+
+    report(router, stats, budget)
+
+    # Save the prompts for review
+    write_atomic(GENERATED_RECIPES_FILE, json.dumps(generated, indent=2))
+
 
-# Save the prompts for review
-with open(GENERATED_RECIPES_FILE, "w") as f:
-    json.dump(generated, f, indent=2)
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+import argparse
+import time
+from pathlib import Path
+from config import RECIPE_CORPUS_FILE, RECIPE_INDEX_DIR
+from app.generation.retrieval import (
+    DIMENSIONS,
+    RecipeIndex,
+    build_index,
+)
+from app.evaluation.keywords import TYPE_KEYWORDS
+
+
+def resolve_term(word):
+    # "tangy" -> "flavor:tangy"; explicit "dimension:value" passes through
+    word = word.strip().lower()
+    if ":" in word:
+        return word
+    for dimension, keywords in DIMENSIONS.items():
+        if word in keywords:
+            return f"{dimension}:{word}"
+    if word in TYPE_KEYWORDS:
+        return f"type:{word}"
+    raise SystemExit(f"❌ Unknown ABED term '{word}'")
+
+
+def build(args):
+    start = time.perf_counter()
+    count = build_index(args.source, args.index)
+    elapsed = time.perf_counter() - start
+    print(f"✅ Indexed {count} recipes in {elapsed:.1f}s into {args.index}")
+
+
+def query(args):
+    index = RecipeIndex(args.index)
+    terms = [resolve_term(word) for word in args.terms]
+
+    start = time.perf_counter()
+    if args.all:
+        docs = index.conjunctive(terms)
+        hits = [(int(doc), None) for doc in docs[: args.k]]
+        total = len(docs)
+    else:
+        hits = index.ranked(terms, args.k)
+        total = len(hits)
+    elapsed = (time.perf_counter() - start) * 1000
+
+    print(f"🔎 {' + '.join(terms)}: {total} match(es) in {elapsed:.2f} ms")
+    for doc, score in hits:
+        title = index.fetch(doc)["output"].get("title", "untitled")
+        suffix = f"  ({score:.2f})" if score is not None else ""
+        print(f"  #{doc} {title}{suffix}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Build or query the ABED inverted index over the corpus"
+    )
+    parser.add_argument("--index", type=Path, default=RECIPE_INDEX_DIR)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build_parser = commands.add_parser("build", help="index the corpus")
+    build_parser.add_argument(
+        "--source", type=Path, default=RECIPE_CORPUS_FILE
+    )
+    build_parser.set_defaults(run=build)
+
+    query_parser = commands.add_parser(
+        "query", help="find recipes for ABED terms, e.g. tangy crispy snack"
+    )
+    query_parser.add_argument("terms", nargs="+")
+    query_parser.add_argument("-k", type=int, default=10)
+    query_parser.add_argument(
+        "--all",
+        action="store_true",
+        help="only recipes matching every term (default ranks by overlap)",
+    )
+    query_parser.set_defaults(run=query)
+
+    args = parser.parse_args()
+    args.run(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,285 @@
+import argparse
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import cycle, islice
+import numpy as np
+from config import GENERATED_RECIPES_FILE, SWEEP_RECIPES_FILE
+from app.generation.mock_server import (
+    MockCompletionServer,
+    load_recorded_recipes,
+)
+
+RECORDED_FILES = [GENERATED_RECIPES_FILE, SWEEP_RECIPES_FILE]
+
+
+def build_server(args):
+    return MockCompletionServer(
+        load_recorded_recipes(args.recipes or RECORDED_FILES),
+        host=args.host,
+        port=args.port,
+        latency=args.latency,
+        tokens_per_second=args.tokens_per_second,
+        error_rate=args.error_rate,
+        rpm=args.rpm,
+        seed=args.seed,
+    )
+
+
+def percentiles(values):
+    if not values:
+        return [float("nan")] * 3
+    return np.percentile(values, [50, 95, 99]).tolist()
+
+
+class Scorer:
+    """
+    One background thread scoring recipes in arrival order, the way
+    evaluate.py would behind the generators. `backlog` samples how many
+    finished generations are waiting to be scored.
+    """
+
+    def __init__(self, score=True, interval=0.1):
+        self.queue = queue.Queue()
+        self.score = score
+        self.interval = interval
+        self.latencies = []
+        self.backlog = []
+        self.done = threading.Event()
+        if score:
+            # Imported here so --no-score needs no embedding model
+            from app.evaluation.scoring import score_recipe
+            from app.utils.parser import parse_markdown_recipe
+
+            self.score_recipe = score_recipe
+            self.parse = parse_markdown_recipe
+
+    def __enter__(self):
+        self.workers = [
+            threading.Thread(target=self.run, daemon=True),
+            threading.Thread(target=self.sample, daemon=True),
+        ]
+        for worker in self.workers:
+            worker.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.queue.put(None)
+        self.workers[0].join()
+        self.done.set()
+        self.workers[1].join()
+
+    def submit(self, record, started):
+        self.queue.put((record, started))
+
+    def run(self):
+        while (item := self.queue.get()) is not None:
+            record, started = item
+            if self.score and record.get("recipe"):
+                parsed = self.parse(record["recipe"])
+                self.score_recipe(
+                    record,
+                    parsed["steps"],
+                    parsed["ingredients"],
+                    record_novelty=False,
+                )
+            self.latencies.append(time.perf_counter() - started)
+
+    def sample(self):
+        while not self.done.wait(self.interval):
+            self.backlog.append(self.queue.qsize())
+
+
+def run_level(client, base_prompt, entries, concurrency, requests, score):
+    # Imported here so `serve` needs neither openai nor the prompt files
+    import openai
+    from app.scripts.generate import generate_entry
+
+    generate_latencies = []
+    errors = []
+
+    def one(entry):
+        started = time.perf_counter()
+        try:
+            record = generate_entry(client, base_prompt, entry)
+        except openai.APIError as e:
+            errors.append(type(e).__name__)
+            return
+        generate_latencies.append(time.perf_counter() - started)
+        scorer.submit(record, started)
+
+    start = time.perf_counter()
+    with Scorer(score) as scorer:
+        with ThreadPoolExecutor(concurrency) as pool:
+            list(pool.map(one, islice(cycle(entries), requests)))
+    elapsed = time.perf_counter() - start
+
+    return {
+        "concurrency": concurrency,
+        "completed": len(scorer.latencies),
+        "errors": len(errors),
+        "elapsed": elapsed,
+        "generate": percentiles(generate_latencies),
+        "end_to_end": percentiles(scorer.latencies),
+        "backlog_max": max(scorer.backlog, default=0),
+        "backlog_mean": float(np.mean(scorer.backlog or [0])),
+    }
+
+
+def print_results(results):
+    print(
+        f"\n{'conc':>5} {'done':>5} {'err':>4} {'rec/s':>6} "
+        f"{'gen p50/p95/p99 (s)':>20} {'e2e p50/p95/p99 (s)':>20} "
+        f"{'backlog max/mean':>17}"
+    )
+    for row in results:
+        gen = "/".join(f"{v:.2f}" for v in row["generate"])
+        e2e = "/".join(f"{v:.2f}" for v in row["end_to_end"])
+        rate = row["completed"] / row["elapsed"]
+        backlog = f"{row['backlog_max']}/{row['backlog_mean']:.1f}"
+        print(
+            f"{row['concurrency']:>5} {row['completed']:>5} "
+            f"{row['errors']:>4} {rate:>6.2f} {gen:>20} {e2e:>20} "
+            f"{backlog:>17}"
+        )
+
+
+def run_serve(args):
+    server = build_server(args)
+    print(
+        f"🧪 Mock completion server with {len(server.recipes)} recipe(s) "
+        f"at {server.url}"
+    )
+    print(f"   export OPENAI_BASE_URL={server.url} OPENAI_API_KEY=mock")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"\n{server.counts}")
+
+
+def run_load(args):
+    import openai
+    from app.scripts.generate import load_abstraction_sets, load_base_prompt
+
+    server = None
+    base_url = args.base_url
+    if not base_url:
+        server = build_server(args).start()
+        base_url = server.url
+        print(f"🧪 Started mock completion server at {base_url}")
+
+    client = openai.OpenAI(
+        base_url=base_url, api_key="mock", max_retries=args.retries
+    )
+    entries = load_abstraction_sets()
+    base_prompt = load_base_prompt()
+
+    results = []
+    try:
+        for concurrency in args.concurrency:
+            requests = args.requests or concurrency * 4
+            print(f"🚚 {requests} request(s) at concurrency {concurrency}")
+            results.append(
+                run_level(
+                    client,
+                    base_prompt,
+                    entries,
+                    concurrency,
+                    requests,
+                    not args.no_score,
+                )
+            )
+    finally:
+        if server:
+            server.shutdown()
+            server.server_close()
+
+    print_results(results)
+    if server:
+        print(f"\nServer: {server.counts}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=(
+            "Load-test generation and scoring against a local mock "
+            "completion server"
+        )
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    server_args = argparse.ArgumentParser(add_help=False)
+    server_args.add_argument(
+        "--recipes",
+        nargs="+",
+        help="recorded recipe JSON/JSONL files to replay",
+    )
+    server_args.add_argument("--host", default="127.0.0.1")
+    server_args.add_argument("--port", type=int, default=0)
+    server_args.add_argument(
+        "--latency",
+        default="lognormal:1.5,0.4",
+        help="fixed:S, uniform:A,B or lognormal:MEDIAN,SIGMA (seconds)",
+    )
+    server_args.add_argument(
+        "--tokens-per-second",
+        type=float,
+        default=80,
+        help="pace of streamed responses",
+    )
+    server_args.add_argument(
+        "--error-rate",
+        type=float,
+        default=0.0,
+        help="fraction of requests that fail with a 500",
+    )
+    server_args.add_argument(
+        "--rpm", type=float, help="requests/minute before 429s"
+    )
+    server_args.add_argument("--seed", type=int)
+
+    serve_parser = commands.add_parser(
+        "serve", parents=[server_args], help="run the mock server alone"
+    )
+    serve_parser.set_defaults(run=run_serve)
+
+    run_parser = commands.add_parser(
+        "run",
+        parents=[server_args],
+        help="drive generation and scoring at several concurrency levels",
+    )
+    run_parser.add_argument(
+        "--concurrency",
+        type=lambda value: [int(v) for v in value.split(",")],
+        default=[1, 4, 16],
+        help="comma-separated levels, e.g. 1,4,16",
+    )
+    run_parser.add_argument(
+        "--requests",
+        type=int,
+        help="requests per level (default 4x the concurrency)",
+    )
+    run_parser.add_argument(
+        "--base-url", help="use an already running server instead"
+    )
+    run_parser.add_argument(
+        "--retries",
+        type=int,
+        default=2,
+        help="client retries on 429s and 5xx errors",
+    )
+    run_parser.add_argument(
+        "--no-score", action="store_true", help="measure generation only"
+    )
+    run_parser.set_defaults(run=run_load)
+
+    args = parser.parse_args()
+    args.run(args)
+
+
+if __name__ == "__main__":
+    main()
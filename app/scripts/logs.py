@@ -0,0 +1,103 @@
+import argparse
+import time
+from datetime import date, timedelta
+from app.utils.archive import TABLES, compact, query
+
+
+def parse_date(value):
+    # YYYY-MM-DD, or a relative "30d"
+    if value and value.endswith("d") and value[:-1].isdigit():
+        return (date.today() - timedelta(days=int(value[:-1]))).isoformat()
+    return value
+
+
+def parse_aggregate(value):
+    # "mean:RScore" -> ("mean", "RScore"); "count" -> ("count", None)
+    function, _, column = value.partition(":")
+    return function, column or None
+
+
+def run_compact(args):
+    start = time.perf_counter()
+    days, written = compact()
+    elapsed = time.perf_counter() - start
+    if not days:
+        print("✅ Archive is up to date.")
+        return
+    counts = ", ".join(f"{rows} {table}" for table, rows in written.items())
+    print(f"🗜️  Compacted {days} day(s) in {elapsed:.1f}s: {counts}")
+
+
+def run_query(args):
+    start = time.perf_counter()
+    try:
+        result = query(
+            args.table,
+            since=parse_date(args.since),
+            until=parse_date(args.until),
+            filters=args.where,
+            group_by=args.group_by.split(",") if args.group_by else (),
+            aggregates=[parse_aggregate(a) for a in args.agg],
+            columns=args.columns.split(",") if args.columns else None,
+            limit=args.limit,
+        )
+    except (FileNotFoundError, ValueError) as e:
+        print(f"❌ {e}")
+        return
+    elapsed = (time.perf_counter() - start) * 1000
+    if not result.num_rows:
+        print("No matching rows.")
+    else:
+        print(result.to_pandas().to_string(index=False))
+    print(f"\n⏱️  {result.num_rows} row(s) in {elapsed:.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compact daily logs into a columnar archive and query it"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    compact_parser = commands.add_parser(
+        "compact", help="roll new or changed days into logs/archive"
+    )
+    compact_parser.set_defaults(run=run_compact)
+
+    query_parser = commands.add_parser(
+        "query",
+        help="filter and aggregate archived logs",
+        description=(
+            "Example: query reviews --since 30d --group-by type "
+            "--agg mean:RScore --agg count"
+        ),
+    )
+    query_parser.add_argument("table", choices=TABLES)
+    query_parser.add_argument("--since", help="YYYY-MM-DD or e.g. 30d")
+    query_parser.add_argument("--until", help="YYYY-MM-DD or e.g. 7d")
+    query_parser.add_argument(
+        "--where",
+        action="append",
+        default=[],
+        help="e.g. 'RScore>=0.7', type=Dinner, flavor~tangy (repeatable)",
+    )
+    query_parser.add_argument(
+        "--group-by", help="comma-separated columns, e.g. type,flavor"
+    )
+    query_parser.add_argument(
+        "--agg",
+        action="append",
+        default=[],
+        help="function:column, e.g. mean:RScore, max:human_rating, count",
+    )
+    query_parser.add_argument(
+        "--columns", help="columns to list when not aggregating"
+    )
+    query_parser.add_argument("--limit", type=int)
+    query_parser.set_defaults(run=run_query)
+
+    args = parser.parse_args()
+    args.run(args)
+
+
+if __name__ == "__main__":
+    main()
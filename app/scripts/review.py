@@ -3,6 +3,7 @@ from pathlib import Path
 from datetime import datetime, timedelta
 from rich.prompt import Prompt
 from rich.console import Console
+from app.utils.writer import append_locked
 
 console = Console()
 
@@ -44,11 +45,13 @@ def save_rating(entry, score):
         "title": entry["title"],
         "abed_input": entry["abed_input"],
         "RScore": entry["RScore"],
+        "scores": entry.get("scores", {}),
+        "skipped": entry.get("skipped", []),
+        "embedding_key": entry.get("embedding_key"),
         "human_rating": score,
         "timestamp": datetime.now().isoformat(),
     }
-    with open(rating_path, "a") as f:
-        f.write(json.dumps(log_data) + "\n")
+    append_locked(rating_path, json.dumps(log_data) + "\n")
 
 
 def load_existing_ratings(rating_path):
@@ -76,7 +79,13 @@ def review():
         num_reviewed += 1
         console.rule(entry["title"])
         console.print(f"ABED: {entry['abed_input']}")
-        console.print(f"Model Score: {entry['RScore']}")
+        if entry.get("skipped"):
+            console.print(
+                f"Model Score: ≥ {entry['RScore']} "
+                f"(skipped: {', '.join(entry['skipped'])})"
+            )
+        else:
+            console.print(f"Model Score: {entry['RScore']}")
         entry["_review_path"] = latest
         score = Prompt.ask(
             "Your rating (1–5, or enter to skip)",
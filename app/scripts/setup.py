@@ -1,7 +1,8 @@
 import json
 from pathlib import Path
 from datasets import load_dataset
-from sentence_transformers import SentenceTransformer
+from config import EMBEDDING_MODEL_NAME, EMBEDDING_BACKEND
+from app.evaluation.embeddings import load_embedding_model
 
 # Create training data directory
 target_data_dir = Path("app/training/data")
@@ -70,7 +71,10 @@ for filename in ["prepare_data.py", "finetune_model.py", "evaluate_model.py"]:
 print("🏗️  Training setup complete!")
 
 # Pre-download sentence-transformers model to avoid delay later
-print("🧠 Downloading SentenceTransformer model 'all-MiniLM-L6-v2'...")
+print(
+    f"🧠 Downloading SentenceTransformer model '{EMBEDDING_MODEL_NAME}' "
+    f"({EMBEDDING_BACKEND})..."
+)
 
-SentenceTransformer("all-MiniLM-L6-v2")
+load_embedding_model()
 print("✅ SentenceTransformer model downloaded and ready.")
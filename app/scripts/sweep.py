@@ -0,0 +1,139 @@
+import argparse
+import json
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from pathlib import Path
+import yaml
+from config import (
+    SWEEP_RECIPES_FILE,
+    CASCADE,
+    TOKEN_BUDGET,
+    FEW_SHOT_EXAMPLES,
+    VOCAB_FILE,
+)
+from app.generation.sweep import abed_key, expand_spec
+from app.utils.writer import WRITER
+
+
+def load_done_keys(path):
+    # Sets already in the output file are skipped, so sweeps can resume
+    if not path.exists():
+        return set()
+    with open(path) as f:
+        return {
+            abed_key(json.loads(line)["input"]) for line in f if line.strip()
+        }
+
+
+def bounded_map(executor, fn, items, window):
+    # Like executor.map, but never holds more than `window` pending results
+    pending = deque()
+    for item in items:
+        pending.append(executor.submit(fn, item))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Generate recipes for every ABED set in a sweep spec."
+    )
+    parser.add_argument("spec", type=Path, help="YAML or JSON sweep spec")
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=SWEEP_RECIPES_FILE,
+        help="JSONL file recipes are appended to",
+    )
+    parser.add_argument("--limit", type=int, help="Stop after N ABED sets")
+    parser.add_argument(
+        "--workers", type=int, default=1, help="Concurrent generations"
+    )
+    parser.add_argument(
+        "--no-score", action="store_true", help="Generate without scoring"
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Print the ABED sets without generating anything",
+    )
+    args = parser.parse_args()
+
+    with open(args.spec) as f:
+        spec = yaml.safe_load(f)
+
+    done = set() if args.dry_run else load_done_keys(args.output)
+    with open(VOCAB_FILE) as f:
+        vocab = json.load(f)
+
+    abed_sets = expand_spec(spec, vocab, seen=done)
+    if args.limit:
+        abed_sets = islice(abed_sets, args.limit)
+
+    if args.dry_run:
+        count = 0
+        for abed_set in abed_sets:
+            print(json.dumps(abed_set))
+            count += 1
+        print(f"📃 {count} ABED set(s)")
+        return
+
+    # Imported here so --dry-run needs neither an API key nor the models
+    import openai
+    from app.scripts.generate import (
+        generate_entry,
+        load_base_prompt,
+        new_stats,
+        report,
+    )
+    from app.generation.budget import TokenBudget
+    from app.generation.cascade import CascadeRouter
+    from app.generation.retrieval import RecipeIndex
+    from app.utils.logging import LogSession
+
+    evaluate_item = None
+    if not args.no_score:
+        from app.scripts.evaluate import evaluate_item
+
+    client = openai.OpenAI()
+    router = CascadeRouter(client) if CASCADE else None
+    budget = TokenBudget() if TOKEN_BUDGET else None
+    index = RecipeIndex() if FEW_SHOT_EXAMPLES else None
+    base_prompt = load_base_prompt()
+    stats = new_stats()
+
+    def generate(abed_set):
+        # Counted per task and summed on the main thread, so workers
+        # never update the shared stats
+        task_stats = new_stats()
+        record = generate_entry(
+            client,
+            base_prompt,
+            abed_set,
+            router,
+            stats=task_stats,
+            budget=budget,
+            index=index,
+        )
+        return record, task_stats
+
+    count = 0
+    with LogSession() as session, ThreadPoolExecutor(args.workers) as pool:
+        results = bounded_map(pool, generate, abed_sets, args.workers * 2)
+        for record, task_stats in results:
+            for key, value in task_stats.items():
+                stats[key] += value
+            if evaluate_item:
+                evaluate_item(record, session)
+            WRITER.append(args.output, json.dumps(record) + "\n")
+            count += 1
+
+    report(router, stats, budget)
+    print(f"✅ Generated {count} recipe(s) into {args.output}")
+
+
+if __name__ == "__main__":
+    main()
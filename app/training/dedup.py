@@ -0,0 +1,173 @@
+import argparse
+import json
+import re
+from itertools import islice
+from multiprocessing import Pool
+from pathlib import Path
+import numpy as np
+import xxhash
+from tqdm import tqdm
+from app.utils.ingredients import extract_ingredient_name
+
+SOURCE_FILE = Path(__file__).parent / "data" / "abed_recipes.jsonl"
+TARGET_FILE = Path(__file__).parent / "data" / "abed_recipes.dedup.jsonl"
+
+# 16 bands of 8 rows put the LSH S-curve's midpoint at (1/16)^(1/8) ~ 0.71
+# Jaccard similarity. A pair becomes a candidate with probability
+# 1 - (1 - s^8)^16: ~0.95 at the 0.8 THRESHOLD duplicates are confirmed at,
+# ~1.0 from 0.9, but only ~0.61 at 0.7 and ~0.06 at 0.5. Lowering THRESHOLD
+# towards 0.7 needs more, shorter bands (e.g. 32 x 4) to keep recall.
+BANDS = 16
+ROWS = 8
+NUM_PERM = BANDS * ROWS
+THRESHOLD = 0.8
+STEP_SHINGLE = 3
+SEED = 1
+
+WORD_PATTERN = re.compile(r"[a-z]+")
+
+# Multiply-shift hash family: h_i(x) = (a_i * x + b_i) >> 32 over 64 bits
+_rng = np.random.default_rng(SEED)
+PERM_A = _rng.integers(1, 2**63, NUM_PERM, dtype=np.uint64) | np.uint64(1)
+PERM_B = _rng.integers(0, 2**63, NUM_PERM, dtype=np.uint64)
+
+
+def shingles(item):
+    """
+    The set of features two copies of a recipe share even when they were
+    scraped from different sites: normalized ingredient names plus word
+    n-grams of the steps. Quantities, units and punctuation are ignored.
+    """
+    output = item.get("output", {})
+    names = item.get("ingredient_names") or [
+        extract_ingredient_name(line) for line in output.get("ingredients", [])
+    ]
+    features = {f"i:{name}" for name in names if name}
+
+    words = WORD_PATTERN.findall(" ".join(output.get("steps", [])).lower())
+    grams = zip(*(words[i:] for i in range(STEP_SHINGLE)))
+    features.update("s:" + " ".join(gram) for gram in grams)
+    if 0 < len(words) < STEP_SHINGLE:
+        features.add("s:" + " ".join(words))
+    return features
+
+
+def minhash(features):
+    if not features:
+        return None
+    hashes = np.fromiter(
+        (xxhash.xxh64_intdigest(f) for f in features),
+        dtype=np.uint64,
+        count=len(features),
+    )
+    # uint64 arithmetic wraps, which is what multiply-shift wants
+    with np.errstate(over="ignore"):
+        permuted = (hashes[:, None] * PERM_A + PERM_B) >> np.uint64(32)
+    return permuted.min(axis=0).astype(np.uint32)
+
+
+def signature(line):
+    # Runs in the worker processes
+    if not line.strip():
+        return None
+    return minhash(shingles(json.loads(line)))
+
+
+class LSHIndex:
+    """
+    Banded LSH over MinHash signatures. Each kept signature is stored once
+    and indexed under one bucket key per band; a query returns kept
+    records that share any band, verified against the full signature.
+    """
+
+    def __init__(self, threshold=THRESHOLD):
+        self.threshold = threshold
+        self.buckets = [{} for _ in range(BANDS)]
+        self.signatures = np.empty((1024, NUM_PERM), dtype=np.uint32)
+        self.size = 0
+
+    def band_keys(self, sig):
+        bands = sig.reshape(BANDS, ROWS)
+        return [xxhash.xxh64_intdigest(band.tobytes()) for band in bands]
+
+    def find(self, sig, keys):
+        for band, key in enumerate(keys):
+            for index in self.buckets[band].get(key, ()):
+                agreement = np.mean(self.signatures[index] == sig)
+                if agreement >= self.threshold:
+                    return index
+        return None
+
+    def add(self, sig, keys):
+        if self.size == len(self.signatures):
+            self.signatures = np.resize(
+                self.signatures, (2 * self.size, NUM_PERM)
+            )
+        self.signatures[self.size] = sig
+        for band, key in enumerate(keys):
+            self.buckets[band].setdefault(key, []).append(self.size)
+        self.size += 1
+
+    def insert_unique(self, sig):
+        # True if sig was new and is now indexed, False if a near-duplicate
+        keys = self.band_keys(sig)
+        if self.find(sig, keys) is not None:
+            return False
+        self.add(sig, keys)
+        return True
+
+
+def dedup(source, target, threshold=THRESHOLD, workers=None, batch=8192):
+    """
+    Stream `source` into `target`, keeping the first of every group of
+    near-duplicate recipes. Lines are read `batch` at a time and signed in
+    a process pool, then checked against the index in input order, so the
+    corpus is never loaded whole and the output is deterministic.
+    Returns (kept, removed).
+    """
+    index = LSHIndex(threshold)
+    kept = removed = 0
+    with open(source) as f, open(target, "w") as out, Pool(workers) as pool:
+        progress = tqdm(desc="Deduplicating", unit=" recipes")
+        while lines := list(islice(f, batch)):
+            sigs = pool.map(signature, lines, chunksize=256)
+            for line, sig in zip(lines, sigs):
+                if not line.strip():
+                    continue
+                if sig is None or index.insert_unique(sig):
+                    out.write(line if line.endswith("\n") else line + "\n")
+                    kept += 1
+                else:
+                    removed += 1
+            progress.update(len(lines))
+        progress.close()
+    return kept, removed
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Drop near-duplicate recipes from the training corpus"
+    )
+    parser.add_argument("--source", type=Path, default=SOURCE_FILE)
+    parser.add_argument("--target", type=Path, default=TARGET_FILE)
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=THRESHOLD,
+        help="estimated Jaccard similarity above which recipes are dupes",
+    )
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    kept, removed = dedup(
+        args.source, args.target, args.threshold, args.workers
+    )
+    total = kept + removed
+    share = removed / total if total else 0.0
+    print(f"✅ Kept {kept} of {total} recipes")
+    print(f"🧹 Removed {removed} near-duplicates ({share:.1%})")
+    print(f"📝 Saved to {args.target}")
+
+
+if __name__ == "__main__":
+    main()
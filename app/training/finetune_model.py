@@ -1,6 +1,7 @@
+import argparse
 import json
+import os
 from pathlib import Path
-from datasets import Dataset
 from transformers import (
     AutoTokenizer,
     AutoModelForCausalLM,
@@ -8,13 +9,23 @@ from transformers import (
     TrainingArguments,
     DataCollatorForLanguageModeling,
 )
+from transformers.trainer_utils import get_last_checkpoint
 import torch
+from app.training.shards import ShardedDataset, build_shards, shards_current
 
 # Model Config
 MODEL_NAME = "distilgpt2"
-DATA_PATH = Path(__file__).parent / "data" / "abed_recipes.jsonl"
+DATA_DIR = Path(__file__).parent / "data"
+# Prefer the near-duplicate-free corpus written by dedup.py
+DATA_PATH = DATA_DIR / "abed_recipes.dedup.jsonl"
+if not DATA_PATH.exists():
+    DATA_PATH = DATA_DIR / "abed_recipes.jsonl"
+SHARDS_DIR = DATA_DIR / "shards"
 MAX_LENGTH = 512
 OUTPUT_DIR = "models/chez-abed-gpt2"
+# Samples per optimizer step, summed over processes and accumulation
+EFFECTIVE_BATCH = 8
+PER_DEVICE_BATCH = 4
 
 
 # Load + Prepare Data
@@ -39,70 +50,164 @@ def flatten_recipe(output):
     )
 
 
-def load_dataset(path):
-    samples = []
+def iter_texts(path):
+    # One training text per line, read lazily
     with open(path) as f:
         for line in f:
+            if not line.strip():
+                continue
             item = json.loads(line)
             abed_str = flatten_abed(item["input"])
             recipe_str = flatten_recipe(item["output"])
-            samples.append({"text": abed_str + "\n" + recipe_str})
-    return Dataset.from_list(samples)
+            yield abed_str + "\n" + recipe_str
 
 
-# Load Model + Tokenizer
-tokenizer = AutoTokenizer.from_pretrained(MODEL_NAME)
-tokenizer.pad_token = tokenizer.eos_token  # for GPT-2 compatibility
+def load_dataset(path, tokenizer, shard_dir=SHARDS_DIR, rebuild=False):
+    """
+    Tokenized dataset for `path`, memory-mapped from shard_dir. Shards are
+    (re)built first if missing or made from a different corpus.
+    """
+    if rebuild or not shards_current(shard_dir, path, tokenizer, MAX_LENGTH):
+        print(f"🧱 Tokenizing {path} into shards under {shard_dir}...")
+        meta = build_shards(
+            iter_texts(path), tokenizer, shard_dir, MAX_LENGTH, source=path
+        )
+        print(f"✅ Wrote {sum(meta['counts'])} samples")
+    return ShardedDataset(shard_dir)
 
-model = AutoModelForCausalLM.from_pretrained(MODEL_NAME)
 
-if torch.cuda.is_available():
-    device = torch.device("cuda")
-elif torch.backends.mps.is_available():
-    device = torch.device("mps")
-else:
-    device = torch.device("cpu")
+# Load Model + Tokenizer
+def load_tokenizer():
+    tokenizer = AutoTokenizer.from_pretrained(MODEL_NAME)
+    tokenizer.pad_token = tokenizer.eos_token  # for GPT-2 compatibility
+    return tokenizer
 
-print(f"🧠 Using device: {device}")
-model.to(device)
 
-# Tokenize Dataset
-dataset = load_dataset(DATA_PATH)
+def pick_device():
+    if torch.cuda.is_available():
+        return torch.device("cuda")
+    if torch.backends.mps.is_available():
+        return torch.device("mps")
+    return torch.device("cpu")
 
 
-def tokenize(batch):
-    return tokenizer(
-        batch["text"],
-        truncation=True,
-        padding="max_length",
-        max_length=MAX_LENGTH,
+# Training
+def batch_plan(world_size):
+    """
+    Per-process batch size and accumulation steps that keep
+    EFFECTIVE_BATCH samples per optimizer step across `world_size`
+    processes, so results stay comparable however many ranks run.
+    """
+    per_device = max(1, min(PER_DEVICE_BATCH, EFFECTIVE_BATCH // world_size))
+    accumulation = max(1, EFFECTIVE_BATCH // (per_device * world_size))
+    effective = per_device * accumulation * world_size
+    if effective != EFFECTIVE_BATCH:
+        print(
+            f"⚠️  {world_size} processes give an effective batch of "
+            f"{effective} instead of {EFFECTIVE_BATCH}"
+        )
+    return per_device, accumulation
+
+
+def training_arguments(**overrides):
+    world_size = int(os.environ.get("WORLD_SIZE", 1))
+    per_device, accumulation = batch_plan(world_size)
+    args = dict(
+        output_dir=OUTPUT_DIR,
+        per_device_train_batch_size=per_device,
+        num_train_epochs=3,
+        logging_steps=10,
+        save_steps=200,
+        save_total_limit=2,
+        eval_strategy="no",
+        fp16=torch.cuda.is_available(),
+        dataloader_pin_memory=True,
+        gradient_accumulation_steps=accumulation,
+        report_to="none",
+    )
+    if "LOCAL_RANK" in os.environ and pick_device().type == "cpu":
+        # Data-parallel over local CPU processes (see launch_cpu.py)
+        args.update(
+            use_cpu=True,
+            ddp_backend="gloo",
+            dataloader_pin_memory=False,
+        )
+    args.update(overrides)
+    return TrainingArguments(**args)
+
+
+def build_trainer(model, tokenizer, dataset, training_args):
+    return Trainer(
+        model=model,
+        args=training_args,
+        train_dataset=dataset,
+        # Pads each batch to its longest sample rather than MAX_LENGTH
+        data_collator=DataCollatorForLanguageModeling(tokenizer, mlm=False),
     )
 
 
-tokenized = dataset.map(tokenize, batched=True)
+def main():
+    parser = argparse.ArgumentParser(description="Fine-tune the ABED model")
+    parser.add_argument(
+        "--prepare-only",
+        action="store_true",
+        help="build the token shards and exit",
+    )
+    parser.add_argument(
+        "--rebuild-shards",
+        action="store_true",
+        help="re-tokenize even if the shards look current",
+    )
+    parser.add_argument(
+        "--no-resume",
+        action="store_true",
+        help="start over instead of resuming from the last checkpoint",
+    )
+    parser.add_argument("--output-dir", default=OUTPUT_DIR)
+    parser.add_argument(
+        "--max-steps",
+        type=int,
+        default=-1,
+        help="stop after this many optimizer steps (for benchmarks)",
+    )
+    parser.add_argument(
+        "--metrics-file",
+        type=Path,
+        help="write the training metrics here as JSON",
+    )
+    args = parser.parse_args()
+
+    tokenizer = load_tokenizer()
+    dataset = load_dataset(DATA_PATH, tokenizer, rebuild=args.rebuild_shards)
+    if args.prepare_only:
+        return
+
+    model = AutoModelForCausalLM.from_pretrained(MODEL_NAME)
+    device = pick_device()
+    print(f"🧠 Using device: {device}")
+    model.to(device)
+
+    # Trainer restores optimizer, scheduler, RNG and dataset position
+    checkpoint = None
+    if not args.no_resume and Path(args.output_dir).is_dir():
+        checkpoint = get_last_checkpoint(args.output_dir)
+    if checkpoint:
+        print(f"↩️  Resuming from {checkpoint}")
+
+    training_args = training_arguments(
+        output_dir=args.output_dir, max_steps=args.max_steps
+    )
+    trainer = build_trainer(model, tokenizer, dataset, training_args)
+    result = trainer.train(resume_from_checkpoint=checkpoint)
+    trainer.save_model(args.output_dir)
+    if not trainer.is_world_process_zero():
+        return
 
-# Training
-training_args = TrainingArguments(
-    output_dir=OUTPUT_DIR,
-    per_device_train_batch_size=4,
-    num_train_epochs=3,
-    logging_steps=10,
-    save_steps=200,
-    save_total_limit=2,
-    eval_strategy="no",
-    fp16=torch.cuda.is_available(),
-    dataloader_pin_memory=True,
-    gradient_accumulation_steps=2,
-    report_to="none",
-)
+    if args.metrics_file:
+        with open(args.metrics_file, "w") as f:
+            json.dump(result.metrics, f, indent=2)
+    print(f"✅ Model saved to {args.output_dir}")
 
-trainer = Trainer(
-    model=model,
-    args=training_args,
-    train_dataset=tokenized,
-    data_collator=DataCollatorForLanguageModeling(tokenizer, mlm=False),
-)
 
-trainer.train()
-trainer.save_model(OUTPUT_DIR)
-print(f"✅ Model saved to {OUTPUT_DIR}")
+if __name__ == "__main__":
+    main()
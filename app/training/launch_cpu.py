@@ -0,0 +1,194 @@
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Runs finetune_model.py as several data-parallel processes on one
+# many-core CPU box (torch DDP over gloo). Each rank is pinned to its own
+# slice of cores with a matching thread count, so ranks don't fight over
+# the same cores. finetune_model.py keeps the effective batch size fixed
+# by trading per-rank batch for accumulation steps.
+#
+#   python -m app.training.launch_cpu --procs 4
+#   python -m app.training.launch_cpu --scaling 1,2,4 --steps 20
+
+TRAIN_MODULE = "app.training.finetune_model"
+
+
+def available_cpus():
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def split_cpus(procs, cpus=None):
+    # Contiguous, equal slices of cores, one per rank
+    cpus = available_cpus() if cpus is None else cpus
+    per_rank = len(cpus) // procs
+    if per_rank == 0:
+        raise ValueError(f"{procs} processes but only {len(cpus)} cores")
+    slices = []
+    for rank in range(procs):
+        start = rank * per_rank
+        stop = start + per_rank
+        slices.append(cpus[start:stop])
+    return slices
+
+
+def pin_to(cores):
+    # Runs in the child before exec, so every thread it starts inherits it
+    if not hasattr(os, "sched_setaffinity"):
+        return None
+    return lambda: os.sched_setaffinity(0, cores)
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def rank_env(rank, procs, cores, port):
+    threads = str(len(cores))
+    return {
+        **os.environ,
+        "RANK": str(rank),
+        "LOCAL_RANK": str(rank),
+        "WORLD_SIZE": str(procs),
+        "LOCAL_WORLD_SIZE": str(procs),
+        "MASTER_ADDR": "127.0.0.1",
+        "MASTER_PORT": str(port),
+        # Read by torch when its thread pools start
+        "OMP_NUM_THREADS": threads,
+        "MKL_NUM_THREADS": threads,
+        "TOKENIZERS_PARALLELISM": "false",
+    }
+
+
+def launch(procs, train_args=()):
+    """
+    Start `procs` training ranks and wait for them. If one fails the rest
+    are stopped, since DDP would otherwise hang waiting for it.
+    Returns the first non-zero exit code, or 0.
+    """
+    port = free_port()
+    ranks = []
+    for rank, cores in enumerate(split_cpus(procs)):
+        ranks.append(
+            subprocess.Popen(
+                [sys.executable, "-m", TRAIN_MODULE, *train_args],
+                env=rank_env(rank, procs, cores, port),
+                preexec_fn=pin_to(cores),
+            )
+        )
+
+    return wait_all(ranks)
+
+
+def wait_all(ranks, interval=0.2):
+    """
+    Poll every rank until all have exited, terminating the others as soon
+    as any one fails. Returns the first non-zero exit code, or 0.
+    """
+    running = list(ranks)
+    code = 0
+    while running:
+        for process in list(running):
+            returncode = process.poll()
+            if returncode is None:
+                continue
+            running.remove(process)
+            if returncode and not code:
+                code = returncode
+                for other in running:
+                    other.terminate()
+        if running:
+            time.sleep(interval)
+    return code
+
+
+def prepare_shards():
+    # Built once up front so ranks don't race to tokenize the corpus
+    command = [sys.executable, "-m", TRAIN_MODULE, "--prepare-only"]
+    code = subprocess.call(command)
+    if code:
+        sys.exit(code)
+
+
+def measure_scaling(proc_counts, steps):
+    """
+    Train `steps` optimizer steps from scratch at each process count and
+    report samples/sec relative to the smallest count.
+    """
+    results = {}
+    for procs in proc_counts:
+        with tempfile.TemporaryDirectory() as tmp:
+            metrics_path = Path(tmp) / "metrics.json"
+            print(f"⏱️  Training {steps} steps on {procs} process(es)...")
+            code = launch(
+                procs,
+                [
+                    "--no-resume",
+                    "--output-dir",
+                    str(Path(tmp) / "model"),
+                    "--max-steps",
+                    str(steps),
+                    "--metrics-file",
+                    str(metrics_path),
+                ],
+            )
+            if code:
+                sys.exit(code)
+            with open(metrics_path) as f:
+                results[procs] = json.load(f)["train_samples_per_second"]
+
+    base_procs = min(results)
+    base = results[base_procs]
+    print("\n📈 Data-parallel scaling")
+    print(f"{'procs':>6} {'samples/s':>10} {'speedup':>8} {'efficiency':>10}")
+    for procs, rate in sorted(results.items()):
+        speedup = rate / base if base else 0.0
+        efficiency = speedup * base_procs / procs
+        print(f"{procs:>6} {rate:>10.2f} {speedup:>7.2f}x {efficiency:>10.0%}")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Data-parallel fine-tuning over local CPU processes"
+    )
+    parser.add_argument(
+        "--procs",
+        type=int,
+        default=2,
+        help="number of training processes",
+    )
+    parser.add_argument(
+        "--scaling",
+        help="comma-separated process counts to benchmark, e.g. 1,2,4",
+    )
+    parser.add_argument(
+        "--steps",
+        type=int,
+        default=20,
+        help="optimizer steps per scaling run",
+    )
+    args, train_args = parser.parse_known_args()
+
+    prepare_shards()
+    if args.scaling:
+        counts = [int(n) for n in args.scaling.split(",")]
+        measure_scaling(counts, args.steps)
+        return
+
+    print(f"🧠 Training on {args.procs} CPU processes")
+    sys.exit(launch(args.procs, train_args))
+
+
+if __name__ == "__main__":
+    main()
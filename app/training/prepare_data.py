@@ -1,6 +1,7 @@
 import json
 from pathlib import Path
 from tqdm import tqdm
+from app.utils.ingredients import extract_ingredient_name
 
 SOURCE_FILE = Path(__file__).parent / "data" / "RecipeNLG_dataset.json"
 TARGET_FILE = Path(__file__).parent / "data" / "abed_recipes.jsonl"
@@ -35,6 +36,7 @@ def convert_entry(entry):
             "ingredients": ingredients,
             "steps": instructions,
         },
+        "ingredient_names": [extract_ingredient_name(i) for i in ingredients],
     }
     return prompt
 
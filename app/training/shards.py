@@ -0,0 +1,155 @@
+import json
+import os
+from itertools import islice
+from pathlib import Path
+import numpy as np
+from torch.utils.data import Dataset
+
+# Tokenized training data as raw token-id shards. Each shard is a pair:
+#
+#   shard-00000.bin   every sample's token ids back to back (uint16)
+#   shard-00000.idx   int64 offsets, sample i is bin[idx[i]:idx[i + 1]]
+#
+# plus one meta.json describing the shards and what produced them. The
+# files are memory-mapped, so opening a dataset reads no token data.
+
+META_FILENAME = "meta.json"
+SHARD_SIZE = 100_000
+TOKENIZE_BATCH = 1000
+
+
+def shard_paths(shard_dir, index):
+    stem = Path(shard_dir) / f"shard-{index:05d}"
+    return stem.with_suffix(".bin"), stem.with_suffix(".idx")
+
+
+def token_dtype(vocab_size):
+    return np.uint16 if vocab_size <= 2**16 else np.uint32
+
+
+def write_shard(shard_dir, index, samples, dtype):
+    bin_path, idx_path = shard_paths(shard_dir, index)
+    offsets = np.zeros(len(samples) + 1, dtype=np.int64)
+    np.cumsum([len(ids) for ids in samples], out=offsets[1:])
+    tokens = np.fromiter(
+        (t for ids in samples for t in ids), dtype=dtype, count=offsets[-1]
+    )
+    tokens.tofile(bin_path)
+    offsets.tofile(idx_path)
+    return len(samples)
+
+
+def build_shards(
+    texts, tokenizer, shard_dir, max_length, source=None, shard_size=SHARD_SIZE
+):
+    """
+    Tokenize an iterable of training texts into memory-mapped shards under
+    `shard_dir`. Texts are consumed in batches, so only one shard of token
+    ids is ever held in memory. `source` is recorded in meta.json so stale
+    shards can be detected (see `shards_current`).
+    """
+    shard_dir = Path(shard_dir)
+    shard_dir.mkdir(parents=True, exist_ok=True)
+    (shard_dir / META_FILENAME).unlink(missing_ok=True)
+    dtype = token_dtype(len(tokenizer))
+
+    counts = []
+    pending = []
+    texts = iter(texts)
+    while batch := list(islice(texts, TOKENIZE_BATCH)):
+        encoded = tokenizer(batch, truncation=True, max_length=max_length)
+        pending.extend(encoded["input_ids"])
+        while len(pending) >= shard_size:
+            chunk, pending = pending[:shard_size], pending[shard_size:]
+            counts.append(write_shard(shard_dir, len(counts), chunk, dtype))
+    if pending:
+        counts.append(write_shard(shard_dir, len(counts), pending, dtype))
+
+    meta = {
+        "tokenizer": tokenizer.name_or_path,
+        "max_length": max_length,
+        "dtype": np.dtype(dtype).name,
+        "counts": counts,
+        "source": source_stamp(source) if source else None,
+    }
+    # meta.json goes last: shards without one are incomplete
+    with open(shard_dir / META_FILENAME, "w") as f:
+        json.dump(meta, f, indent=2)
+    return meta
+
+
+def source_stamp(path):
+    stat = os.stat(path)
+    return {"path": str(path), "size": stat.st_size, "mtime": stat.st_mtime}
+
+
+def load_meta(shard_dir):
+    meta_path = Path(shard_dir) / META_FILENAME
+    if not meta_path.exists():
+        return None
+    with open(meta_path) as f:
+        return json.load(f)
+
+
+def shards_current(shard_dir, source, tokenizer, max_length):
+    # True if shard_dir holds complete shards built from this exact input
+    meta = load_meta(shard_dir)
+    return bool(
+        meta
+        and meta["tokenizer"] == tokenizer.name_or_path
+        and meta["max_length"] == max_length
+        and meta["source"] == source_stamp(source)
+    )
+
+
+class ShardedDataset(Dataset):
+    """
+    Map-style dataset over token shards. Samples are sliced straight out
+    of the memory-mapped files, so startup is O(number of shards) and
+    the OS page cache decides what stays resident.
+
+    Being map-style with a fixed length, it lets Trainer restore the exact
+    sampler position when resuming from a checkpoint.
+    """
+
+    def __init__(self, shard_dir):
+        self.shard_dir = Path(shard_dir)
+        meta = load_meta(self.shard_dir)
+        if meta is None:
+            raise FileNotFoundError(
+                f"No complete shards in {self.shard_dir}, build them first"
+            )
+        self.dtype = np.dtype(meta["dtype"])
+        self.counts = meta["counts"]
+        self.starts = np.concatenate([[0], np.cumsum(self.counts)])
+        self._maps = {}
+
+    def __len__(self):
+        return int(self.starts[-1])
+
+    def _shard(self, index):
+        # Opened lazily so each DataLoader worker maps its own copy
+        if index not in self._maps:
+            bin_path, idx_path = shard_paths(self.shard_dir, index)
+            self._maps[index] = (
+                np.memmap(bin_path, dtype=self.dtype, mode="r"),
+                np.memmap(idx_path, dtype=np.int64, mode="r"),
+            )
+        return self._maps[index]
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        shard = int(np.searchsorted(self.starts, i, side="right")) - 1
+        tokens, offsets = self._shard(shard)
+        local = i - self.starts[shard]
+        start, end = offsets[local], offsets[local + 1]
+        return {"input_ids": tokens[start:end].astype(np.int64).tolist()}
+
+    def __getstate__(self):
+        # Don't pickle open maps into worker processes
+        state = self.__dict__.copy()
+        state["_maps"] = {}
+        return state
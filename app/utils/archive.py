@@ -0,0 +1,408 @@
+import json
+import os
+import re
+from datetime import datetime
+from pathlib import Path
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+import yaml
+from config import LOGS_DIR, ARCHIVE_DIR, METRICS_CONFIG_FILE
+from app.utils.logging import BUNDLE_FILENAME, load_bundle, recipe_title
+from app.utils.writer import WRITER, lock_for, write_atomic
+
+# Columnar archive of the daily logs. Each day's reviews, ratings and
+# recipes are rolled into one Parquet file per table and day:
+#
+#   logs/archive/<table>/date=YYYY-MM-DD/part-0.parquet
+#
+# Queries scan the tables as hive-partitioned datasets, so date filters
+# skip whole partitions and other filters are pushed down to the Parquet
+# row groups. manifest.json remembers what each day's files looked like
+# when compacted, so only changed days are rewritten.
+
+TABLES = ["reviews", "ratings", "recipes"]
+MANIFEST_FILENAME = "manifest.json"
+DAY_GLOB = "[0-9][0-9][0-9][0-9]/[0-9][0-9]/[0-9][0-9]"
+
+with open(METRICS_CONFIG_FILE) as f:
+    METRIC_NAMES = list(yaml.safe_load(f)["weights"])
+
+ABED_FIELDS = [
+    ("type", pa.string()),
+    ("mood", pa.string()),
+    ("flavor", pa.list_(pa.string())),
+    ("texture", pa.list_(pa.string())),
+    ("dietary_restrictions", pa.list_(pa.string())),
+    ("total_served", pa.string()),
+    ("technique_level", pa.string()),
+    ("prep_time", pa.string()),
+]
+
+BASE_FIELDS = [
+    ("timestamp", pa.timestamp("ms")),
+    ("title", pa.string()),
+    *ABED_FIELDS,
+    ("RScore", pa.float64()),
+    *[(name, pa.float64()) for name in METRIC_NAMES],
+]
+
+SCHEMAS = {
+    "reviews": pa.schema(BASE_FIELDS),
+    "ratings": pa.schema([*BASE_FIELDS, ("human_rating", pa.float64())]),
+    "recipes": pa.schema(
+        [
+            *BASE_FIELDS,
+            ("predicted_rating", pa.float64()),
+            ("filename", pa.string()),
+            ("recipe", pa.large_string()),
+        ]
+    ),
+}
+
+PARTITIONING = ds.partitioning(
+    pa.schema([("date", pa.string())]), flavor="hive"
+)
+
+MARKDOWN_SCORE = re.compile(r"^- (\w+): \S+ \(([\d.]+)\)$", re.MULTILINE)
+MARKDOWN_RSCORE = re.compile(r"\*\*RScore:\*\* ([\d.]+)")
+
+
+def as_list(value):
+    if value in (None, ""):
+        return []
+    return [str(v) for v in value] if isinstance(value, list) else [value]
+
+
+def flat_row(timestamp, title, abed, scores):
+    # One archive row from the fields every log record shares
+    abed = abed or {}
+    row = {"timestamp": timestamp, "title": title}
+    for name, kind in ABED_FIELDS:
+        value = abed.get(name)
+        if pa.types.is_list(kind):
+            row[name] = as_list(value)
+        else:
+            row[name] = None if value is None else str(value)
+    for name in ["RScore", *METRIC_NAMES, "predicted_rating"]:
+        value = (scores or {}).get(name)
+        row[name] = float(value) if isinstance(value, (int, float)) else None
+    return row
+
+
+def parse_time(value):
+    return datetime.fromisoformat(value) if value else None
+
+
+def review_rows(path):
+    for entry in read_jsonl(path):
+        yield flat_row(
+            parse_time(entry.get("timestamp")),
+            entry.get("title"),
+            entry.get("abed_input"),
+            {"RScore": entry.get("RScore"), **entry.get("scores", {})},
+        )
+
+
+def rating_rows(path):
+    for entry in read_jsonl(path):
+        row = flat_row(
+            parse_time(entry.get("timestamp")),
+            entry.get("title"),
+            entry.get("abed_input"),
+            {"RScore": entry.get("RScore"), **entry.get("scores", {})},
+        )
+        row["human_rating"] = entry.get("human_rating")
+        yield row
+
+
+def markdown_time(day, filename):
+    # "HH-MM-SSmmm_title.md" as written by logging.log_filename
+    try:
+        clock = datetime.strptime(filename[:11], "%H-%M-%S%f")
+    except ValueError:
+        return day
+    return day.replace(
+        hour=clock.hour,
+        minute=clock.minute,
+        second=clock.second,
+        microsecond=clock.microsecond,
+    )
+
+
+def recipe_rows(day_dir, day):
+    # A recipe can be both in the bundle and on disk as markdown (e.g.
+    # exported next to it with `export --out`); the bundle copy wins
+    bundled = set()
+    bundle = day_dir / BUNDLE_FILENAME
+    if bundle.exists():
+        with lock_for(bundle):
+            records = load_bundle(bundle)
+        for record in records:
+            row = flat_row(
+                parse_time(record.get("timestamp")),
+                recipe_title(record.get("recipe", "")),
+                record.get("input"),
+                record.get("scores"),
+            )
+            row["filename"] = record.get("filename")
+            row["recipe"] = record.get("recipe")
+            bundled.add(row["filename"])
+            yield row
+
+    for path in sorted(day_dir.glob("*.md")):
+        if path.name in bundled:
+            continue
+        text = path.read_text()
+        scores = {
+            name.lower(): float(value)
+            for name, value in MARKDOWN_SCORE.findall(text)
+        }
+        rscore = MARKDOWN_RSCORE.search(text)
+        if rscore:
+            scores["RScore"] = float(rscore.group(1))
+        row = flat_row(
+            markdown_time(day, path.name),
+            recipe_title(text),
+            None,
+            scores,
+        )
+        row["filename"] = path.name
+        row["recipe"] = text
+        yield row
+
+
+def read_jsonl(path):
+    if not path.exists():
+        return []
+    with lock_for(path), open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def day_rows(day_dir, day):
+    return {
+        "reviews": list(review_rows(day_dir / "reviews.jsonl")),
+        "ratings": list(rating_rows(day_dir / "ratings.jsonl")),
+        "recipes": list(recipe_rows(day_dir, day)),
+    }
+
+
+def day_stamp(day_dir):
+    # What the day's log files looked like, to spot days that changed
+    return {
+        path.name: [path.stat().st_size, path.stat().st_mtime_ns]
+        for path in sorted(day_dir.iterdir())
+        if path.is_file() and not path.name.endswith(".lock")
+    }
+
+
+def write_partition(table_dir, date, rows, schema):
+    partition = table_dir / f"date={date}"
+    target = partition / "part-0.parquet"
+    if not rows:
+        target.unlink(missing_ok=True)
+        return 0
+    partition.mkdir(parents=True, exist_ok=True)
+    table = pa.Table.from_pylist(rows, schema=schema)
+    tmp = partition / f".part-0.{os.getpid()}.tmp"
+    pq.write_table(table, tmp, compression="zstd")
+    os.replace(tmp, target)
+    return len(rows)
+
+
+def load_manifest(archive_dir):
+    path = archive_dir / MANIFEST_FILENAME
+    if not path.exists():
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def compact(log_dir: Path = LOGS_DIR, archive_dir: Path = ARCHIVE_DIR):
+    """
+    Roll every new or changed day under logs/YYYY/MM/DD into the archive.
+    Returns the number of days rewritten and {table: rows written}.
+    """
+    WRITER.flush(sync=False)
+    manifest = load_manifest(archive_dir)
+    written = {table: 0 for table in TABLES}
+    days = 0
+
+    for day_dir in sorted(log_dir.glob(DAY_GLOB)):
+        date = "-".join(day_dir.relative_to(log_dir).parts)
+        stamp = day_stamp(day_dir)
+        if manifest.get(date) == stamp:
+            continue
+
+        day = datetime.strptime(date, "%Y-%m-%d")
+        for table, rows in day_rows(day_dir, day).items():
+            written[table] += write_partition(
+                archive_dir / table, date, rows, SCHEMAS[table]
+            )
+        manifest[date] = stamp
+        days += 1
+        # Saved as we go so an interrupted run resumes where it stopped
+        write_atomic(archive_dir / MANIFEST_FILENAME, json.dumps(manifest))
+
+    return days, written
+
+
+def dataset(table, archive_dir: Path = ARCHIVE_DIR):
+    path = archive_dir / table
+    if not path.exists():
+        raise FileNotFoundError(
+            f"No archived {table} yet, run `python -m app.scripts.logs "
+            "compact` first"
+        )
+    return ds.dataset(
+        path,
+        format="parquet",
+        partitioning=PARTITIONING,
+        schema=SCHEMAS[table].append(pa.field("date", pa.string())),
+    )
+
+
+DEFAULT_COLUMNS = ["date", "timestamp", "title", "RScore"]
+FILTER_PATTERN = re.compile(r"^(\w+)\s*(>=|<=|!=|==|=|>|<|~)\s*(.+)$")
+COMPARISONS = {
+    "=": lambda f, v: f == v,
+    "==": lambda f, v: f == v,
+    "!=": lambda f, v: f != v,
+    ">": lambda f, v: f > v,
+    ">=": lambda f, v: f >= v,
+    "<": lambda f, v: f < v,
+    "<=": lambda f, v: f <= v,
+}
+
+
+def parse_filter(text, schema):
+    """
+    "RScore>=0.7", "type=Dinner", "flavor~tangy" -> (column, op, value).
+    `~` means "contains": list membership or a substring, ignoring case.
+    """
+    match = FILTER_PATTERN.match(text.strip())
+    if not match:
+        raise ValueError(f"Can't parse filter '{text}'")
+    column, op, value = match.groups()
+    if column not in schema.names:
+        raise ValueError(f"Unknown column '{column}'")
+    kind = schema.field(column).type
+    if op != "~" and (pa.types.is_floating(kind) or pa.types.is_integer(kind)):
+        value = float(value)
+    elif pa.types.is_timestamp(kind):
+        value = datetime.fromisoformat(value)
+    return column, op, value
+
+
+def pushdown_expression(filters, schema, since=None, until=None):
+    """
+    Dataset filter for everything that can be evaluated while scanning:
+    date bounds prune partitions, comparisons go to Parquet statistics.
+    List membership is left for `apply_contains`.
+    """
+    expression = None
+    clauses = []
+    if since:
+        clauses.append(ds.field("date") >= since)
+    if until:
+        clauses.append(ds.field("date") <= until)
+    for column, op, value in filters:
+        if op != "~":
+            clauses.append(COMPARISONS[op](ds.field(column), value))
+        elif not pa.types.is_list(schema.field(column).type):
+            clauses.append(
+                pc.match_substring(ds.field(column), value, ignore_case=True)
+            )
+    for clause in clauses:
+        expression = clause if expression is None else expression & clause
+    return expression
+
+
+def list_contains(column, value):
+    # Boolean mask: rows whose list column holds `value`, ignoring case
+    column = column.combine_chunks()
+    hits = pc.equal(pc.utf8_lower(pc.list_flatten(column)), value.lower())
+    rows = pc.filter(pc.list_parent_indices(column), hits)
+    return pc.is_in(
+        pa.array(range(len(column)), pa.int64()),
+        value_set=pc.unique(rows).cast(pa.int64()),
+    )
+
+
+def apply_contains(table, filters, schema):
+    for column, op, value in filters:
+        if op == "~" and pa.types.is_list(schema.field(column).type):
+            table = table.filter(list_contains(table[column], value))
+    return table
+
+
+def explode(table, column):
+    # One row per list element, so a list column can be grouped on
+    values = table[column].combine_chunks()
+    parents = pc.list_parent_indices(values)
+    columns = {
+        name: table[name].take(parents)
+        for name in table.column_names
+        if name != column
+    }
+    columns[column] = pc.list_flatten(values)
+    return pa.table(columns)
+
+
+def query(
+    table,
+    since=None,
+    until=None,
+    filters=(),
+    group_by=(),
+    aggregates=(),
+    columns=None,
+    limit=None,
+    archive_dir: Path = ARCHIVE_DIR,
+):
+    """
+    Filter and aggregate one archived table. `aggregates` are
+    (function, column) pairs such as ("mean", "RScore"); ("count", None)
+    counts rows. Without group_by or aggregates, matching rows are
+    returned with `columns`.
+    """
+    data = dataset(table, archive_dir)
+    schema = data.schema
+    filters = [parse_filter(f, schema) for f in filters]
+
+    needed = set(group_by) | {c for _, c in aggregates if c}
+    needed |= {column for column, op, _ in filters if op == "~"}
+    columns = columns or DEFAULT_COLUMNS
+    if not (group_by or aggregates):
+        needed |= {*columns, "timestamp"}
+    unknown = needed - set(schema.names)
+    if unknown:
+        raise ValueError(f"Unknown column(s): {sorted(unknown)}")
+
+    result = data.to_table(
+        columns=sorted(needed),
+        filter=pushdown_expression(filters, schema, since, until),
+    )
+    result = apply_contains(result, filters, schema)
+
+    if not (group_by or aggregates):
+        result = result.sort_by([("timestamp", "ascending")]).select(columns)
+        return result.slice(0, limit) if limit else result
+
+    for column in group_by:
+        if pa.types.is_list(schema.field(column).type):
+            result = explode(result, column)
+
+    specs = [
+        (
+            ([], "count_all")
+            if function == "count" and not column
+            else (column, function)
+        )
+        for function, column in aggregates or [("count", None)]
+    ]
+    grouped = result.group_by(list(group_by)).aggregate(specs)
+    if group_by:
+        grouped = grouped.sort_by([(c, "ascending") for c in group_by])
+    return grouped.slice(0, limit) if limit else grouped
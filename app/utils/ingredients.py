@@ -0,0 +1,161 @@
+import re
+from functools import lru_cache
+from typing import NamedTuple, Optional
+
+MEASURE_WORDS = [
+    "tsp",
+    "tbsp",
+    "teaspoon",
+    "tablespoon",
+    "cup",
+    "cups",
+    "oz",
+    "ounce",
+    "ounces",
+    "pint",
+    "quart",
+    "gallon",
+    "ml",
+    "liter",
+    "liters",
+    "grams",
+    "g",
+    "kg",
+    "pound",
+    "lb",
+    "lbs",
+    "dash",
+    "pinch",
+    "can",
+    "cans",
+    "package",
+    "packages",
+]
+
+PREP_METHODS = [
+    "minced",
+    "chopped",
+    "diced",
+    "sliced",
+    "crushed",
+    "grated",
+    "peeled",
+    "halved",
+    "shredded",
+    "zested",
+    "mashed",
+    "beaten",
+    "whisked",
+    "blended",
+    "rinsed",
+    "drained",
+    "to",
+    "taste",
+    "and",
+]
+
+STOPWORDS = set(MEASURE_WORDS + PREP_METHODS)
+
+CACHE_SIZE = 2**16
+
+# Unicode vulgar fractions rewritten as ascii so one pattern handles both
+UNICODE_FRACTIONS = {
+    "¼": "1/4",
+    "½": "1/2",
+    "¾": "3/4",
+    "⅐": "1/7",
+    "⅑": "1/9",
+    "⅒": "1/10",
+    "⅓": "1/3",
+    "⅔": "2/3",
+    "⅕": "1/5",
+    "⅖": "2/5",
+    "⅗": "3/5",
+    "⅘": "4/5",
+    "⅙": "1/6",
+    "⅚": "5/6",
+    "⅛": "1/8",
+    "⅜": "3/8",
+    "⅝": "5/8",
+    "⅞": "7/8",
+}
+_FRACTION_TABLE = str.maketrans(
+    {char: f" {ascii} " for char, ascii in UNICODE_FRACTIONS.items()}
+    | {"⁄": "/"}
+)
+
+_AMOUNT = r"(?:\d+\s+\d+\s*/\s*\d+|\d+\s*/\s*\d+|\d+(?:\.\d+)?)"
+QUANTITY_PATTERN = re.compile(
+    rf"^(?P<low>{_AMOUNT})(?:\s*(?:-|–|to)\s*(?P<high>{_AMOUNT}))?\s*"
+)
+UNIT_PATTERN = re.compile(
+    r"^(?P<unit>(?:"
+    + "|".join(
+        re.escape(word) for word in sorted(MEASURE_WORDS, key=len)[::-1]
+    )
+    + r")(?:e?s)?)\b\.?\s*"
+)
+SPACED_FRACTION_PATTERN = re.compile(r"(\d)\s*/\s*(\d)")
+PAREN_PATTERN = re.compile(r"^\([^)]*\)\s*")
+NON_ALPHA_PATTERN = re.compile(r"[^a-zA-Z\s]")
+
+
+class Ingredient(NamedTuple):
+    quantity: Optional[float]
+    unit: Optional[str]
+    name: str
+    # Upper bound of a range like "2-3 cloves"; quantity is the lower one
+    quantity_max: Optional[float] = None
+
+
+def parse_amount(text):
+    # "1 1/2" -> 1.5, "3/4" -> 0.75, "2.5" -> 2.5
+    total = 0.0
+    for part in text.split():
+        if "/" in part:
+            num, den = part.split("/")
+            total += float(num) / float(den) if float(den) else 0.0
+        else:
+            total += float(part)
+    return total
+
+
+def clean_name(text):
+    # Remove punctuation and digits, then drop measures and prep words
+    tokens = NON_ALPHA_PATTERN.sub("", text).split()
+    return " ".join(word for word in tokens if word not in STOPWORDS)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def parse_ingredient(line: str) -> Ingredient:
+    """
+    Split an ingredient line into quantity, unit and normalized name.
+    Results are memoized since the same lines repeat across recipes.
+    """
+    text = line.translate(_FRACTION_TABLE).lower().strip("- ").strip()
+    text = SPACED_FRACTION_PATTERN.sub(r"\1/\2", text)
+
+    quantity = quantity_max = None
+    match = QUANTITY_PATTERN.match(text)
+    if match:
+        quantity = parse_amount(match.group("low"))
+        if match.group("high"):
+            quantity_max = parse_amount(match.group("high"))
+        end = match.end()
+        text = text[end:]
+
+    unit = None
+    match = UNIT_PATTERN.match(text)
+    if match:
+        unit = match.group("unit")
+        end = match.end()
+        text = text[end:]
+
+    # Package sizes like "(15 oz)" describe the unit, not the ingredient
+    text = PAREN_PATTERN.sub("", text)
+
+    return Ingredient(quantity, unit, clean_name(text), quantity_max)
+
+
+def extract_ingredient_name(line):
+    return parse_ingredient(line).name
@@ -1,25 +1,28 @@
 from pathlib import Path
 from datetime import datetime
+import json
 import re
-from config import LOGS_DIR
+from config import EXPORTS_DIR, LOGS_DIR, LOG_BUNDLE
+from app.utils.writer import WRITER
+
+BUNDLE_FILENAME = "recipes.jsonl"
 
 
 def sanitize_filename(title):
     return re.sub(r"[^\w\-]", "_", title.lower())
 
 
-def save_recipe_log(recipe: dict, log_dir: Path = LOGS_DIR):
-    generated = recipe.get("recipe", {})
-    timestamp = datetime.now()
-
-    year = timestamp.strftime("%Y")
-    month = timestamp.strftime("%m")
-    day = timestamp.strftime("%d")
-    time_str = timestamp.strftime("%H-%M-%S%f")[:-3]
+def day_log_dir(log_dir: Path = LOGS_DIR, timestamp=None):
+    timestamp = timestamp or datetime.now()
+    return (
+        log_dir
+        / timestamp.strftime("%Y")
+        / timestamp.strftime("%m")
+        / timestamp.strftime("%d")
+    )
 
-    log_dir = LOGS_DIR / year / month / day
-    log_dir.mkdir(parents=True, exist_ok=True)
 
+def recipe_title(generated):
     title = "untitled"
     if isinstance(generated, dict):
         title = generated.get("title", "untitled")
@@ -28,26 +31,138 @@ def save_recipe_log(recipe: dict, log_dir: Path = LOGS_DIR):
         match = re.search(r"\*\*Title:\*\*\s*(.*)", generated)
         if match:
             title = match.group(1).strip()
+    return title
+
+
+def log_filename(recipe: dict, timestamp):
+    time_str = timestamp.strftime("%H-%M-%S%f")[:-3]
+    title = recipe_title(recipe.get("recipe", {}))
+    return f"{time_str}_{sanitize_filename(title)}.md"
 
-    filename = f"{time_str}_{sanitize_filename(title)}.md"
-    filepath = log_dir / filename
-
-    with open(filepath, "w") as f:
-        if isinstance(generated, str):
-            f.write(generated)
-        elif isinstance(generated, dict):
-            f.write(f"# {title}\n\n")
-            # optionally include ingredients and steps from the dict here
-
-        if "scores" in recipe:
-            f.write(
-                "\n\n---\n\n**RScore:** {:.2f}\n".format(
-                    recipe["scores"].get("RScore", 0.0)
-                )
+
+def render_recipe_markdown(recipe: dict):
+    generated = recipe.get("recipe", {})
+    lines = []
+    if isinstance(generated, str):
+        lines.append(generated)
+    elif isinstance(generated, dict):
+        lines.append(f"# {recipe_title(generated)}\n\n")
+        # optionally include ingredients and steps from the dict here
+
+    if "scores" in recipe:
+        lines.append(
+            "\n\n---\n\n**RScore:** {:.2f}{}\n".format(
+                recipe["scores"].get("RScore", 0.0),
+                " (lower bound)" if recipe["scores"].get("skipped") else "",
             )
-            for key, val in recipe["scores"].items():
-                if key != "RScore":
-                    emoji = "✅" if val > 0.6 else "❌"
-                    f.write(f"- {key.capitalize()}: {emoji} ({val:.2f})\n")
+        )
+        for key, val in recipe["scores"].items():
+            if key == "skipped":
+                lines.append(f"- Skipped: {', '.join(val)}\n")
+            elif key != "RScore":
+                emoji = "✅" if val > 0.6 else "❌"
+                lines.append(f"- {key.capitalize()}: {emoji} ({val:.2f})\n")
+
+    return "".join(lines)
+
+
+def save_recipe_log(recipe: dict, log_dir: Path = LOGS_DIR):
+    timestamp = datetime.now()
+    log_dir = day_log_dir(log_dir, timestamp)
+    log_dir.mkdir(parents=True, exist_ok=True)
+
+    filepath = log_dir / log_filename(recipe, timestamp)
+
+    # Queued on the shared writer and renamed into place on its next
+    # flush, so a concurrent reader never sees half a recipe
+    WRITER.write(filepath, render_recipe_markdown(recipe))
 
     return filepath
+
+
+class LogSession:
+    """
+    Logging for a batch of recipes.
+
+    The day's directory is created once when the session opens, and
+    reviews and recipes (markdown files included) are queued on the
+    shared writer and flushed together. With `bundle=True` recipes are
+    packed into one recipes.jsonl per day instead of one markdown file
+    each; use `export_bundle` to render the markdown later.
+    """
+
+    def __init__(self, log_dir: Path = LOGS_DIR, bundle=LOG_BUNDLE):
+        self.log_dir = day_log_dir(log_dir)
+        self.bundle = bundle
+        self.writer = WRITER
+
+    def __enter__(self):
+        self.log_dir.mkdir(parents=True, exist_ok=True)
+        return self
+
+    def __exit__(self, *exc):
+        self.writer.flush()
+
+    @property
+    def reviews_path(self):
+        return self.log_dir / "reviews.jsonl"
+
+    @property
+    def bundle_path(self):
+        return self.log_dir / BUNDLE_FILENAME
+
+    def log_review(self, entry: dict):
+        self.writer.append(self.reviews_path, json.dumps(entry) + "\n")
+
+    def log_recipe(self, recipe: dict):
+        timestamp = datetime.now()
+        filename = log_filename(recipe, timestamp)
+        if not self.bundle:
+            filepath = self.log_dir / filename
+            self.writer.write(filepath, render_recipe_markdown(recipe))
+            return filepath
+
+        record = {
+            "timestamp": timestamp.isoformat(),
+            "filename": filename,
+            "input": recipe.get("input", {}),
+            "recipe": recipe.get("recipe", ""),
+            "scores": recipe.get("scores", {}),
+        }
+        self.writer.append(self.bundle_path, json.dumps(record) + "\n")
+        return self.bundle_path
+
+
+def load_bundle(bundle_path: Path):
+    with open(bundle_path, "r") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def export_dir(bundle_path: Path, log_dir: Path = None):
+    """
+    Where a bundle is rendered by default: the same year/month/day layout
+    under exports/, outside the log tree so the archive doesn't pick the
+    markdown up as a second copy of each bundled recipe.
+    """
+    bundle_path = Path(bundle_path).resolve()
+    try:
+        day = bundle_path.parent.relative_to(
+            Path(log_dir or LOGS_DIR).resolve()
+        )
+    except ValueError:
+        day = Path(bundle_path.parent.name)
+    return EXPORTS_DIR / day
+
+
+def export_bundle(bundle_path: Path, out_dir: Path = None):
+    # Render each bundled recipe to the markdown file it would have had
+    bundle_path = Path(bundle_path)
+    out_dir = Path(out_dir or export_dir(bundle_path))
+    out_dir.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for record in load_bundle(bundle_path):
+        filepath = out_dir / record["filename"]
+        WRITER.write(filepath, render_recipe_markdown(record))
+        paths.append(filepath)
+    WRITER.flush()
+    return paths
@@ -1,45 +1,105 @@
 import re
 from typing import Dict
 
+STEP_PATTERN = re.compile(r"^\d+\.")
+
+# Sections that collect several lines and are only complete once the
+# next header (or the end of the stream) arrives
+MULTILINE_SECTIONS = ("description", "ingredients", "steps")
+
 
 def parse_markdown_recipe(markdown: str) -> Dict[str, any]:
     """
     Parse a markdown-formatted recipe into structured data.
     Returns a dictionary with title, description, ingredients, steps, and tags.
     """
-    result = {
-        "title": "",
-        "description": "",
-        "ingredients": [],
-        "steps": [],
-        "tags": {},
-    }
-
-    # Normalize line endings and split by line
-    lines = markdown.strip().splitlines()
-
-    current_section = None
-    for line in lines:
+    parser = RecipeStreamParser()
+    parser.feed(markdown.strip())
+    parser.close()
+    return parser.result
+
+
+class RecipeStreamParser:
+    """
+    Incremental version of parse_markdown_recipe for streamed completions.
+
+    Push chunks of any size with `feed`; each call returns the events that
+    became available, as (name, value) tuples:
+    - ("title", str) as soon as the title line is complete
+    - ("ingredient", str) / ("step", str) for every finished item
+    - ("description", str), ("ingredients", list), ("steps", list) when
+      the section is closed by the next header
+    - ("tags", dict) once the tag line is complete
+    Call `close` at the end of the stream to flush the last section.
+    """
+
+    def __init__(self):
+        self.result = {
+            "title": "",
+            "description": "",
+            "ingredients": [],
+            "steps": [],
+            "tags": {},
+        }
+        self.closed = set()
+        self.chars = 0
+        self._section = None
+        self._buffer = ""
+
+    def feed(self, chunk: str):
+        self.chars += len(chunk)
+        self._buffer += chunk
+        events = []
+        while "\n" in self._buffer:
+            line, self._buffer = self._buffer.split("\n", 1)
+            events.extend(self._parse_line(line))
+        return events
+
+    def close(self):
+        events = []
+        if self._buffer:
+            events.extend(self._parse_line(self._buffer))
+            self._buffer = ""
+        events.extend(self._close_section())
+        return events
+
+    def _close_section(self):
+        section, self._section = self._section, None
+        if section not in MULTILINE_SECTIONS or section in self.closed:
+            return []
+        self.closed.add(section)
+        return [(section, self.result[section])]
+
+    def _open_section(self, section):
+        events = self._close_section()
+        self._section = section
+        return events
+
+    def _parse_line(self, line):
         line = line.strip()
+        result = self.result
 
         # Match sections
         if line.startswith("**Title:**"):
             result["title"] = line.replace("**Title:**", "").strip()
+            self.closed.add("title")
+            return [("title", result["title"])]
 
-        elif line.startswith("**Description:**"):
-            current_section = "description"
+        if line.startswith("**Description:**"):
+            events = self._open_section("description")
             result["description"] = line.replace(
                 "**Description:**", ""
             ).strip()
+            return events
 
-        elif line.startswith("**Ingredients:**"):
-            current_section = "ingredients"
+        if line.startswith("**Ingredients:**"):
+            return self._open_section("ingredients")
 
-        elif line.startswith("**Instructions:**"):
-            current_section = "steps"
+        if line.startswith("**Instructions:**"):
+            return self._open_section("steps")
 
-        elif line.startswith("**Tags:**"):
-            current_section = "tags"
+        if line.startswith("**Tags:**"):
+            events = self._open_section("tags")
             tag_line = line.replace("**Tags:**", "").strip()
             tag_parts = [t.strip() for t in tag_line.split("|")]
             for part in tag_parts:
@@ -48,11 +108,16 @@ def parse_markdown_recipe(markdown: str) -> Dict[str, any]:
                     result["tags"][key.strip()] = [
                         v.strip() for v in value.split(",")
                     ]
+            self.closed.add("tags")
+            return events + [("tags", result["tags"])]
 
-        elif current_section == "ingredients" and line.startswith("-"):
-            result["ingredients"].append(line.lstrip("- ").strip())
+        if self._section == "ingredients" and line.startswith("-"):
+            ingredient = line.lstrip("- ").strip()
+            result["ingredients"].append(ingredient)
+            return [("ingredient", ingredient)]
 
-        elif current_section == "steps" and re.match(r"^\d+\.", line):
+        if self._section == "steps" and STEP_PATTERN.match(line):
             result["steps"].append(line)
+            return [("step", line)]
 
-    return result
+        return []
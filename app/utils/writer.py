@@ -0,0 +1,187 @@
+import atexit
+import os
+import pickle
+import tempfile
+import threading
+from pathlib import Path
+from filelock import FileLock
+from config import FSYNC_BATCH_SIZE, LOCK_TIMEOUT
+
+
+def lock_for(path):
+    # Sidecar lock file so readers never see the lock inside the data file
+    path = Path(path)
+    return FileLock(str(path) + ".lock", timeout=LOCK_TIMEOUT)
+
+
+def write_atomic(path, data):
+    """
+    Replace `path` with `data` (str or bytes) in one step.
+    The temp file lives in the same directory so os.replace stays atomic.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    mode = "wb" if isinstance(data, bytes) else "w"
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, mode) as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+    return path
+
+
+class LogWriter:
+    """
+    Buffered writer shared by everything that appends to the logs.
+
+    Appends and pickle updates are queued in memory and written under a
+    per-file lock, so several evaluators can share the same
+    generations_log.csv, reviews.jsonl and embedding cache without
+    interleaving or losing records. Files are fsynced once per batch of
+    `batch_size` records instead of once per record.
+
+    Small whole files (one markdown log per recipe) are queued with
+    `write` and land together on flush, each fsynced and renamed into
+    place so neither a reader nor a crash leaves half a file; their
+    directories are fsynced once per flush rather than once per file.
+    """
+
+    def __init__(self, batch_size=FSYNC_BATCH_SIZE):
+        self.batch_size = batch_size
+        self._appends = {}
+        self._merges = {}
+        self._files = {}
+        self._unsynced = set()
+        self._unsynced_dirs = set()
+        self._count = 0
+        self._mutex = threading.RLock()
+
+    def append(self, path, text, header=None):
+        # header is written only if the file is empty when we hold the lock
+        path = Path(path)
+        with self._mutex:
+            _, chunks = self._appends.setdefault(path, (header, []))
+            chunks.append(text)
+            self._count += 1
+            full = self._count >= self.batch_size
+        if full:
+            self.flush()
+
+    def merge(self, path, updates):
+        # Queue dict entries to be merged into a pickled dict on disk
+        path = Path(path)
+        with self._mutex:
+            self._merges.setdefault(path, {}).update(updates)
+            self._count += len(updates)
+            full = self._count >= self.batch_size
+        if full:
+            self.flush()
+
+    def write(self, path, text):
+        # Queue a new file (or a full replacement) to be written on flush
+        path = Path(path)
+        with self._mutex:
+            self._files[path] = text
+            self._count += 1
+            full = self._count >= self.batch_size
+        if full:
+            self.flush()
+
+    def pending(self, path):
+        with self._mutex:
+            _, chunks = self._appends.get(Path(path), (None, []))
+            return list(chunks)
+
+    def flush(self, path=None, sync=True):
+        """
+        Write queued records to disk. With `path`, only that file is
+        written; with `sync=False` the fsync is deferred to the next
+        full flush so readers can see the data without paying for it.
+        """
+        with self._mutex:
+            if path is None:
+                appends, self._appends = self._appends, {}
+                merges, self._merges = self._merges, {}
+                files, self._files = self._files, {}
+                self._count = 0
+            else:
+                path = Path(path)
+                appends, merges, files = {}, {}, {}
+                if path in self._appends:
+                    appends[path] = self._appends.pop(path)
+                if path in self._merges:
+                    merges[path] = self._merges.pop(path)
+                if path in self._files:
+                    files[path] = self._files.pop(path)
+                self._count = (
+                    sum(len(c) for _, c in self._appends.values())
+                    + sum(len(m) for m in self._merges.values())
+                    + len(self._files)
+                )
+
+            for target, (header, chunks) in appends.items():
+                self._write_appends(target, header, chunks)
+                self._unsynced.add(target)
+
+            for target, updates in merges.items():
+                self._write_merge(target, updates)
+
+            for target, text in files.items():
+                write_atomic(target, text)
+                self._unsynced_dirs.add(target.parent)
+
+            if sync:
+                self.sync()
+
+    def sync(self):
+        with self._mutex:
+            for target in self._unsynced:
+                if target.exists():
+                    with open(target, "a") as f:
+                        os.fsync(f.fileno())
+            self._unsynced.clear()
+            for directory in self._unsynced_dirs:
+                fd = os.open(directory, os.O_RDONLY)
+                try:
+                    os.fsync(fd)
+                finally:
+                    os.close(fd)
+            self._unsynced_dirs.clear()
+
+    def _write_appends(self, path, header, chunks):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with lock_for(path):
+            with open(path, "a", newline="") as f:
+                if header and f.tell() == 0:
+                    f.write(header)
+                f.write("".join(chunks))
+
+    def _write_merge(self, path, updates):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with lock_for(path):
+            current = {}
+            if path.exists():
+                with open(path, "rb") as f:
+                    current = pickle.load(f)
+            current.update(updates)
+            write_atomic(path, pickle.dumps(current))
+
+
+def append_locked(path, text):
+    # One-off append for interactive tools that can't wait for a batch
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with lock_for(path):
+        with open(path, "a") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+
+
+WRITER = LogWriter()
+atexit.register(WRITER.flush)
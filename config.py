@@ -20,11 +20,59 @@ SCORED_RECIPES_FILE = DATA_DIR / "scored_recipes.json"
 METRICS_CONFIG_FILE = APP_DIR / "evaluation" / "metrics_config.yaml"
 TEMPLATE_PROMPT_FILE = PROMPTS_DIR / "base_prompt_template.txt"
 GENERATIONS_LOG_FILE = LOGS_DIR / "generations_log.csv"
+SWEEP_RECIPES_FILE = DATA_DIR / "sweep_recipes.jsonl"
+TOKEN_USAGE_FILE = LOGS_DIR / "token_usage.jsonl"
+EMBEDDING_CACHE_FILE = LOGS_DIR / "embeddings_cache.pkl"
+DESCRIPTOR_EMBEDDINGS_FILE = LOGS_DIR / "descriptor_embeddings.pkl"
+RATING_MODEL_FILE = DATA_DIR / "rating_model.npz"
+ARCHIVE_DIR = LOGS_DIR / "archive"
+EXPORTS_DIR = ROOT_DIR / "exports"  # markdown rendered from bundles
+RECIPE_CORPUS_FILE = APP_DIR / "training" / "data" / "abed_recipes.jsonl"
+RECIPE_INDEX_DIR = DATA_DIR / "recipe_index"
 
 # LLM configuration
 DEFAULT_MODEL = "gpt-3.5-turbo"  # gpt-3.5-turbo, gpt-4 are the best to use.
 TEMPERATURE = 1.0  # 0.0 = deterministic, 1.0 = more random
 MAX_TOKENS = 800
+STREAM = False  # stream completions and start scoring as sections arrive
+EARLY_ABORT = True  # with STREAM, cancel completions that break constraints
+STREAM_RETRY_BUDGET = 2  # resubmissions allowed after an early abort
+TITLE_DEADLINE_CHARS = 200  # abort if no **Title:** line by this point
+BEST_OF_N = 1  # >1 samples N recipes per request and keeps the top RScore
+# DEFAULT_MODEL may also be "local:<checkpoint>" (see finetune_model.py);
+# local runs honour BEST_OF_N but not STREAM
+CONTEXT_WINDOW = 16385  # prompt + completion token limit of DEFAULT_MODEL
+FEW_SHOT_EXAMPLES = 0  # corpus recipes retrieved into each prompt (index.py)
+
+# Per-request max_tokens sized from past completion lengths per ABED profile
+TOKEN_BUDGET = False
+BUDGET_PERCENTILE = 95  # completion length percentile to budget for
+BUDGET_MARGIN = 0.1  # headroom added on top of the percentile
+BUDGET_MIN_SAMPLES = 20  # completions needed before a profile is trusted
+BUDGET_FLOOR = 256  # never budget fewer tokens than this
+BUDGET_HISTORY = 500  # most recent completions kept per profile
+
+# Model cascade: cheapest tier first, escalating while RScore is too low.
+# "local:<path>" uses a fine-tuned checkpoint (local:models/chez-abed-gpt2)
+CASCADE = False
+CASCADE_TIERS = ["gpt-3.5-turbo", "gpt-4"]
+CASCADE_THRESHOLD = 0.75
+
+# Embedding model used for novelty and ABED alignment scoring
+EMBEDDING_MODEL_NAME = "all-MiniLM-L6-v2"
+EMBEDDING_BACKEND = "torch"  # torch, onnx or onnx-int8 (quantized)
+EMBEDDING_THREADS = None  # intra-op CPU threads, None for runtime default
+EMBEDDING_COSINE_TOLERANCE = 0.99  # min cosine to torch vectors for onnx
+ABED_ALIGNMENT = "embedding"  # embedding, or keyword for substring matches
+
+# Learned rating predictor (fit_ratings.py)
+RATING_RIDGE = 1.0  # L2 penalty on the regression weights
+RATING_HOLDOUT = 0.2  # share of ratings kept out of training for the report
+
+# Log writer options
+FSYNC_BATCH_SIZE = 32  # records written between fsyncs
+LOCK_TIMEOUT = 60  # seconds to wait on another process' file lock
+LOG_BUNDLE = False  # True packs each day's recipe logs into recipes.jsonl
 
 # App options
 DEBUG = False
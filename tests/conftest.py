@@ -0,0 +1,91 @@
+import hashlib
+import importlib
+import numpy as np
+import pytest
+import torch
+
+SAMPLE_RECIPE = """**Title:** Tangy Crispy Chickpea Bites
+
+**Description:** Crunchy roasted chickpeas tossed in lime and chili.
+
+**Ingredients:**
+- 1 can chickpeas, drained and patted dry
+- 1 tablespoon olive oil
+- 1 teaspoon chili powder
+- 1 lime, zested and juiced
+
+**Instructions:**
+1. Preheat the oven to 425°F.
+2. Toss the chickpeas with the olive oil and chili powder.
+3. Bake until golden and crisp, about 30 minutes.
+4. Toss with the lime zest and juice while still warm, then serve.
+
+**Tags:** flavor=Tangy | texture=Crispy | type=Snack
+"""
+
+
+class HashEncoder:
+    """
+    Deterministic bag-of-words stand-in for the sentence embedding model,
+    so scoring can be tested without downloading it. Counts encoded texts.
+    """
+
+    dim = 64
+
+    def __init__(self):
+        self.encoded = 0
+
+    def vector(self, text):
+        v = np.zeros(self.dim, dtype=np.float32)
+        for word in text.lower().replace(",", " ").replace(":", " ").split():
+            digest = hashlib.blake2b(word.encode(), digest_size=4).digest()
+            v[int.from_bytes(digest, "big") % self.dim] += 1
+        norm = np.linalg.norm(v)
+        return v / norm if norm else v
+
+    def encode(
+        self, texts, convert_to_tensor=True, normalize_embeddings=False
+    ):
+        single = isinstance(texts, str)
+        texts = [texts] if single else list(texts)
+        self.encoded += len(texts)
+        out = torch.tensor(np.array([self.vector(t) for t in texts]))
+        return out[0] if single else out
+
+
+@pytest.fixture
+def encoder():
+    return HashEncoder()
+
+
+@pytest.fixture
+def scoring(tmp_path, monkeypatch, encoder):
+    """
+    app.evaluation.scoring running on HashEncoder, with its caches and
+    logs redirected to a temporary directory.
+    """
+    import app.evaluation.embeddings as embeddings
+
+    monkeypatch.setattr(
+        embeddings, "load_embedding_model", lambda *a, **k: encoder
+    )
+    module = importlib.import_module("app.evaluation.scoring")
+    from app.utils.writer import WRITER
+
+    WRITER.flush()
+    monkeypatch.setattr(module, "EMBEDDING_MODEL", encoder)
+    monkeypatch.setattr(module, "EMBEDDING_CACHE", {})
+    monkeypatch.setattr(module, "EMBEDDING_CACHE_PATH", tmp_path / "e.pkl")
+    monkeypatch.setattr(
+        module, "GENERATIONS_LOG_FILE", tmp_path / "generations_log.csv"
+    )
+    module.descriptor_embeddings.cache_clear()
+    monkeypatch.setattr(
+        module,
+        "descriptor_embeddings",
+        lambda: module.DescriptorEmbeddings.load(
+            encoder, path=tmp_path / "descriptors.pkl"
+        ),
+    )
+    yield module
+    WRITER.flush()
@@ -0,0 +1,62 @@
+import json
+from conftest import SAMPLE_RECIPE
+from app.utils import archive
+from app.utils.logging import LogSession, export_bundle
+
+SCORES = {"RScore": 0.62, "cues": 0.9, "skipped": ["novelty"]}
+
+
+def log_day(log_dir, bundle, count):
+    with LogSession(log_dir, bundle=bundle) as session:
+        for i in range(count):
+            recipe = SAMPLE_RECIPE.replace("Bites", f"Bites {i}")
+            session.log_recipe({"recipe": recipe, "scores": SCORES})
+            session.log_review(
+                {
+                    "timestamp": "2025-01-02T10:00:00",
+                    "title": f"Bites {i}",
+                    "abed_input": {"type": "Snack", "flavor": ["Tangy"]},
+                    "RScore": 0.62,
+                    "scores": {"cues": 0.9},
+                }
+            )
+    return session
+
+
+def test_compaction_counts_each_recipe_once(tmp_path):
+    log_dir, archive_dir = tmp_path / "logs", tmp_path / "archive"
+    session = log_day(log_dir, bundle=True, count=2)
+    log_day(log_dir, bundle=False, count=1)
+    # Rendered next to the bundle instead of under exports/
+    export_bundle(session.bundle_path, session.log_dir)
+
+    days, written = archive.compact(log_dir, archive_dir)
+    assert days == 1
+    assert written == {"reviews": 3, "ratings": 0, "recipes": 3}
+
+    rows = archive.query(
+        "recipes", columns=["title", "RScore"], archive_dir=archive_dir
+    ).to_pylist()
+    assert sorted(r["title"] for r in rows) == [
+        f"Tangy Crispy Chickpea Bites {i}" for i in [0, 0, 1]
+    ]
+    assert {r["RScore"] for r in rows} == {0.62}
+
+
+def test_unchanged_days_are_not_rewritten(tmp_path):
+    log_dir, archive_dir = tmp_path / "logs", tmp_path / "archive"
+    session = log_day(log_dir, bundle=True, count=1)
+    assert archive.compact(log_dir, archive_dir)[0] == 1
+    assert archive.compact(log_dir, archive_dir)[0] == 0
+
+    with open(session.log_dir / "ratings.jsonl", "w") as f:
+        f.write(json.dumps({"title": "Bites 0", "human_rating": 0.75}) + "\n")
+    days, written = archive.compact(log_dir, archive_dir)
+    assert days == 1 and written["ratings"] == 1
+
+    counts = archive.query(
+        "ratings",
+        aggregates=[("mean", "human_rating")],
+        archive_dir=archive_dir,
+    ).to_pylist()
+    assert counts == [{"human_rating_mean": 0.75}]
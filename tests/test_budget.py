@@ -0,0 +1,99 @@
+import math
+import pytest
+import app.generation.budget as budget_module
+from app.generation.budget import TokenBudget, percentile
+from app.utils.writer import WRITER
+import app.scripts.generate as generate
+
+SNACK = {"type": "Snack", "technique_level": "Easy", "total_served": 2}
+DINNER = {"type": "Dinner", "technique_level": "Hard", "total_served": 6}
+
+
+class WordEncoding:
+    # One token per word, standing in for tiktoken's downloaded tables
+    def encode(self, text):
+        return text.split()
+
+
+@pytest.fixture
+def budget(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        budget_module.tiktoken,
+        "encoding_for_model",
+        lambda model: WordEncoding(),
+    )
+    yield lambda: TokenBudget(path=tmp_path / "token_usage.jsonl")
+    WRITER.flush()
+
+
+def record(budget, entry, lengths, reason="stop"):
+    for length in lengths:
+        usage = {"completion_tokens": length, "finish_reasons": [reason]}
+        budget.record(entry, usage, budget_module.MAX_TOKENS)
+
+
+MESSAGES = [{"role": "user", "content": "a short prompt"}]
+
+
+def test_nearest_rank_percentile():
+    assert percentile(range(1, 101), 95) == 95
+    assert percentile([3, 1, 2], 50) == 2
+    assert percentile([7], 95) == 7
+
+
+def test_profile_budget_is_its_percentile_plus_margin(budget):
+    budget = budget()
+    record(budget, SNACK, range(400, 420))
+    expected = math.ceil(
+        percentile(range(400, 420), budget_module.BUDGET_PERCENTILE)
+        * (1 + budget_module.BUDGET_MARGIN)
+    )
+    assert budget.max_tokens(SNACK, MESSAGES) == expected
+    # A profile without enough samples borrows everyone's
+    assert budget.max_tokens(DINNER, MESSAGES) == expected
+
+
+def test_too_few_samples_fall_back_to_max_tokens(budget):
+    budget = budget()
+    record(budget, SNACK, [300] * (budget_module.BUDGET_MIN_SAMPLES - 1))
+    assert budget.max_tokens(SNACK, MESSAGES) == budget_module.MAX_TOKENS
+
+
+def test_budget_leaves_room_for_the_prompt(budget, monkeypatch):
+    monkeypatch.setattr(budget_module, "CONTEXT_WINDOW", 500)
+    budget = budget()
+    prompt = [{"role": "user", "content": "word " * 400}]
+    prompt_tokens = budget.count_prompt_tokens(prompt)
+    assert prompt_tokens > 400
+    assert budget.max_tokens(SNACK, prompt) == 500 - prompt_tokens
+
+
+def test_truncated_completions_count_as_max_tokens(budget):
+    first = budget()
+    record(first, SNACK, [300] * 19)
+    record(first, SNACK, [350], reason="length")
+    assert first.truncation_rate() == pytest.approx(1 / 20)
+    assert (
+        budget_module.MAX_TOKENS
+        in first.lengths[budget_module.profile_key(SNACK)]
+    )
+
+    # And are remembered that way after a restart
+    WRITER.flush()
+    again = budget()
+    assert again.max_tokens(SNACK, MESSAGES) == first.max_tokens(
+        SNACK, MESSAGES
+    )
+
+
+def test_cascade_generations_are_not_budgeted(budget):
+    class Router:
+        def generate(self, entry, filled_prompt):
+            return "**Title:** Bites", {}, "small"
+
+    budget = budget()
+    record_ = generate.generate_entry(
+        None, "{descriptors}", SNACK, Router(), budget=budget
+    )
+    assert "max_tokens" not in record_ and record_["model"] == "small"
+    assert budget.requests == 0
@@ -0,0 +1,74 @@
+import pytest
+from app.evaluation.constraints import (
+    ConstraintChecker,
+    ConstraintViolation,
+    find_diet_violation,
+    find_implausible_phrase,
+)
+from app.utils.parser import RecipeStreamParser
+
+
+@pytest.mark.parametrize(
+    "ingredient, restriction",
+    [
+        ("2 cups gluten-free flour", "gluten-free"),
+        ("2 cups gluten-free all-purpose flour", "gluten-free"),
+        ("1 cup almond flour", "gluten-free"),
+        ("3 tablespoons vegan butter", "vegan"),
+        ("1 cup dairy-free cheese, shredded", "dairy-free"),
+        ("1 cup dairy-free cheese, shredded", "vegan"),
+        ("4 slices vegetarian bacon", "vegetarian"),
+        ("2 plant-based sausages", "vegetarian"),
+        ("1 cup coconut milk", "vegan"),
+        ("1/2 teaspoon nutmeg", "nut-free"),
+    ],
+)
+def test_compliant_ingredients_pass(ingredient, restriction):
+    assert find_diet_violation(ingredient, [restriction]) is None
+
+
+@pytest.mark.parametrize(
+    "ingredient, restriction, word",
+    [
+        ("1 lb bacon", "vegetarian", "bacon"),
+        ("2 eggs", "vegan", "eggs"),
+        ("2 cups flour", "gluten-free", "flour"),
+        ("2 tablespoons butter", "dairy-free", "butter"),
+        ("3 tablespoons vegan butter and 2 eggs", "vegan", "eggs"),
+        ("1 cup gluten-free oats or wheat flour", "gluten-free", "wheat"),
+    ],
+)
+def test_violations_are_flagged(ingredient, restriction, word):
+    assert find_diet_violation(ingredient, [restriction]) == (
+        restriction,
+        word,
+    )
+
+
+def test_implausible_phrase():
+    assert find_implausible_phrase("Boil lettuce for 5 minutes") == (
+        "boil lettuce"
+    )
+    assert find_implausible_phrase("Toss the lettuce") is None
+
+
+def test_checker_lets_compliant_recipe_stream_through():
+    checker = ConstraintChecker({"dietary_restrictions": ["Vegan"]})
+    parser = RecipeStreamParser()
+    for line in [
+        "**Title:** Vegan Pancakes\n",
+        "**Ingredients:**\n",
+        "- 1 cup gluten-free flour\n",
+        "- 2 tablespoons vegan butter\n",
+        "- 1 cup oat milk\n",
+    ]:
+        parser.feed(line)
+        checker(parser)
+
+
+def test_checker_aborts_on_violation():
+    checker = ConstraintChecker({"dietary_restrictions": "Vegan"})
+    parser = RecipeStreamParser()
+    parser.feed("**Title:** Pancakes\n**Ingredients:**\n- 2 eggs\n")
+    with pytest.raises(ConstraintViolation, match="eggs"):
+        checker(parser)
@@ -0,0 +1,121 @@
+import json
+import random
+import numpy as np
+from app.training.dedup import (
+    BANDS,
+    ROWS,
+    THRESHOLD,
+    LSHIndex,
+    dedup,
+    minhash,
+    shingles,
+)
+
+WORDS = [
+    "stir",
+    "bake",
+    "chop",
+    "whisk",
+    "fold",
+    "simmer",
+    "roast",
+    "toss",
+    "golden",
+    "onions",
+    "garlic",
+    "butter",
+    "flour",
+    "until",
+    "tender",
+    "pan",
+    "oven",
+    "bowl",
+    "minutes",
+    "heat",
+    "season",
+    "serve",
+    "cool",
+]
+FOODS = [
+    "chickpeas",
+    "lemon",
+    "rice",
+    "tofu",
+    "basil",
+    "carrots",
+    "beef",
+    "honey",
+    "oats",
+    "cream",
+    "tomatoes",
+    "spinach",
+    "lentils",
+    "pork",
+]
+
+
+def recipe(rng):
+    steps = [" ".join(rng.choices(WORDS, k=12)) + "." for _ in range(4)]
+    ingredients = [f"1 cup {food}" for food in rng.sample(FOODS, 5)]
+    return {
+        "output": {"title": "x", "ingredients": ingredients, "steps": steps}
+    }
+
+
+def rescrape(item):
+    # The same recipe from another site: other quantities and punctuation
+    output = item["output"]
+    return {
+        "output": {
+            "title": output["title"].upper(),
+            "ingredients": [
+                line.replace("1 cup", "2 tbsp")
+                for line in output["ingredients"]
+            ],
+            "steps": [step.rstrip(".") + "!" for step in output["steps"]],
+        }
+    }
+
+
+def test_shingles_ignore_quantities_and_punctuation():
+    item = recipe(random.Random(0))
+    assert shingles(item) == shingles(rescrape(item))
+
+
+def test_minhash_agreement_estimates_jaccard():
+    a = {f"f{i}" for i in range(200)}
+    b = {f"f{i}" for i in range(100, 300)}  # Jaccard 1/3
+    agreement = np.mean(minhash(a) == minhash(b))
+    assert abs(agreement - 1 / 3) < 0.15
+    assert np.array_equal(minhash(a), minhash(set(a)))
+    assert minhash(set()) is None
+
+
+def test_lsh_index_rejects_near_duplicates_only():
+    rng = random.Random(1)
+    items = [recipe(rng) for _ in range(50)]
+    index = LSHIndex()
+    assert all(index.insert_unique(minhash(shingles(i))) for i in items)
+    assert not any(
+        index.insert_unique(minhash(shingles(rescrape(i)))) for i in items
+    )
+
+
+def test_dedup_keeps_the_first_copy_in_order(tmp_path):
+    rng = random.Random(2)
+    items = [recipe(rng) for _ in range(30)]
+    for i, item in enumerate(items):
+        item["output"]["title"] = f"recipe {i}"
+    corpus = items + [rescrape(item) for item in items[::3]]
+    source, target = tmp_path / "in.jsonl", tmp_path / "out.jsonl"
+    source.write_text("".join(json.dumps(r) + "\n" for r in corpus) + "\n")
+
+    assert dedup(source, target, workers=2, batch=7) == (30, 10)
+    kept = [json.loads(line) for line in target.read_text().splitlines()]
+    assert kept == items
+
+
+def test_bands_catch_pairs_at_the_threshold():
+    # Candidate probability of a pair with Jaccard similarity s
+    recall = 1 - (1 - THRESHOLD**ROWS) ** BANDS
+    assert recall > 0.9
@@ -0,0 +1,53 @@
+import pytest
+from config import EMBEDDING_COSINE_TOLERANCE
+import app.evaluation.alignment as alignment
+from app.evaluation.embeddings import ONNX_FILES, load_embedding_model
+
+TEXTS = [
+    "tangy crispy chickpea bites. Ingredients: chickpeas, olive oil, lime",
+    "creamy tomato soup. Ingredients: tomatoes, cream, basil, garlic",
+    "sweet chewy oat cookies. Ingredients: oats, butter, brown sugar",
+]
+
+
+def load_or_skip(backend):
+    try:
+        return load_embedding_model(backend)
+    except Exception as e:  # no onnxruntime, or the model isn't available
+        pytest.skip(f"{backend} embedding model unavailable: {e}")
+
+
+@pytest.mark.parametrize("backend", list(ONNX_FILES))
+def test_onnx_embeddings_match_torch(backend):
+    pytest.importorskip("onnxruntime")
+    onnx = load_or_skip(backend)
+    torch_model = load_or_skip("torch")
+
+    reference = torch_model.encode(
+        TEXTS, convert_to_tensor=True, normalize_embeddings=True
+    )
+    vectors = onnx.encode(
+        TEXTS, convert_to_tensor=True, normalize_embeddings=True
+    )
+    cosine = (reference.cpu() * vectors.cpu()).sum(dim=1)
+    assert cosine.min().item() >= EMBEDDING_COSINE_TOLERANCE
+
+
+def test_embedding_keys_depend_on_the_backend(scoring, monkeypatch):
+    key = scoring.embedding_key(TEXTS[0])
+    monkeypatch.setattr(scoring, "EMBEDDING_BACKEND", "onnx-int8")
+    assert scoring.embedding_key(TEXTS[0]) != key
+
+
+def test_descriptors_are_reencoded_for_another_backend(
+    encoder, tmp_path, monkeypatch
+):
+    path = tmp_path / "descriptors.pkl"
+    alignment.DescriptorEmbeddings.load(encoder, path=path)
+    encoded = encoder.encoded
+    alignment.DescriptorEmbeddings.load(encoder, path=path)
+    assert encoder.encoded == encoded
+
+    monkeypatch.setattr(alignment, "EMBEDDING_BACKEND", "onnx-int8")
+    alignment.DescriptorEmbeddings.load(encoder, path=path)
+    assert encoder.encoded == 2 * encoded
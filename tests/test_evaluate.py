@@ -0,0 +1,97 @@
+import copy
+import pytest
+from conftest import SAMPLE_RECIPE
+from app.evaluation.fingerprint import carried_scores, metric_fingerprints
+
+ENTRY = {"input": {"flavor": ["Tangy"], "type": "Snack"}}
+
+
+class Session:
+    def __init__(self):
+        self.reviews, self.recipes = [], []
+
+    def log_review(self, entry):
+        self.reviews.append(entry)
+
+    def log_recipe(self, item):
+        self.recipes.append(item)
+        return "recipe.md"
+
+
+@pytest.fixture
+def evaluate(scoring, monkeypatch):
+    import app.scripts.evaluate as evaluate
+
+    monkeypatch.setitem(
+        evaluate.METRICS_CONFIG_FILE["acceptance"], "target_rscore", None
+    )
+    return evaluate
+
+
+def test_fingerprints_follow_recipe_and_metric_versions():
+    versions = {"cues": "v1", "novelty": "v1"}
+    entry = {**ENTRY, "recipe": SAMPLE_RECIPE}
+    fingerprints = metric_fingerprints(entry, versions)
+    previous = {
+        "scores": {"cues": 0.5, "novelty": 0.8},
+        "fingerprints": fingerprints,
+    }
+    assert carried_scores(fingerprints, previous) == previous["scores"]
+
+    bumped = metric_fingerprints(entry, {**versions, "novelty": "v2"})
+    assert carried_scores(bumped, previous) == {"cues": 0.5}
+
+    edited = {**entry, "recipe": SAMPLE_RECIPE.replace("lime", "lemon")}
+    assert (
+        carried_scores(metric_fingerprints(edited, versions), previous) == {}
+    )
+
+
+def test_alignment_version_covers_the_embedding(scoring):
+    inputs = scoring.METRIC_INPUTS["abed_alignment"]
+    for part in [
+        scoring.encode_recipe,
+        scoring.novelty_text,
+        scoring.ingredients_module,
+        scoring.EMBEDDING_BACKEND,
+    ]:
+        assert any(part is value for value in inputs)
+
+
+def test_rescoring_leaves_out_the_recipes_own_log_row(evaluate, scoring):
+    session = Session()
+    first = evaluate.evaluate_item({**ENTRY, "recipe": SAMPLE_RECIPE}, session)
+    assert first["scores"]["novelty"] == 1.0
+
+    # Pretend novelty's inputs changed since the first run
+    previous = copy.deepcopy(first)
+    previous["fingerprints"]["novelty"] = "stale"
+    stats = evaluate.new_stats()
+    again = evaluate.evaluate_item(
+        {**ENTRY, "recipe": SAMPLE_RECIPE}, session, previous, stats
+    )
+
+    assert again["scores"]["novelty"] == 1.0
+    assert stats["computed"] == 1
+    assert stats["unchanged"] == 1 and len(session.recipes) == 1
+    scoring.WRITER.flush()
+    rows = scoring.GENERATIONS_LOG_FILE.read_text().splitlines()
+    assert len(rows) == 2  # header and the first run's row only
+
+
+def test_rescoring_after_repeated_full_runs(evaluate, scoring):
+    session = Session()
+    for _ in range(2):
+        first = evaluate.evaluate_item(
+            {**ENTRY, "recipe": SAMPLE_RECIPE}, session
+        )
+    scoring.WRITER.flush()
+    rows = scoring.GENERATIONS_LOG_FILE.read_text().splitlines()
+    assert len(rows) == 3  # header and one row per full run
+
+    previous = copy.deepcopy(first)
+    previous["fingerprints"]["novelty"] = "stale"
+    again = evaluate.evaluate_item(
+        {**ENTRY, "recipe": SAMPLE_RECIPE}, session, previous
+    )
+    assert again["scores"]["novelty"] == 1.0
@@ -0,0 +1,59 @@
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+import app.scripts.generate as generate
+from conftest import SAMPLE_RECIPE
+
+ABORTED_RECIPE = SAMPLE_RECIPE.replace(
+    "- 1 lime, zested and juiced", "- 1 head lettuce"
+).replace("3. Bake until golden", "3. Boil lettuce until golden")
+
+
+def chunk(content=None, finish_reason=None):
+    delta = SimpleNamespace(content=content)
+    choice = SimpleNamespace(delta=delta, finish_reason=finish_reason)
+    return SimpleNamespace(choices=[choice], usage=None)
+
+
+class FakeStream(list):
+    def close(self):
+        pass
+
+
+class FakeClient:
+    # Streams each queued completion in 16-character chunks
+    def __init__(self, completions):
+        self.completions = list(completions)
+        self.chat = SimpleNamespace(completions=self)
+
+    def create(self, **kwargs):
+        text = self.completions.pop(0)
+        starts = range(0, len(text), 16)
+        chunks = [chunk(text[start:][:16]) for start in starts]
+        return FakeStream(chunks + [chunk("", "stop")])
+
+
+def test_aborted_attempt_is_not_primed_into_the_cache(scoring, encoder):
+    client = FakeClient([ABORTED_RECIPE, SAMPLE_RECIPE])
+    with ThreadPoolExecutor(1) as executor:
+        on_event = generate.prime_scoring(executor)
+        recipe, reason = generate.generate_streamed(
+            client, "prompt", {}, on_event
+        )
+    assert recipe == SAMPLE_RECIPE and reason is None
+
+    title = "tangy crispy chickpea bites"
+    parsed = scoring.parse_markdown_recipe(SAMPLE_RECIPE)
+    key, expected = scoring.encode_recipe(title, parsed["ingredients"])
+    assert list(scoring.EMBEDDING_CACHE) == [key]
+    assert scoring.EMBEDDING_CACHE[key].tolist() == expected.tolist()
+
+
+def test_every_attempt_aborted_primes_nothing(scoring):
+    client = FakeClient([ABORTED_RECIPE] * (generate.STREAM_RETRY_BUDGET + 1))
+    with ThreadPoolExecutor(1) as executor:
+        on_event = generate.prime_scoring(executor)
+        recipe, reason = generate.generate_streamed(
+            client, "prompt", {}, on_event
+        )
+    assert recipe == "" and "lettuce" in reason
+    assert scoring.EMBEDDING_CACHE == {}
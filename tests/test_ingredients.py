@@ -0,0 +1,27 @@
+import pytest
+from app.utils.ingredients import extract_ingredient_name, parse_ingredient
+
+
+@pytest.mark.parametrize(
+    "line, quantity, quantity_max, unit, name",
+    [
+        ("2-3 cloves garlic, minced", 2.0, 3.0, None, "cloves garlic"),
+        ("1 to 1 1/2 cups flour", 1.0, 1.5, "cups", "flour"),
+        ("1–2 tablespoons olive oil", 1.0, 2.0, "tablespoons", "olive oil"),
+        ("1 1/2 cups sugar", 1.5, None, "cups", "sugar"),
+        ("½ teaspoon salt", 0.5, None, "teaspoon", "salt"),
+        ("1 can (15 oz) chickpeas", 1.0, None, "can", "chickpeas"),
+        ("Salt, to taste", None, None, None, "salt"),
+    ],
+)
+def test_parse_ingredient(line, quantity, quantity_max, unit, name):
+    parsed = parse_ingredient(line)
+    assert parsed.quantity == quantity
+    assert parsed.quantity_max == quantity_max
+    assert parsed.unit == unit
+    assert parsed.name == name
+
+
+def test_extract_ingredient_name_matches_parse():
+    line = "- 2 tablespoons honey"
+    assert extract_ingredient_name(line) == parse_ingredient(line).name
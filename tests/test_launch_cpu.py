@@ -0,0 +1,25 @@
+import subprocess
+import sys
+import time
+from app.training.launch_cpu import split_cpus, wait_all
+
+
+def rank(code):
+    return subprocess.Popen([sys.executable, "-c", code])
+
+
+def test_a_failed_rank_stops_the_others_without_waiting_in_order():
+    ranks = [rank("import time; time.sleep(60)"), rank("raise SystemExit(3)")]
+    start = time.monotonic()
+    assert wait_all(ranks, interval=0.05) == 3
+    assert time.monotonic() - start < 30
+    assert ranks[0].returncode is not None
+
+
+def test_all_ranks_succeeding_returns_zero():
+    ranks = [rank("pass") for _ in range(3)]
+    assert wait_all(ranks, interval=0.05) == 0
+
+
+def test_cores_are_split_evenly():
+    assert split_cpus(2, list(range(5))) == [[0, 1], [2, 3]]
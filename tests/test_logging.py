@@ -0,0 +1,50 @@
+import json
+from datetime import datetime
+import app.utils.logging as logging_module
+from app.utils.logging import (
+    LogSession,
+    day_log_dir,
+    export_bundle,
+    load_bundle,
+)
+
+RECIPE = {
+    "input": {"type": "Snack"},
+    "recipe": "**Title:** Lime Chips\n\n**Ingredients:**\n- 1 lime\n",
+    "scores": {"RScore": 0.8, "cues": 1.0},
+}
+
+
+def test_markdown_logs_land_when_the_session_closes(tmp_path):
+    with LogSession(tmp_path, bundle=False) as session:
+        path = session.log_recipe(RECIPE)
+        assert not path.exists()
+    assert path.read_text().startswith(RECIPE["recipe"])
+    assert "**RScore:** 0.80" in path.read_text()
+
+
+def test_bundle_packs_recipes_into_one_file(tmp_path):
+    with LogSession(tmp_path, bundle=True) as session:
+        session.log_recipe(RECIPE)
+        path = session.log_recipe(RECIPE)
+    records = load_bundle(path)
+    assert len(records) == 2
+    assert records[0]["scores"] == RECIPE["scores"]
+
+
+def test_export_defaults_outside_the_log_tree(tmp_path, monkeypatch):
+    logs = tmp_path / "logs"
+    exports = tmp_path / "exports"
+    monkeypatch.setattr(logging_module, "LOGS_DIR", logs)
+    monkeypatch.setattr(logging_module, "EXPORTS_DIR", exports)
+
+    with LogSession(logs, bundle=True) as session:
+        bundle = session.log_recipe(RECIPE)
+
+    paths = export_bundle(bundle)
+    day = day_log_dir(exports, datetime.now())
+    assert [path.parent for path in paths] == [day]
+    assert paths[0].read_text().startswith(RECIPE["recipe"])
+    # The day's log directory still holds only the bundle
+    assert [p.name for p in bundle.parent.glob("*.md")] == []
+    assert json.loads(bundle.read_text())["filename"] == paths[0].name
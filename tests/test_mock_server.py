@@ -0,0 +1,68 @@
+import json
+import random
+import time
+import urllib.request
+import pytest
+from app.generation.mock_server import (
+    SAMPLE_RECIPE,
+    MockCompletionServer,
+    parse_latency,
+)
+
+
+@pytest.fixture
+def server():
+    server = MockCompletionServer(
+        [SAMPLE_RECIPE], latency="fixed:0", tokens_per_second=500, seed=0
+    ).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def complete(server, **request):
+    body = json.dumps({"messages": [], **request}).encode()
+    url = f"{server.url}/chat/completions"
+    headers = {"Content-Type": "application/json"}
+    start = time.perf_counter()
+    with urllib.request.urlopen(
+        urllib.request.Request(url, body, headers)
+    ) as response:
+        data = response.read()
+    return data, time.perf_counter() - start
+
+
+def test_plain_completions_take_as_long_as_their_tokens(server):
+    data, elapsed = complete(server)
+    usage = json.loads(data)["usage"]
+    assert elapsed >= usage["completion_tokens"] / 500
+
+    data, short = complete(server, max_tokens=10)
+    assert json.loads(data)["choices"][0]["finish_reason"] == "length"
+    assert short < elapsed
+
+
+def test_streamed_and_plain_completions_carry_the_same_text(server):
+    data, _ = complete(server)
+    plain = json.loads(data)["choices"][0]["message"]["content"]
+
+    data, _ = complete(server, stream=True)
+    chunks = [
+        json.loads(line.removeprefix("data: "))
+        for line in data.decode().splitlines()
+        if line.startswith("data: {")
+    ]
+    streamed = "".join(
+        c["choices"][0]["delta"].get("content", "")
+        for c in chunks
+        if c["choices"]
+    )
+    assert streamed == plain == SAMPLE_RECIPE
+
+
+@pytest.mark.parametrize(
+    "spec", ["fixed:1.5", "uniform:0.5,3", "lognormal:2,0.5"]
+)
+def test_latency_specs(spec):
+    rng = random.Random(0)
+    assert all(0 < parse_latency(spec)(rng) < 60 for _ in range(100))
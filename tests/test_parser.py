@@ -0,0 +1,72 @@
+import random
+import pytest
+from conftest import SAMPLE_RECIPE
+from app.generation.mock_server import SAMPLE_RECIPE as SERVED_RECIPE
+from app.utils.parser import RecipeStreamParser, parse_markdown_recipe
+
+# parse_markdown_recipe(SAMPLE_RECIPE) as returned by the line-by-line
+# parser RecipeStreamParser replaced
+SAMPLE_PARSED = {
+    "title": "Tangy Crispy Chickpea Bites",
+    "description": "Crunchy roasted chickpeas tossed in lime and chili.",
+    "ingredients": [
+        "1 can chickpeas, drained and patted dry",
+        "1 tablespoon olive oil",
+        "1 teaspoon chili powder",
+        "1 lime, zested and juiced",
+    ],
+    "steps": [
+        "1. Preheat the oven to 425°F.",
+        "2. Toss the chickpeas with the olive oil and chili powder.",
+        "3. Bake until golden and crisp, about 30 minutes.",
+        "4. Toss with the lime zest and juice while still warm, then serve.",
+    ],
+    "tags": {"flavor": ["Tangy"], "texture": ["Crispy"], "type": ["Snack"]},
+}
+
+
+def stream(markdown, sizes):
+    parser = RecipeStreamParser()
+    events = []
+    start = 0
+    for size in sizes:
+        events += parser.feed(markdown[start:][:size])
+        start += size
+        if start >= len(markdown):
+            break
+    events += parser.feed(markdown[start:])
+    events += parser.close()
+    return parser, events
+
+
+@pytest.mark.parametrize("markdown", [SAMPLE_RECIPE, SERVED_RECIPE])
+@pytest.mark.parametrize("seed", range(5))
+def test_any_chunking_parses_like_the_whole_text(markdown, seed):
+    rng = random.Random(seed)
+    sizes = [rng.randint(1, 40) for _ in range(len(markdown))]
+    parser, events = stream(markdown, sizes)
+
+    expected = parse_markdown_recipe(markdown)
+    assert parser.result == expected
+    assert [v for k, v in events if k == "ingredient"] == expected[
+        "ingredients"
+    ]
+    assert [v for k, v in events if k == "step"] == expected["steps"]
+    assert parser.chars == len(markdown)
+
+
+def test_sections_are_announced_once_in_order():
+    _, events = stream(SAMPLE_RECIPE, [1] * len(SAMPLE_RECIPE))
+    sections = [k for k, _ in events if k not in ("ingredient", "step")]
+    assert sections == ["title", "description", "ingredients", "steps", "tags"]
+    assert dict(events)["tags"] == {
+        "flavor": ["Tangy"],
+        "texture": ["Crispy"],
+        "type": ["Snack"],
+    }
+
+
+def test_parse_matches_the_baseline_parser():
+    assert parse_markdown_recipe(SAMPLE_RECIPE) == SAMPLE_PARSED
+    _, events = stream(SAMPLE_RECIPE, [5] * len(SAMPLE_RECIPE))
+    assert dict(events)["steps"] == SAMPLE_PARSED["steps"]
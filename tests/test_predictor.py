@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+from app.evaluation.predictor import (
+    METRIC_NAMES,
+    RatingPredictor,
+    is_holdout,
+    rating_key,
+    rating_matrix,
+    refit,
+)
+
+
+def ratings(count, seed=0):
+    rng = np.random.default_rng(seed)
+    out = []
+    for i in range(count):
+        scores = {name: float(rng.uniform()) for name in METRIC_NAMES}
+        out.append(
+            {
+                "title": f"Recipe {i}",
+                "timestamp": f"2025-01-01T00:00:{i:02d}",
+                "RScore": 0.5,
+                "scores": scores,
+                "human_rating": 0.2 + 0.6 * scores["cues"],
+            }
+        )
+    return out
+
+
+def test_ridge_recovers_a_linear_rating():
+    model = RatingPredictor(ridge=1e-6)
+    X, y = rating_matrix(model, ratings(50), {})
+    model.partial_fit(X, y)
+    model.solve()
+    assert np.allclose(model.predict(X), y, atol=1e-4)
+
+
+def test_incremental_fit_matches_one_batch():
+    data = ratings(40)
+    train = [r for r in data if not is_holdout(rating_key(r))]
+    batch = RatingPredictor()
+    batch.partial_fit(*rating_matrix(batch, train, {}))
+    batch.solve()
+
+    incremental, first = refit(RatingPredictor(), data[:20], {})
+    incremental, second = refit(incremental, data, {})
+
+    assert first + second == incremental.n == len(train) < len(data)
+    assert np.allclose(incremental.weights, batch.weights)
+
+
+def test_lower_bound_rscore_is_not_a_feature():
+    model = RatingPredictor()
+    model.partial_fit(*rating_matrix(model, ratings(10), {}))
+    full = {"RScore": 0.1, **{name: 0.5 for name in METRIC_NAMES}}
+    partial = {**full, "skipped": ["novelty"]}
+
+    X = model.features([full, partial], [None, None])
+    rscore = len(METRIC_NAMES)
+    assert X[0, rscore] == 0.1
+    assert X[1, rscore] == pytest.approx(0.5)  # the running mean
+
+
+def test_save_and_load_round_trip(tmp_path):
+    model, _ = refit(RatingPredictor(), ratings(30), {})
+    path = tmp_path / "rating_model.npz"
+    model.save(path)
+
+    loaded = RatingPredictor.load(path)
+    assert loaded.n == model.n and loaded.seen == model.seen
+    assert np.array_equal(loaded.weights, model.weights)
@@ -0,0 +1,73 @@
+import json
+import random
+import numpy as np
+import pytest
+from app.generation.retrieval import (
+    RecipeIndex,
+    build_index,
+    decode_postings,
+    decode_varints,
+    encode_postings,
+    encode_varints,
+    query_terms,
+    recipe_terms,
+)
+
+INGREDIENTS = ["lemon", "sugar", "salt", "chili", "honey", "vinegar", "flour"]
+TITLES = ["Lemon Bites", "Chicken Stew", "Garden Salad", "Honey Cake", "Soup"]
+
+
+def record(title, ingredients, type_="dinner"):
+    return {
+        "input": {"flavor": [], "texture": [], "type": type_},
+        "output": {"title": title, "ingredients": ingredients, "steps": []},
+    }
+
+
+@pytest.mark.parametrize(
+    "values",
+    [[], [0], [127, 128, 255, 16383, 16384], [2**32 - 1, 1, 2**40]],
+)
+def test_varints_round_trip(values):
+    assert decode_varints(encode_varints(values)).tolist() == values
+
+
+def test_random_postings_round_trip():
+    rng = random.Random(0)
+    ids = sorted(rng.sample(range(10**6), 500))
+    assert decode_postings(encode_postings(ids)).tolist() == ids
+
+
+def test_only_an_explicit_type_is_indexed():
+    # prepare_data.py's fallback guess says nothing about the recipe
+    assert "type:dinner" not in recipe_terms(record("Lemon Bites", []))
+    assert "type:snack" in recipe_terms(record("Lemon Bites", []))
+    assert "type:brunch" in recipe_terms(record("Lemon Bites", [], "Brunch"))
+
+
+def test_ranked_matches_brute_force(tmp_path):
+    rng = random.Random(1)
+    corpus = [
+        record(rng.choice(TITLES), rng.sample(INGREDIENTS, 3))
+        for _ in range(300)
+    ]
+    source = tmp_path / "corpus.jsonl"
+    source.write_text("".join(json.dumps(r) + "\n" for r in corpus))
+    build_index(source, tmp_path / "index")
+    index = RecipeIndex(tmp_path / "index")
+
+    abed = {"flavor": ["Tangy", "Sweet"], "texture": [], "type": "Snack"}
+    terms = query_terms(abed)
+    docs = [recipe_terms(r) for r in corpus]
+    expected = {}
+    for term in terms:
+        matching = [i for i, d in enumerate(docs) if term in d]
+        weight = np.log((len(corpus) + 1) / (len(matching) + 0.5))
+        for i in matching:
+            expected[i] = expected.get(i, 0.0) + weight
+    expected = sorted(expected.items(), key=lambda x: (-x[1], x[0]))[:10]
+
+    ranked = index.ranked(abed, k=10)
+    assert [doc for doc, _ in ranked] == [doc for doc, _ in expected]
+    assert np.allclose([s for _, s in ranked], [s for _, s in expected])
+    assert index.fetch(ranked[0][0]) == corpus[ranked[0][0]]
@@ -0,0 +1,58 @@
+from conftest import SAMPLE_RECIPE
+
+VARIANT_RECIPE = SAMPLE_RECIPE.replace(
+    "- 1 can chickpeas, drained and patted dry\n", "- 2 cups cauliflower\n"
+).replace("- 1 teaspoon chili powder\n", "- 1 teaspoon smoked paprika\n")
+
+
+def test_candidates_sharing_a_title_get_their_own_embedding(scoring):
+    parsed = scoring.parse_markdown_recipe(SAMPLE_RECIPE)
+    scoring.score_novelty({"recipe": SAMPLE_RECIPE, "parsed": parsed})
+
+    same, variant = scoring.score_recipes(
+        [{"recipe": SAMPLE_RECIPE}, {"recipe": VARIANT_RECIPE}]
+    )
+
+    assert same["novelty"] == 0.0
+    assert variant["novelty"] > 0.0
+    assert len(scoring.EMBEDDING_CACHE) == 2
+
+
+def test_embedding_key_follows_content_not_title(scoring):
+    title = "Tangy Crispy Chickpea Bites"
+    assert scoring.recipe_embedding_key(
+        title, ["1 can chickpeas"]
+    ) != scoring.recipe_embedding_key(title, ["2 cups cauliflower"])
+    assert scoring.recipe_embedding_key(
+        title, ["1 can chickpeas"]
+    ) == scoring.recipe_embedding_key(title.upper(), ["1 can chickpeas"])
+
+
+def test_skipped_novelty_still_records_the_generation(scoring):
+    parsed = scoring.parse_markdown_recipe(SAMPLE_RECIPE)
+    scores = scoring.score_recipe(
+        {"recipe": SAMPLE_RECIPE},
+        parsed["steps"],
+        parsed["ingredients"],
+        target=0.01,
+    )
+    assert "novelty" in scores["skipped"]
+
+    scoring.WRITER.flush()
+    rows = scoring.GENERATIONS_LOG_FILE.read_text().splitlines()
+    assert len(rows) == 2 and "chickpea" in rows[1]
+
+
+def test_partial_rscore_is_logged_as_a_lower_bound(scoring):
+    logged = []
+    session = type("Session", (), {"log_review": logged.append})()
+    parsed = scoring.parse_markdown_recipe(SAMPLE_RECIPE)
+    scores = scoring.score_recipe(
+        {"recipe": SAMPLE_RECIPE},
+        parsed["steps"],
+        parsed["ingredients"],
+        log_reviews=True,
+        session=session,
+        target=0.01,
+    )
+    assert logged[0]["skipped"] == scores["skipped"]
@@ -0,0 +1,68 @@
+import os
+import pickle
+import pytest
+from app.training.shards import ShardedDataset, build_shards, shards_current
+
+
+class WordTokenizer:
+    # Token id = word length, enough to check ids survive the round trip
+    name_or_path = "words"
+
+    def __init__(self, vocab_size=50_000):
+        self.vocab_size = vocab_size
+
+    def __len__(self):
+        return self.vocab_size
+
+    def ids(self, text, max_length):
+        return [len(word) * 997 % self.vocab_size for word in text.split()][
+            :max_length
+        ]
+
+    def __call__(self, batch, truncation=True, max_length=None):
+        return {"input_ids": [self.ids(text, max_length) for text in batch]}
+
+
+TEXTS = [
+    " ".join("w" * (i % 7 + j) for j in range(i % 11)) for i in range(257)
+]
+
+
+@pytest.mark.parametrize("vocab_size", [50_000, 100_000])
+def test_shards_round_trip(tmp_path, vocab_size):
+    tokenizer = WordTokenizer(vocab_size)
+    meta = build_shards(TEXTS, tokenizer, tmp_path, 8, shard_size=50)
+    assert meta["counts"] == [50] * 5 + [7]
+    assert meta["dtype"] == ("uint16" if vocab_size <= 2**16 else "uint32")
+
+    dataset = ShardedDataset(tmp_path)
+    assert len(dataset) == len(TEXTS)
+    for i, text in enumerate(TEXTS):
+        assert dataset[i]["input_ids"] == tokenizer.ids(text, 8)
+    assert dataset[-1] == dataset[len(TEXTS) - 1]
+    with pytest.raises(IndexError):
+        dataset[len(TEXTS)]
+
+    clone = pickle.loads(pickle.dumps(dataset))
+    assert clone._maps == {} and clone[60] == dataset[60]
+
+
+def test_shards_go_stale_with_their_inputs(tmp_path):
+    source = tmp_path / "corpus.jsonl"
+    source.write_text("x\n")
+    shard_dir = tmp_path / "shards"
+    tokenizer = WordTokenizer()
+    build_shards(TEXTS, tokenizer, shard_dir, 8, source=source)
+
+    assert shards_current(shard_dir, source, tokenizer, 8)
+    assert not shards_current(shard_dir, source, tokenizer, 16)
+    source.write_text("x\ny\n")
+    os.utime(source, ns=(0, 0))
+    assert not shards_current(shard_dir, source, tokenizer, 8)
+
+
+def test_incomplete_shards_are_not_opened(tmp_path):
+    build_shards(TEXTS, WordTokenizer(), tmp_path, 8)
+    (tmp_path / "meta.json").unlink()
+    with pytest.raises(FileNotFoundError):
+        ShardedDataset(tmp_path)
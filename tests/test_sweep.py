@@ -0,0 +1,35 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+from app.generation.backends import Completion
+from app.generation.cascade import CascadeRouter, new_tier_stats
+from app.generation.sweep import abed_key
+from app.scripts.sweep import load_done_keys
+
+
+class FakeBackend:
+    def __init__(self, name):
+        self.name = name
+
+    def complete(self, entry, filled_prompt, n=1, max_tokens=None):
+        return Completion(["no recipe"], 10, 20, 0.01, ["stop"])
+
+
+def test_done_keys_skip_blank_lines(tmp_path):
+    entry = {"flavor": ["Tangy"], "texture": ["Crispy"], "type": "Snack"}
+    path = tmp_path / "sweep.jsonl"
+    path.write_text(f"{json.dumps({'input': entry})}\n  \n\n")
+    assert load_done_keys(path) == {abed_key(entry)}
+
+
+def test_cascade_stats_add_up_across_threads(scoring):
+    router = CascadeRouter(None, tiers=[], threshold=0.5)
+    router.backends = [FakeBackend("small"), FakeBackend("large")]
+    router.stats = {b.name: new_tier_stats() for b in router.backends}
+    with ThreadPoolExecutor(8) as pool:
+        list(pool.map(lambda _: router.generate({}, "prompt"), range(400)))
+
+    summary = router.summary()
+    assert summary["small"]["requests"] == 400
+    assert summary["small"]["escalations"] == 400
+    assert summary["large"]["requests"] == 400
+    assert summary["large"]["completion_tokens"] == 400 * 20
@@ -0,0 +1,72 @@
+import os
+import pickle
+from app.utils.writer import LogWriter
+
+
+def test_appends_are_batched_until_flush(tmp_path):
+    writer = LogWriter(batch_size=100)
+    path = tmp_path / "reviews.jsonl"
+    writer.append(path, "a\n")
+    writer.append(path, "b\n")
+    assert not path.exists()
+    assert writer.pending(path) == ["a\n", "b\n"]
+
+    writer.flush()
+    assert path.read_text() == "a\nb\n"
+    assert writer.pending(path) == []
+
+
+def test_header_written_once(tmp_path):
+    writer = LogWriter(batch_size=100)
+    path = tmp_path / "log.csv"
+    for row in ["1\n", "2\n"]:
+        writer.append(path, row, header="n\n")
+        writer.flush()
+    assert path.read_text() == "n\n1\n2\n"
+
+
+def test_merge_updates_pickled_dict(tmp_path):
+    writer = LogWriter(batch_size=100)
+    path = tmp_path / "cache.pkl"
+    writer.merge(path, {"a": 1})
+    writer.flush()
+    writer.merge(path, {"b": 2})
+    writer.flush()
+    with open(path, "rb") as f:
+        assert pickle.load(f) == {"a": 1, "b": 2}
+
+
+def test_batch_size_triggers_flush(tmp_path):
+    writer = LogWriter(batch_size=2)
+    path = tmp_path / "log.txt"
+    writer.append(path, "a\n")
+    assert not path.exists()
+    writer.append(path, "b\n")
+    assert path.read_text() == "a\nb\n"
+
+
+def test_files_fsynced_on_flush_with_one_fsync_per_directory(
+    tmp_path, monkeypatch
+):
+    writer = LogWriter(batch_size=100)
+    paths = [tmp_path / f"{i}.md" for i in range(5)]
+    for i, path in enumerate(paths):
+        writer.write(path, f"recipe {i}")
+    assert not any(path.exists() for path in paths)
+
+    calls = []
+    real_fsync = os.fsync
+    monkeypatch.setattr(
+        os, "fsync", lambda fd: (calls.append(fd), real_fsync(fd))
+    )
+    writer.flush()
+
+    assert [path.read_text() for path in paths] == [
+        f"recipe {i}" for i in range(5)
+    ]
+    # Each file before its rename, then the directory once
+    assert len(calls) == len(paths) + 1
+    # No temp files left behind
+    assert sorted(p.name for p in tmp_path.iterdir()) == sorted(
+        p.name for p in paths
+    )